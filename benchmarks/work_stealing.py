@@ -0,0 +1,89 @@
+"""
+Benchmark: batch makespan on heavy-tailed task durations
+
+Compares three ways of running the same batch on the same number of workers:
+
+- static:    one contiguous share per worker, as with map(chunksize=n/workers)
+- per-item:  ParallelProcessor.process_batch, one scheduled task per item
+- stealing:  ParallelProcessor.process_batch with work stealing
+
+Task durations follow a Pareto distribution, so a few items dominate the
+total cost. Each mode is reported against the ideal makespan
+max(sum(durations) / workers, max(durations)).
+
+Usage (with the package installed, e.g. pip install -e .):
+    python benchmarks/work_stealing.py [--items 400] [--workers 4] [--alpha 1.2]
+"""
+
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+from uhip.core.processor import ParallelProcessor
+from uhip.core.stealing import run_chunk
+
+
+def pareto_durations(count: int, alpha: float, scale: float, cap: float, seed: int) -> List[float]:
+    """Draw task durations in seconds from a capped Pareto distribution."""
+    rng = random.Random(seed)
+    return [min(cap, scale * rng.paretovariate(alpha)) for _ in range(count)]
+
+
+def timed(run: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--items", type=int, default=400)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--alpha", type=float, default=1.2, help="Pareto shape (lower = heavier tail)")
+    parser.add_argument("--scale", type=float, default=0.002, help="Minimum duration in seconds")
+    parser.add_argument("--cap", type=float, default=0.25, help="Maximum duration in seconds")
+    parser.add_argument("--chunk-size", type=int, default=0, help="Work-stealing chunk size (0 = auto)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    durations = pareto_durations(args.items, args.alpha, args.scale, args.cap, args.seed)
+    ideal = max(sum(durations) / args.workers, max(durations))
+
+    share = -(-len(durations) // args.workers)
+    shares = [durations[i:i + share] for i in range(0, len(durations), share)]
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        static = timed(
+            lambda: [f.result() for f in [executor.submit(run_chunk, time.sleep, s) for s in shares]]
+        )
+
+    processor = ParallelProcessor(
+        max_workers=args.workers, steal_chunk_size=args.chunk_size or None
+    )
+    processor.initialize()
+    try:
+        per_item = timed(lambda: processor.process_batch(durations, time.sleep))
+        stealing = timed(
+            lambda: processor.process_batch(durations, time.sleep, work_stealing=True)
+        )
+        steal_stats = processor.get_stats()["work_stealing"]
+    finally:
+        processor.shutdown()
+
+    print(
+        f"{args.items} items, {args.workers} workers, Pareto alpha={args.alpha}: "
+        f"total work {sum(durations):.3f}s, longest item {max(durations):.3f}s"
+    )
+    print(f"{'mode':<10} {'makespan':>10} {'vs ideal':>9}")
+    print(f"{'ideal':<10} {ideal:>9.3f}s {1.0:>8.2f}x")
+    for name, elapsed in (("static", static), ("per-item", per_item), ("stealing", stealing)):
+        print(f"{name:<10} {elapsed:>9.3f}s {elapsed / ideal:>8.2f}x")
+    print(
+        f"stealing: {steal_stats['chunks']} chunks, {steal_stats['steals']} steals, "
+        f"{steal_stats['stolen_chunks']} chunks moved"
+    )
+
+
+if __name__ == "__main__":
+    main()
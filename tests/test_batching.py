@@ -0,0 +1,83 @@
+"""
+Tests for MicroBatcher
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from uhip.core.batching import MicroBatcher
+
+
+def _square_all(items):
+    return [x * x for x in items]
+
+
+class TestMicroBatcher:
+    """Test cases for MicroBatcher."""
+
+    def test_single_item_flushes_after_wait(self):
+        """Test that a lone item is processed once max_wait expires."""
+        batcher = MicroBatcher(_square_all, max_batch_size=8, max_wait=0.001)
+        
+        assert batcher.submit(3).result(timeout=1) == 9
+        assert batcher.get_stats()["batches"] == 1
+        
+        batcher.close()
+
+    def test_concurrent_items_share_batches(self):
+        """Test that concurrent submissions are aggregated."""
+        batcher = MicroBatcher(_square_all, max_batch_size=16, max_wait=0.05)
+        barrier = threading.Barrier(16)
+        
+        def call(x):
+            barrier.wait()
+            return batcher.submit(x).result(timeout=5)
+        
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(call, range(16)))
+        
+        assert results == [x * x for x in range(16)]
+        stats = batcher.get_stats()
+        assert stats["items"] == 16
+        assert stats["batches"] < 16
+        
+        batcher.close()
+
+    def test_batch_size_limit(self):
+        """Test that batches never exceed max_batch_size."""
+        sizes = []
+        
+        def record(items):
+            sizes.append(len(items))
+            return items
+        
+        batcher = MicroBatcher(record, max_batch_size=4, max_wait=0.05)
+        futures = [batcher.submit(i) for i in range(10)]
+        
+        assert [f.result(timeout=5) for f in futures] == list(range(10))
+        assert max(sizes) <= 4
+        
+        batcher.close()
+
+    def test_errors_propagate_to_all_callers(self):
+        """Test that a failing batch fails every waiting caller."""
+        def fail(items):
+            raise ValueError("boom")
+        
+        batcher = MicroBatcher(fail, max_batch_size=4, max_wait=0.001)
+        future = batcher.submit(1)
+        
+        with pytest.raises(ValueError):
+            future.result(timeout=1)
+        
+        batcher.close()
+
+    def test_submit_after_close(self):
+        """Test that a closed batcher rejects new items."""
+        batcher = MicroBatcher(_square_all)
+        batcher.close()
+        
+        with pytest.raises(RuntimeError):
+            batcher.submit(1)
@@ -0,0 +1,207 @@
+"""
+Tests for the result cache and miss-ratio-curve sizing
+"""
+
+import pytest
+
+from uhip import HybridEngine
+from uhip.config import EngineConfig
+from uhip.core.caching import ResultCache, ReuseDistanceSampler, plan_cache_sizes
+from uhip.core.handlers import TASK_HANDLERS, register_handler
+
+CALLS = []
+
+
+def _counted_handler(data):
+    CALLS.append(data)
+    return {"value": data}
+
+
+@pytest.fixture
+def counted_handlers():
+    """Register a cacheable and a non-cacheable counting handler."""
+    CALLS.clear()
+    register_handler("counted", _counted_handler, cacheable=True)
+    register_handler("uncached", _counted_handler)
+    yield
+    TASK_HANDLERS.pop("counted", None)
+    TASK_HANDLERS.pop("uncached", None)
+
+
+class TestReuseDistanceSampler:
+    """Test cases for ReuseDistanceSampler."""
+
+    def test_cyclic_miss_ratio_curve(self):
+        """Test the exact curve of a loop over ten keys."""
+        sampler = ReuseDistanceSampler()
+        for _ in range(10):
+            for key in range(10):
+                sampler.record("loop", key)
+
+        curve = sampler.miss_ratio_curve("loop", [0, 5, 9, 10, 100])
+
+        # Every reuse has distance 9: LRU thrashes below ten entries
+        assert curve[0] == 1.0
+        assert curve[9] == 1.0
+        assert curve[10] == pytest.approx(0.1)
+        assert curve[100] == pytest.approx(0.1)
+
+    def test_fixed_size_sampling_bounds_memory(self):
+        """Test that the sample shrinks its rate to stay within max_keys."""
+        sampler = ReuseDistanceSampler(max_keys=64)
+        for key in range(5000):
+            sampler.record("wide", key)
+
+        stats = sampler.get_stats()["wide"]
+        assert stats["tracked_keys"] <= 64
+        assert stats["rate"] < 0.05
+
+    def test_sampled_distances_are_scaled(self):
+        """Test that sampled reuse distances estimate full-stream distances."""
+        sampler = ReuseDistanceSampler(max_keys=256)
+        for _ in range(3):
+            for key in range(2000):
+                sampler.record("loop", ("item", key))
+
+        curve = sampler.miss_ratio_curve("loop", [1024, 4096])
+
+        assert curve[1024] == pytest.approx(1.0)
+        assert curve[4096] == pytest.approx(1 / 3, abs=0.1)
+
+    def test_unknown_task_type(self):
+        """Test that a task type without samples predicts only misses."""
+        assert ReuseDistanceSampler().miss_ratio_curve("none", [16]) == {16: 1.0}
+
+
+class TestResultCache:
+    """Test cases for ResultCache."""
+
+    def test_lru_eviction_and_resize(self):
+        """Test per-type capacities, LRU order and shrinking."""
+        cache = ResultCache(default_capacity=2)
+        cache.put("a", 1, "one")
+        cache.put("a", 2, "two")
+        assert cache.get("a", 1) == (True, "one")
+        cache.put("a", 3, "three")
+
+        assert cache.get("a", 2) == (False, None)
+        assert cache.get("a", 3) == (True, "three")
+
+        assert cache.resize("a", 1) == 2
+        assert cache.get("a", 1) == (False, None)
+        stats = cache.get_stats()["a"]
+        assert stats["size"] == 1
+        assert stats["capacity"] == 1
+        assert stats["evictions"] == 2
+
+    def test_zero_capacity_still_samples(self):
+        """Test that disabled task types keep feeding the sampler."""
+        cache = ResultCache(default_capacity=0, sample_rate=1.0)
+        for _ in range(3):
+            cache.put("a", "key", "value")
+            assert cache.get("a", "key") == (False, None)
+
+        assert cache.sampler.get_stats()["a"]["references"] == 3
+        assert cache.observe_window("a") == 0.0
+        assert cache.observe_window("a") is None
+
+    def test_results_are_not_shared(self):
+        """Test that mutating a stored or returned result leaves the cache intact."""
+        cache = ResultCache()
+        result = {"data": {"id": 1}, "output": [1, 2]}
+        cache.put("a", "key", result)
+        result["output"].append(3)
+
+        _, first = cache.get("a", "key")
+        first["data"]["id"] = 99
+        _, second = cache.get("a", "key")
+
+        assert second == {"data": {"id": 1}, "output": [1, 2]}
+        assert second is not first
+
+    def test_entry_size_sampled(self):
+        """Test that entry sizes are measured once per sample interval."""
+        cache = ResultCache(size_sample_interval=4)
+        for key in range(4):
+            cache.put("a", key, "x" * 10000)
+
+        # Only the first put was measured: one EMA step from the default
+        first = cache.entry_bytes("a")
+        assert 1024 < first < 10000
+        cache.put("a", 4, "x" * 10000)
+        assert cache.entry_bytes("a") > first
+
+
+class TestPlanCacheSizes:
+    """Test cases for plan_cache_sizes."""
+
+    def test_budget_goes_to_best_hits_per_byte(self):
+        """Test that a small working set wins over a large one."""
+        sizes = [0, 16, 1024]
+        curves = {
+            "hot": {0: 1.0, 16: 0.1, 1024: 0.1},
+            "wide": {0: 1.0, 16: 1.0, 1024: 0.2},
+        }
+        lookups = {"hot": 100.0, "wide": 100.0}
+        entry_bytes = {"hot": 100.0, "wide": 100.0}
+
+        assert plan_cache_sizes(curves, lookups, entry_bytes, 16 * 100) == {"hot": 16, "wide": 0}
+
+        plan = plan_cache_sizes(curves, lookups, entry_bytes, 1040 * 100)
+        assert plan == {"hot": 16, "wide": 1024}
+        assert all(size in sizes for size in plan.values())
+
+    def test_no_gain_no_capacity(self):
+        """Test that task types without reuse get no capacity."""
+        curves = {"scan": {0: 1.0, 16: 1.0, 1024: 1.0}}
+
+        assert plan_cache_sizes(curves, {"scan": 10.0}, {"scan": 1.0}, 1e9) == {"scan": 0}
+
+
+class TestEngineCache:
+    """Test cases for result caching in the engine."""
+
+    def test_cacheable_results_reused(self, counted_handlers):
+        """Test that only cacheable handlers are served from the cache."""
+        engine = HybridEngine(EngineConfig(max_workers=2, auto_optimize=False))
+        engine.initialize()
+        try:
+            for _ in range(3):
+                assert engine.process(7, task_type="counted") == {"value": 7}
+                engine.process(8, task_type="uncached")
+            metrics = engine.get_metrics()
+        finally:
+            engine.shutdown()
+
+        assert CALLS.count(7) == 1
+        assert CALLS.count(8) == 3
+        assert metrics["counted"]["cache"]["hits"] == 2
+        assert "cache" not in metrics["uncached"]
+
+    def test_optimize_sizes_cache(self, counted_handlers):
+        """Test that optimization cycles resize the cache and report hit rates."""
+        config = EngineConfig(
+            max_workers=2,
+            auto_optimize=False,
+            cache_size=4,
+            cache_sample_rate=1.0,
+            tune_parallelism=False,
+        )
+        engine = HybridEngine(config)
+        engine.initialize()
+        try:
+            for _ in range(4):
+                for key in range(20):
+                    engine.process(key, task_type="counted")
+            result = engine.optimize()
+        finally:
+            engine.shutdown()
+
+        report = result["cache"]["counted"]
+        # A loop over 20 keys misses everything in 4 entries but fits in 32
+        assert report["previous"] == 4
+        assert report["capacity"] == 32
+        assert report["observed_hit_rate"] == 0.0
+        assert report["predicted_hit_rate_previous"] == 0.0
+        assert report["predicted_hit_rate"] == pytest.approx(0.75)
+        assert result["changes"][0]["knob"] == "cache_size"
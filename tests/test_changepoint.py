@@ -0,0 +1,193 @@
+"""
+Tests for streaming changepoint detection
+"""
+
+import random
+import time
+
+import pytest
+
+from uhip import HybridEngine
+from uhip.config import EngineConfig
+from uhip.core.changepoint import (
+    KIND_IMPROVEMENT,
+    KIND_REGRESSION,
+    METRIC_LATENCY,
+    METRIC_THROUGHPUT,
+    ChangepointDetector,
+    RegressionMonitor,
+)
+from uhip.core.optimizer import SelfOptimizer
+
+
+def _latencies(rng, count, scale=1.0):
+    return [rng.lognormvariate(-4, 0.3) * scale for _ in range(count)]
+
+
+class TestChangepointDetector:
+    """Test cases for ChangepointDetector."""
+
+    def test_detects_shift_with_onset(self):
+        """Test that a 1.5x latency shift alarms quickly with its onset time."""
+        rng = random.Random(1)
+        detector = ChangepointDetector()
+        for value in _latencies(rng, 180):
+            assert detector.update(value) is None
+        # The onset estimate may precede the shift by a few noisy samples
+        shortly_before = time.time()
+        for value in _latencies(rng, 20):
+            assert detector.update(value) is None
+
+        for delay, value in enumerate(_latencies(rng, 100, scale=1.5)):
+            alarm = detector.update(value)
+            if alarm is not None:
+                break
+
+        direction, onset, baseline = alarm
+        assert direction == 1
+        assert delay < 40
+        assert shortly_before <= onset <= time.time()
+        assert baseline == pytest.approx(0.018, rel=0.2)
+
+    def test_outliers_do_not_alarm(self):
+        """Test that isolated spikes in a stationary series raise no alarm."""
+        rng = random.Random(2)
+        detector = ChangepointDetector()
+        for index, value in enumerate(_latencies(rng, 20000)):
+            if index % 100 == 0:
+                value *= 10
+            assert detector.update(value) is None
+
+    def test_downward_shift(self):
+        """Test that drops are detected in the other direction."""
+        detector = ChangepointDetector(warmup=5)
+        for _ in range(5):
+            detector.update(100.0)
+
+        alarms = [detector.update(50.0) for _ in range(10)]
+
+        assert any(alarm is not None and alarm[0] == -1 for alarm in alarms)
+
+
+class TestRegressionMonitor:
+    """Test cases for RegressionMonitor."""
+
+    def test_latency_regression_event(self):
+        """Test that a latency increase becomes a regression event."""
+        regressions = []
+        monitor = RegressionMonitor(on_regression=regressions.append, latency_warmup=10)
+        for _ in range(10):
+            monitor.observe_latency("general", 0.01)
+        for _ in range(10):
+            monitor.observe_latency("general", 0.05)
+
+        events = monitor.drain()
+        assert len(events) == 1
+        assert events[0]["kind"] == KIND_REGRESSION
+        assert events[0]["metric"] == METRIC_LATENCY
+        assert events[0]["ratio"] == pytest.approx(5.0, rel=0.05)
+        assert regressions == events
+        assert monitor.drain() == []
+        assert monitor.get_events() == events
+
+    def test_latency_improvement_not_escalated(self):
+        """Test that faster requests are reported without the callback."""
+        regressions = []
+        monitor = RegressionMonitor(on_regression=regressions.append, latency_warmup=10)
+        for latency in [0.05] * 10 + [0.01] * 10:
+            monitor.observe_latency("general", latency)
+
+        assert monitor.drain()[0]["kind"] == KIND_IMPROVEMENT
+        assert regressions == []
+
+    def test_throughput_drop(self):
+        """Test that fewer completions per second at full utilization are a regression."""
+        monitor = RegressionMonitor(throughput_warmup=5)
+        count = busy = 0.0
+        for window in range(20):
+            count += 1000 if window < 10 else 300
+            busy += 4.0
+            monitor.observe_counts("general", count, busy, workers=4, now=float(window))
+
+        events = monitor.drain()
+        assert events[0]["metric"] == METRIC_THROUGHPUT
+        assert events[0]["kind"] == KIND_REGRESSION
+        assert events[0]["current"] == pytest.approx(300.0)
+
+    def test_pool_shrink_is_regression(self):
+        """Test that losing workers at constant request latency is a regression."""
+        monitor = RegressionMonitor(throughput_warmup=5)
+        count = busy = 0.0
+        for window in range(20):
+            # Saturated pool, 10 ms per request: 100 requests per worker-second
+            workers = 4 if window < 10 else 1
+            count += 100 * workers
+            busy += workers
+            monitor.observe_counts("general", count, busy, workers=workers, now=float(window))
+
+        events = monitor.drain()
+        assert events[0]["metric"] == METRIC_THROUGHPUT
+        assert events[0]["kind"] == KIND_REGRESSION
+        assert events[0]["current"] == pytest.approx(100.0)
+
+    def test_traffic_drop_is_not_regression(self):
+        """Test that less traffic at unchanged cost raises no alarm."""
+        regressions = []
+        monitor = RegressionMonitor(on_regression=regressions.append, throughput_warmup=5)
+        count = busy = 0.0
+        for window in range(20):
+            requests = 400 if window < 10 else 120
+            count += requests
+            busy += requests * 0.01
+            monitor.observe_counts("general", count, busy, workers=4, now=float(window))
+
+        assert monitor.drain() == []
+        assert regressions == []
+
+
+class TestOptimizerRegressions:
+    """Test cases for regression handling in SelfOptimizer."""
+
+    def test_analysis_reports_regressions(self):
+        """Test that detected regressions appear as suggestions."""
+        optimizer = SelfOptimizer(EngineConfig())
+        optimizer.initialize()
+        for latency in [0.01] * 30 + [0.05] * 10:
+            optimizer.regressions.observe_latency("general", latency)
+
+        analysis = optimizer.analyze_metrics({"general": {"avg_time": 0.02, "count": 40}})
+
+        assert analysis["status"] == "needs_attention"
+        assert analysis["changepoints"][0]["kind"] == KIND_REGRESSION
+        assert analysis["suggestions"][0]["issue"] == "latency_regression"
+
+    def test_regression_reverts_suspect_change(self):
+        """Test that the setting changed just before the onset is reverted."""
+        config = EngineConfig(
+            max_workers=2, max_workers_limit=4, auto_optimize=False, tune_parallelism=False
+        )
+        engine = HybridEngine(config)
+        engine.initialize()
+        try:
+            changed_at = time.time()
+            engine.processor.resize(3, reason="tuner")
+            engine.optimizer.optimization_history.append({"changes": [{
+                "timestamp": changed_at,
+                "action": "trial",
+                "knob": "workers",
+                "from": 2,
+                "to": 3,
+            }]})
+            for latency in [0.01] * 30 + [0.05] * 10:
+                engine.optimizer.regressions.observe_latency("general", latency)
+
+            result = engine.optimize()
+            workers = engine.processor.max_workers
+        finally:
+            engine.shutdown()
+
+        reverts = [change for change in result["changes"] if change["action"] == "revert"]
+        assert reverts[0]["knob"] == "workers"
+        assert reverts[0]["to"] == 2
+        assert reverts[0]["regressions"][0]["onset"] >= changed_at
+        assert workers == 2
@@ -0,0 +1,140 @@
+"""
+Tests for request coalescing
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from uhip import HybridEngine
+from uhip.config import EngineConfig
+from uhip.core.coalescing import SingleFlight, request_key
+from uhip.core.handlers import EXECUTOR_THREAD, TASK_HANDLERS, register_handler
+
+CALLS = []
+
+
+def _side_effect_handler(data):
+    """Non-idempotent handler that records every execution."""
+    CALLS.append(data)
+    time.sleep(0.05)
+    return {"data": data}
+
+
+class TestRequestKey:
+    """Test cases for request_key."""
+
+    def test_equal_payloads_share_key(self):
+        """Test that dict ordering does not change the key."""
+        assert request_key("general", {"a": 1, "b": [1, 2]}) == \
+            request_key("general", {"b": [1, 2], "a": 1})
+
+    def test_task_type_and_types_distinguish(self):
+        """Test that task type and value types are part of the key."""
+        assert request_key("general", 1) != request_key("edge", 1)
+        assert request_key("general", [1]) != request_key("general", (1,))
+        assert request_key("general", {"x": 1}) != request_key("general", {"x": True})
+
+    def test_unhashable_payload(self):
+        """Test that unkeyable payloads are not coalesced."""
+        class Opaque:
+            __hash__ = None
+        
+        assert request_key("general", Opaque()) is None
+
+
+class TestSingleFlight:
+    """Test cases for SingleFlight."""
+
+    def test_concurrent_calls_share_execution(self):
+        """Test that concurrent identical calls run the function once."""
+        group = SingleFlight()
+        calls = []
+        barrier = threading.Barrier(8)
+        
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return "result"
+        
+        def call(_):
+            barrier.wait()
+            return group.do("key", "general", compute)
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(call, range(8)))
+        
+        assert results == ["result"] * 8
+        assert len(calls) < 8
+        assert group.coalesced["general"] == 8 - len(calls)
+        assert group.in_flight() == 0
+
+    def test_followers_get_copies(self):
+        """Test that followers cannot mutate the leader's result."""
+        group = SingleFlight()
+        result = {"values": [1, 2]}
+        started = threading.Event()
+        
+        def compute():
+            started.set()
+            time.sleep(0.05)
+            return result
+        
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            leader = pool.submit(group.do, "key", "general", compute)
+            started.wait()
+            follower = group.do("key", "general", compute)
+        
+        follower["values"].append(3)
+        assert leader.result() is result
+        assert follower is not result
+        assert result == {"values": [1, 2]}
+
+    def test_errors_reach_followers(self):
+        """Test that the leader's exception is raised for followers."""
+        group = SingleFlight()
+        future, leader = group.acquire("key", "general")
+        follower, is_leader = group.acquire("key", "general")
+        
+        assert leader and not is_leader
+        group.release("key", future, error=ValueError("boom"))
+        
+        with pytest.raises(ValueError):
+            follower.result()
+
+
+class TestEngineCoalescing:
+    """Test cases for coalescing in HybridEngine."""
+
+    @pytest.fixture
+    def engine(self):
+        CALLS.clear()
+        register_handler("side_effect", _side_effect_handler, executor=EXECUTOR_THREAD)
+        engine = HybridEngine(EngineConfig(auto_optimize=False))
+        engine.initialize()
+        yield engine
+        engine.shutdown()
+        TASK_HANDLERS.pop("side_effect", None)
+
+    def test_non_idempotent_requests_all_execute(self, engine):
+        """Test that concurrent identical non-idempotent requests are not shared."""
+        barrier = threading.Barrier(2)
+        
+        def call(_):
+            barrier.wait()
+            return engine.process({"id": 1}, task_type="side_effect")
+        
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(call, range(2)))
+        
+        assert results == [{"data": {"id": 1}}] * 2
+        assert len(CALLS) == 2
+        assert "coalesced" not in engine.get_metrics()["side_effect"]
+
+    def test_non_idempotent_batch_duplicates_all_execute(self, engine):
+        """Test that duplicates in a non-idempotent batch each execute."""
+        engine.batch_process([{"id": 1}, {"id": 1}], task_type="side_effect")
+        
+        assert len(CALLS) == 2
@@ -5,6 +5,19 @@ Tests for HybridEngine
 import pytest
 from uhip import HybridEngine
 from uhip.config import EngineConfig
+from uhip.core.handlers import TASK_HANDLERS, register_handler
+
+
+def _echo_handler(data):
+    """Module-level handler used by the dispatch tests."""
+    return {"echo": data}
+
+
+def _sleepy_handler(data):
+    """Handler that sleeps for the requested number of seconds."""
+    import time
+    time.sleep(data)
+    return data
 
 
 class TestHybridEngine:
@@ -111,6 +124,151 @@ class TestHybridEngine:
         
         engine.shutdown()
 
+    def test_batch_processing_with_processes(self):
+        """Test batch processing on a process pool."""
+        config = EngineConfig(max_workers=2, use_processes=True, auto_optimize=False)
+        engine = HybridEngine(config)
+        engine.initialize()
+        
+        items = [{"id": i} for i in range(6)]
+        results = engine.batch_process(items, task_type="ai_ml")
+        
+        assert [r["data"] for r in results] == items
+        assert all(r["module"] == "ai_ml" for r in results)
+        
+        # CPU-bound single requests hop to the process pool
+        assert engine._lookup("ai_ml").single_mode == "pool"
+        assert engine.process({"id": 99}, task_type="ai_ml")["data"] == {"id": 99}
+        
+        engine.shutdown()
+
+    def test_hybrid_pools_follow_handler_declarations(self):
+        """Test that declared executors pick the pool in hybrid mode."""
+        config = EngineConfig(
+            max_workers=2, hybrid_pools=True, secondary_pool_workers=1, auto_optimize=False
+        )
+        engine = HybridEngine(config)
+        engine.initialize()
+        
+        assert engine._lookup("quantum").pool == "process"
+        assert engine._lookup("edge").pool == "thread"
+        assert engine._lookup("general").pool is None
+        
+        assert engine.process({"q": 1}, task_type="quantum")["module"] == "quantum"
+        engine.batch_process([{"id": i} for i in range(3)], task_type="edge")
+        
+        pools = engine.processor.get_stats()["pools"]
+        assert pools["process"]["completed"] == 1
+        assert pools["thread"]["completed"] == 3
+        
+        engine.shutdown()
+
+    def test_custom_handler_dispatch(self):
+        """Test that handlers registered after initialization are dispatched."""
+        engine = HybridEngine(EngineConfig(auto_optimize=False))
+        engine.initialize()
+        
+        register_handler("echo", _echo_handler)
+        try:
+            result = engine.process({"ping": 1}, task_type="echo")
+            assert result == {"echo": {"ping": 1}}
+        finally:
+            TASK_HANDLERS.pop("echo", None)
+        
+        engine.shutdown()
+
+    def test_light_handlers_run_inline(self):
+        """Test that light handlers skip the executor for single requests."""
+        engine = HybridEngine(EngineConfig(auto_optimize=False))
+        engine.initialize()
+        
+        assert engine._lookup("general").single_mode == "inline"
+        assert engine._lookup("ai_ml").single_mode == "inline"
+        assert engine._lookup("edge").batch_mode == "pool"
+        
+        engine.shutdown()
+
+    def test_micro_batching(self):
+        """Test that concurrent single requests are micro-batched."""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        
+        config = EngineConfig(
+            auto_optimize=False, micro_batch_enabled=True, micro_batch_max_wait_ms=20
+        )
+        engine = HybridEngine(config)
+        engine.initialize()
+        barrier = threading.Barrier(8)
+        
+        def call(i):
+            barrier.wait()
+            return engine.process({"id": i}, task_type="ai_ml")
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(call, range(8)))
+        
+        assert [r["data"] for r in results] == [{"id": i} for i in range(8)]
+        stats = engine.get_metrics()["ai_ml"]["micro_batch"]
+        assert stats["items"] == 8
+        assert stats["batches"] < 8
+        
+        engine.shutdown()
+
+    def test_batch_duplicates_coalesced(self):
+        """Test that duplicate payloads within a batch execute once."""
+        engine = HybridEngine(EngineConfig(auto_optimize=False))
+        engine.initialize()
+        
+        items = [{"id": 1}, {"id": 2}, {"id": 1}, {"id": 1}]
+        results = engine.batch_process(items, task_type="edge")
+        
+        assert [r["data"] for r in results] == items
+        assert results[0] == results[2]
+        assert results[0] is not results[2]
+        assert engine.get_metrics()["edge"]["coalesced"] == 2
+        
+        engine.shutdown()
+
+    def test_batch_timeout(self):
+        """Test that batch_process enforces its timeout."""
+        from uhip.core.exceptions import DeadlineExceeded
+        
+        engine = HybridEngine(EngineConfig(max_workers=2, auto_optimize=False))
+        engine.initialize()
+        register_handler("sleepy", _sleepy_handler, executor="thread")
+        try:
+            with pytest.raises(DeadlineExceeded):
+                engine.batch_process([0.0, 0.5, 0.01, 0.02], task_type="sleepy", timeout=0.1)
+            assert "sleepy" in engine.get_metrics()
+            assert engine.get_metrics()["sleepy"]["timeouts"]
+        finally:
+            TASK_HANDLERS.pop("sleepy", None)
+        
+        engine.shutdown()
+
+    def test_overload_rejection_metrics(self):
+        """Test that rejected submissions surface in metrics."""
+        from uhip.core.exceptions import EngineOverloaded
+        
+        config = EngineConfig(
+            max_workers=1,
+            auto_optimize=False,
+            queue_high_watermark=1,
+            queue_low_watermark=0,
+            overload_policy="reject",
+        )
+        engine = HybridEngine(config)
+        engine.initialize()
+        register_handler("sleepy", _sleepy_handler, executor="thread")
+        try:
+            with pytest.raises(EngineOverloaded):
+                engine.batch_process([0.05, 0.06, 0.07, 0.08], task_type="sleepy")
+            assert engine.get_metrics()["sleepy"]["rejected"] >= 1
+        finally:
+            TASK_HANDLERS.pop("sleepy", None)
+        
+        engine.shutdown()
+
     def test_metrics_collection(self):
         """Test metrics collection."""
         engine = HybridEngine()
@@ -128,6 +286,22 @@ class TestHybridEngine:
         
         engine.shutdown()
 
+    def test_latency_percentiles(self):
+        """Test that metrics report latency percentiles per window."""
+        engine = HybridEngine()
+        engine.initialize()
+        
+        for _ in range(20):
+            engine.process({"data": "test"}, task_type="general")
+        
+        latency = engine.get_metrics()["general"]["latency"]
+        
+        assert set(latency) == {"all", "1m", "5m"}
+        assert latency["1m"]["count"] == 20
+        assert 0 < latency["all"]["p50"] <= latency["all"]["p99"] <= latency["all"]["max"]
+        
+        engine.shutdown()
+
     def test_manual_optimization(self):
         """Test manual optimization trigger."""
         engine = HybridEngine()
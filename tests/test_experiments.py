@@ -0,0 +1,173 @@
+"""
+Tests for A/B configuration experiments
+"""
+
+import time
+
+import pytest
+
+from uhip import HybridEngine
+from uhip.config import EngineConfig
+from uhip.core.experiments import (
+    VERDICT_PROMOTE,
+    VERDICT_REJECT,
+    Experiment,
+    mann_whitney_u,
+)
+from uhip.core.handlers import TASK_HANDLERS, register_handler
+from uhip.core.optimizer import SelfOptimizer
+
+
+def _sleepy_handler(data):
+    time.sleep(0.01)
+    return data
+
+
+def _filled(experiment, control, treatment, items=1):
+    for value in control:
+        experiment.record(False, value, items)
+    for value in treatment:
+        experiment.record(True, value, items)
+    return experiment
+
+
+class TestMannWhitney:
+    """Test cases for mann_whitney_u."""
+
+    def test_separated_samples(self):
+        """Test U and the normal-approximation p-value of disjoint samples."""
+        u, p_value = mann_whitney_u([1, 2, 3, 4, 5], [6, 7, 8, 9, 10])
+
+        assert u == 0
+        assert p_value == pytest.approx(0.0122, abs=1e-3)
+
+    def test_identical_and_tied_samples(self):
+        """Test that indistinguishable samples are not significant."""
+        assert mann_whitney_u([1, 2, 3], [1, 2, 3])[1] == pytest.approx(1.0)
+        assert mann_whitney_u([5, 5], [5, 5, 5]) == (3.0, 1.0)
+        assert mann_whitney_u([], [1.0]) == (0.0, 1.0)
+
+
+class TestExperiment:
+    """Test cases for Experiment verdicts."""
+
+    def test_faster_candidate_promoted(self):
+        """Test that significantly lower latency promotes the candidate."""
+        experiment = _filled(
+            Experiment("workers", 2, 4, min_samples=20),
+            control=[0.10 + i * 0.001 for i in range(30)],
+            treatment=[0.05 + i * 0.001 for i in range(30)],
+        )
+
+        assert experiment.evaluate() == VERDICT_PROMOTE
+        assert experiment.result["latency"]["better"]
+        assert experiment.result["throughput"] is None
+
+    def test_slower_candidate_rejected(self):
+        """Test that significantly higher latency rejects the candidate."""
+        experiment = _filled(
+            Experiment("chunk_size", 8, 64, min_samples=20),
+            control=[0.05 + i * 0.001 for i in range(30)],
+            treatment=[0.10 + i * 0.001 for i in range(30)],
+        )
+
+        assert experiment.evaluate() == VERDICT_REJECT
+        assert experiment.result["latency"]["worse"]
+
+    def test_throughput_regression_vetoes(self):
+        """Test that a throughput regression rejects despite lower latency."""
+        experiment = Experiment("workers", 2, 4, min_samples=20, min_batches=20)
+        _filled(experiment, [0.10 + i * 0.001 for i in range(30)], [])
+        _filled(experiment, [], [0.05 + i * 0.001 for i in range(30)])
+        for i in range(30):
+            experiment.throughput[0].append(100.0 + i)
+            experiment.throughput[1].append(50.0 + i)
+
+        assert experiment.evaluate() == VERDICT_REJECT
+        assert experiment.result["latency"]["better"]
+        assert experiment.result["throughput"]["worse"]
+
+    def test_inconclusive_until_max_samples(self):
+        """Test that equal arms wait for data, then reject at max_samples."""
+        experiment = Experiment("workers", 2, 4, min_samples=20, max_samples=40)
+        samples = [0.05 + (i % 7) * 0.001 for i in range(30)]
+        _filled(experiment, samples, samples)
+
+        assert experiment.evaluate() is None
+
+        _filled(experiment, [], samples[:10])
+        assert experiment.evaluate() == VERDICT_REJECT
+
+    def test_batches_record_per_item_latency(self):
+        """Test that a batch is recorded on the scale of single requests."""
+        experiment = Experiment("workers", 2, 4)
+        experiment.record(False, 0.05)
+        experiment.record(True, 0.4, items=8)
+
+        assert list(experiment.latency[0]) == [0.05]
+        assert list(experiment.latency[1]) == [0.05]
+        assert list(experiment.throughput[1]) == [20.0]
+
+    def test_invalid_settings(self):
+        """Test that unsupported knobs and fractions are refused."""
+        with pytest.raises(ValueError):
+            Experiment("cache_size", 10, 20)
+        with pytest.raises(ValueError):
+            Experiment("workers", 2, 4, fraction=1.0)
+
+
+class TestEngineExperiment:
+    """Test cases for experiments driven by the optimizer."""
+
+    def test_more_workers_promoted(self):
+        """Test that a shadow pool with more workers wins and is promoted."""
+        register_handler("sleepy", _sleepy_handler, executor="thread")
+        config = EngineConfig(
+            max_workers=1,
+            max_workers_limit=4,
+            auto_optimize=False,
+            tune_parallelism=False,
+            prestart_workers=False,
+        )
+        engine = HybridEngine(config)
+        engine.initialize()
+        try:
+            experiment = engine.optimizer.start_experiment(
+                "workers", 4, fraction=0.5, min_samples=8, min_batches=8
+            )
+            with pytest.raises(RuntimeError):
+                engine.optimizer.start_experiment("workers", 2)
+            for _ in range(200):
+                engine.batch_process([1, 2, 3, 4], task_type="sleepy")
+                if min(experiment.get_stats()["batches"]) >= 8:
+                    break
+            result = engine.optimize()
+            workers = engine.processor.max_workers
+        finally:
+            engine.shutdown()
+            TASK_HANDLERS.pop("sleepy", None)
+
+        promoted = [change for change in result["changes"] if change["action"] == VERDICT_PROMOTE]
+        assert promoted[0]["knob"] == "workers"
+        assert promoted[0]["to"] == 4
+        assert workers == 4
+        assert engine.optimizer.experiment is None
+        assert engine.optimizer.experiment_history[0]["throughput"]["better"]
+        assert not experiment.shadow.initialized
+
+    def test_experiment_requires_engine(self):
+        """Test that a standalone optimizer cannot run experiments."""
+        with pytest.raises(RuntimeError):
+            SelfOptimizer(EngineConfig()).start_experiment("workers", 4)
+
+    def test_chunk_size_needs_work_stealing(self):
+        """Test that a chunk size experiment is refused without work stealing."""
+        engine = HybridEngine(EngineConfig(auto_optimize=False, work_stealing=False))
+        engine.initialize()
+        try:
+            with pytest.raises(ValueError):
+                engine.optimizer.start_experiment("chunk_size", 64)
+        finally:
+            engine.shutdown()
+        
+        assert engine.optimizer.experiment is None
@@ -0,0 +1,100 @@
+"""
+Tests for the task handler registry
+"""
+
+import pytest
+
+from uhip.core import handlers
+from uhip.core.handlers import (
+    EXECUTOR_INLINE,
+    EXECUTOR_PROCESS,
+    EXECUTOR_THREAD,
+    TASK_HANDLERS,
+    get_handler,
+    handler_specs,
+    init_worker,
+    register_handler,
+    run_batch,
+    run_task,
+)
+
+
+def echo_handler(data):
+    """Module-level handler used by the registry tests."""
+    return {"status": "processed", "module": "echo", "data": data}
+
+
+@pytest.fixture
+def echo_registered():
+    """Register the echo handler for the duration of a test."""
+    register_handler("echo", echo_handler)
+    yield
+    TASK_HANDLERS.pop("echo", None)
+
+
+class TestHandlerRegistry:
+    """Test cases for the handler registry."""
+
+    def test_builtin_handlers(self):
+        """Test that the built-in task types are registered."""
+        for task_type in ("ai_ml", "quantum", "blockchain", "edge", "general"):
+            assert task_type in TASK_HANDLERS
+
+    def test_unknown_task_type_falls_back(self):
+        """Test that unknown task types use the general handler."""
+        assert get_handler("unknown").func is handlers.process_general
+        assert run_task("unknown", 1)["module"] == "general"
+
+    def test_register_and_run(self, echo_registered):
+        """Test running a custom handler."""
+        assert run_task("echo", 7)["module"] == "echo"
+
+    def test_specs_round_trip(self, echo_registered):
+        """Test that init_worker rebuilds handlers from their specs."""
+        specs = handler_specs()
+        echo_spec = next(spec for spec in specs if spec["task_type"] == "echo")
+        assert echo_spec["func"] == f"{__name__}:echo_handler"
+        
+        TASK_HANDLERS.pop("echo")
+        init_worker(specs)
+        
+        assert TASK_HANDLERS["echo"].func is echo_handler
+
+    def test_idempotent_round_trip(self):
+        """Test that the idempotent trait survives the worker specs."""
+        register_handler("echo", echo_handler, idempotent=True)
+        try:
+            specs = handler_specs()
+            TASK_HANDLERS.pop("echo")
+            init_worker(specs)
+            assert TASK_HANDLERS["echo"].idempotent
+        finally:
+            TASK_HANDLERS.pop("echo", None)
+        
+        assert TASK_HANDLERS["ai_ml"].idempotent
+        assert not TASK_HANDLERS["blockchain"].idempotent
+
+    def test_specs_skip_local_functions(self):
+        """Test that lambdas are not exported to process workers."""
+        register_handler("local", lambda x: x)
+        try:
+            assert "local" not in [spec["task_type"] for spec in handler_specs()]
+        finally:
+            TASK_HANDLERS.pop("local", None)
+
+    def test_preferred_executor(self):
+        """Test executor resolution from declared traits."""
+        assert TASK_HANDLERS["ai_ml"].preferred_executor == EXECUTOR_PROCESS
+        assert TASK_HANDLERS["edge"].preferred_executor == EXECUTOR_THREAD
+        assert TASK_HANDLERS["general"].preferred_executor == EXECUTOR_INLINE
+
+    def test_invalid_executor(self):
+        """Test that unknown executors are rejected."""
+        with pytest.raises(ValueError):
+            register_handler("bad", echo_handler, executor="gpu")
+
+    def test_run_batch_uses_batch_func(self):
+        """Test that batchable handlers process lists in one call."""
+        assert TASK_HANDLERS["ai_ml"].batchable
+        results = run_batch("ai_ml", [1, 2, 3])
+        assert [r["data"] for r in results] == [1, 2, 3]
@@ -0,0 +1,156 @@
+"""
+Tests for hedged execution
+"""
+
+import threading
+import time
+
+import pytest
+
+from uhip import HybridEngine
+from uhip.config import EngineConfig
+from uhip.core.hedging import HedgePolicy
+from uhip.core.processor import ParallelProcessor
+
+ATTEMPTS = []
+RELEASE = threading.Event()
+
+
+def _first_attempt_stalls(x):
+    """The first attempt of item "slow" stalls; any retry returns at once."""
+    ATTEMPTS.append(x)
+    if x == "slow" and ATTEMPTS.count(x) == 1:
+        RELEASE.wait(5)
+        return "primary"
+    return "duplicate" if x == "slow" else x
+
+
+def _failing(x):
+    raise ValueError(f"bad item {x}")
+
+
+def _both_attempts_fail(x):
+    """The first attempt fails late, any retry fails at once."""
+    ATTEMPTS.append(x)
+    if ATTEMPTS.count(x) == 1:
+        time.sleep(0.3)
+    raise ValueError(f"bad item {x}")
+
+
+@pytest.fixture
+def hedging_processor():
+    """Thread processor whose hedge policy needs only three samples."""
+    ATTEMPTS.clear()
+    RELEASE.clear()
+    processor = ParallelProcessor(max_workers=2, hedge_budget=1.0)
+    processor.hedger = HedgePolicy(budget=1.0, min_samples=3)
+    processor.initialize()
+    for i in range(3):
+        processor.submit(_first_attempt_stalls, (i,), hedge=True).result(timeout=5)
+    yield processor
+    RELEASE.set()
+    processor.shutdown()
+
+
+class TestHedgePolicy:
+    """Test cases for HedgePolicy."""
+
+    def test_threshold_is_percentile(self):
+        """Test that the threshold is the configured percentile of run times."""
+        policy = HedgePolicy(percentile=0.95, min_samples=10)
+        for i in range(1, 10):
+            policy.record("general", float(i))
+        
+        assert policy.threshold("general") is None
+        
+        for i in range(10, 101):
+            policy.record("general", float(i))
+        
+        assert policy.threshold("general") == 95.0
+        assert policy.threshold("other") is None
+
+    def test_budget_limits_duplicates(self):
+        """Test that duplicates stay within the budget fraction of tasks."""
+        policy = HedgePolicy(budget=0.1)
+        for _ in range(10):
+            policy.count_task("general")
+        
+        assert policy.admit("general")
+        assert not policy.admit("general")
+        
+        stats = policy.get_stats()
+        assert stats["hedges"] == 1
+        assert stats["extra_work"] == pytest.approx(0.1)
+        assert stats["task_types"]["general"]["over_budget"] == 1
+
+    def test_invalid_percentile(self):
+        """Test that percentiles outside (0, 1) are rejected."""
+        with pytest.raises(ValueError):
+            HedgePolicy(percentile=95)
+
+
+class TestHedgedExecution:
+    """Test cases for hedged execution in ParallelProcessor."""
+
+    def test_duplicate_wins(self, hedging_processor):
+        """Test that a straggler is duplicated and the faster copy is used."""
+        start = time.monotonic()
+        result = hedging_processor.submit(
+            _first_attempt_stalls, ("slow",), hedge=True
+        ).result(timeout=5)
+        
+        assert result == "duplicate"
+        assert time.monotonic() - start < 2
+        assert ATTEMPTS.count("slow") == 2
+        
+        stats = hedging_processor.get_stats()["hedging"]["task_types"]["general"]
+        assert stats["hedged"] == 1
+        assert stats["wins"] == 1
+        assert stats["losses"] == 0
+
+    def test_not_hedged_without_flag(self, hedging_processor):
+        """Test that tasks not marked idempotent run exactly once."""
+        future = hedging_processor.submit(_first_attempt_stalls, ("slow",))
+        time.sleep(0.1)
+        RELEASE.set()
+        
+        assert future.result(timeout=5) == "primary"
+        assert ATTEMPTS.count("slow") == 1
+        assert hedging_processor.get_stats()["hedging"]["hedges"] == 0
+
+    def test_errors_propagate(self, hedging_processor):
+        """Test that a task failing in every attempt reports its error."""
+        with pytest.raises(ValueError):
+            hedging_processor.submit(_failing, (1,), hedge=True).result(timeout=5)
+
+    def test_double_failure_is_not_an_outcome(self, hedging_processor):
+        """Test that a task failing in both attempts counts as neither win nor loss."""
+        future = hedging_processor.submit(_both_attempts_fail, ("slow",), hedge=True)
+        with pytest.raises(ValueError):
+            future.result(timeout=5)
+        
+        assert ATTEMPTS.count("slow") == 2
+        stats = hedging_processor.get_stats()["hedging"]["task_types"]["general"]
+        assert stats["failures"] == 1
+        assert stats["wins"] == stats["losses"] == 0
+
+    def test_disabled_by_default(self):
+        """Test that processors do not hedge unless given a budget."""
+        processor = ParallelProcessor(max_workers=1)
+        
+        assert processor.hedger is None
+        assert processor.get_stats()["hedging"] is None
+
+
+class TestEngineHedging:
+    """Test cases for hedging configuration in the engine."""
+
+    def test_config_enables_hedging(self):
+        """Test that the engine passes its hedge budget to the processor."""
+        engine = HybridEngine(EngineConfig(max_workers=2, hedging=True, hedge_budget=0.1))
+        
+        assert engine.processor.hedger is not None
+        assert engine.processor.hedger.budget == 0.1
+        
+        engine = HybridEngine(EngineConfig(max_workers=2))
+        assert engine.processor.hedger is None
@@ -0,0 +1,171 @@
+"""
+Tests for memory monitoring and pressure relief
+"""
+
+import gc
+import os
+
+import pytest
+
+from uhip import HybridEngine
+from uhip.config import EngineConfig
+from uhip.core.handlers import TASK_HANDLERS, register_handler
+from uhip.core.memory import HISTORY_LIMIT, MemoryController, rss_bytes
+from uhip.core.processor import ParallelProcessor
+
+
+def _echo_handler(data):
+    return {"value": data}
+
+
+def _pid(_):
+    return os.getpid()
+
+
+@pytest.fixture
+def engine():
+    """Initialized thread-pool engine with a cacheable handler."""
+    register_handler("echo", _echo_handler, cacheable=True)
+    engine = HybridEngine(
+        EngineConfig(max_workers=2, auto_optimize=False, tune_parallelism=False)
+    )
+    engine.initialize()
+    yield engine
+    engine.shutdown()
+    TASK_HANDLERS.pop("echo", None)
+
+
+@pytest.fixture
+def gc_threshold():
+    """Restore the interpreter's GC thresholds after a test."""
+    threshold = gc.get_threshold()
+    yield threshold
+    gc.set_threshold(*threshold)
+
+
+class TestMeasurement:
+    """Test cases for memory measurement."""
+
+    def test_rss_of_current_process(self):
+        """Test that the engine process's RSS is measured where supported."""
+        rss = rss_bytes()
+        if rss is None:
+            pytest.skip("RSS cannot be measured on this platform")
+
+        assert rss > 1024 * 1024
+
+    def test_cache_bytes_reported(self, engine):
+        """Test that cached results are counted per task type."""
+        for key in range(10):
+            engine.process(key, task_type="echo")
+
+        snapshot = engine.optimizer.memory.measure(engine)
+
+        assert snapshot["cache"]["echo"] > 0
+        assert snapshot["workers"] == {}
+
+
+class TestMemoryController:
+    """Test cases for MemoryController."""
+
+    def test_pressure_trims_cache_and_history(self, engine, gc_threshold):
+        """Test that crossing the budget trims the cache and history buffers."""
+        if rss_bytes() is None:
+            pytest.skip("RSS cannot be measured on this platform")
+        for key in range(10):
+            engine.process(key, task_type="echo")
+        engine.optimizer.optimization_history.extend({} for _ in range(HISTORY_LIMIT + 50))
+        controller = MemoryController(budget=1024)
+
+        report = controller.step(engine)
+
+        assert report["pressure"]
+        actions = {action["action"] for action in report["actions"]}
+        assert {"cache_budget", "cache_trim", "history_trim", "gc_collect"} <= actions
+        assert controller.cache_budget_factor == 0.5
+        assert engine.cache.get_stats()["echo"]["capacity"] == engine.config.cache_size // 2
+        assert len(engine.optimizer.optimization_history) == HISTORY_LIMIT
+        assert gc.get_threshold() == controller.default_gc_threshold
+
+    def test_cache_share_recovers(self, engine):
+        """Test that the cache share grows back once usage is low."""
+        if rss_bytes() is None:
+            pytest.skip("RSS cannot be measured on this platform")
+        controller = MemoryController(budget=1 << 50)
+        controller.cache_budget_factor = 0.5
+
+        report = controller.step(engine)
+
+        assert not report["pressure"]
+        assert controller.cache_budget_factor == pytest.approx(0.625)
+
+    def test_allocation_heavy_phase_raises_gc_threshold(self, engine, gc_threshold):
+        """Test that frequent young collections raise the gen-0 threshold."""
+        controller = MemoryController(budget=1 << 50, gc_rate=0.0)
+        controller.step(engine)
+        gc.collect(0)
+
+        report = controller.step(engine)
+
+        tuned = [action for action in report["actions"] if action["action"] == "gc_threshold"]
+        assert tuned
+        assert gc.get_threshold()[0] == 2 * gc_threshold[0]
+
+    def test_optimize_reports_memory(self, engine):
+        """Test that optimization cycles include the memory report."""
+        result = engine.optimize()
+
+        assert result["status"] == "completed"
+        assert result["memory"]["budget"] > 0
+        assert "memory_optimization" in result["actions"]
+
+
+class TestRecycleWorkers:
+    """Test cases for ParallelProcessor.recycle_workers."""
+
+    def test_recycle_process_pool(self):
+        """Test that recycling replaces the process workers."""
+        processor = ParallelProcessor(max_workers=2, use_processes=True)
+        processor.initialize()
+        try:
+            before = set(processor.process_batch([0, 1, 2, 3], _pid))
+            assert before <= set(processor.worker_pids()["process"])
+
+            assert processor.recycle_workers(reason="memory")
+            after = set(processor.process_batch([0, 1, 2, 3], _pid))
+
+            assert before.isdisjoint(after)
+            assert processor.max_workers == 2
+            assert processor.resize_history[-1]["reason"] == "memory"
+            assert processor.get_stats()["pools"]["process"]["recycled"] == 2
+        finally:
+            processor.shutdown()
+
+    def test_recycle_one_worker(self):
+        """Test that recycling a single worker leaves the others running."""
+        processor = ParallelProcessor(max_workers=2, use_processes=True)
+        processor.initialize()
+        try:
+            processor.prestart(timeout=10)
+            bloated, kept = sorted(processor.worker_pids()["process"])
+
+            assert processor.recycle_workers(reason="memory", pids=[bloated])
+            processor.prestart(timeout=10)
+            after = processor.worker_pids()["process"]
+
+            assert kept in after and bloated not in after
+            assert len(after) == 2
+            assert processor.resize_history[-1]["recycled"] == 1
+            assert not processor.recycle_workers(pids=[bloated])
+        finally:
+            processor.shutdown()
+
+    def test_thread_pool_not_recycled(self):
+        """Test that thread pools have no workers to recycle."""
+        processor = ParallelProcessor(max_workers=2)
+        processor.initialize()
+        try:
+            assert not processor.recycle_workers()
+            assert processor.worker_pids() == {"thread": []}
+        finally:
+            processor.shutdown()
@@ -2,8 +2,13 @@
 Tests for SelfOptimizer
 """
 
+import threading
+import time
 import pytest
+from uhip import HybridEngine
 from uhip.core.optimizer import SelfOptimizer
+from uhip.core.processor import ParallelProcessor
+from uhip.core.tuning import ParallelismTuner
 from uhip.config import EngineConfig
 
 
@@ -127,6 +132,186 @@ class TestSelfOptimizer:
         assert optimizer.profile.learning_rate == 0.05
 
 
+def _window(throughput, latency):
+    return {"throughput": throughput, "latency": latency, "tasks": 100}
+
+
+class TestParallelismTuner:
+    """Test cases for the hill-climbing parallelism tuner."""
+
+    def test_climb_and_rollback(self, tuning_processor):
+        """Test that improvements are kept and regressions rolled back."""
+        tuner = ParallelismTuner()
+        
+        trial = tuner.decide(tuning_processor, _window(100.0, 0.010))
+        assert trial[0]["action"] == "trial"
+        assert (trial[0]["from"], trial[0]["to"]) == (2, 3)
+        assert tuning_processor.max_workers == 3
+        
+        changes = tuner.decide(tuning_processor, _window(130.0, 0.010))
+        assert [c["action"] for c in changes] == ["keep", "trial"]
+        assert tuning_processor.max_workers == 4
+        
+        changes = tuner.decide(tuning_processor, _window(90.0, 0.020))
+        assert changes[0]["action"] == "rollback"
+        assert (changes[0]["from"], changes[0]["to"]) == (4, 3)
+        assert tuning_processor.max_workers == 3
+        assert tuner.baseline is None
+        
+        # Fresh baseline, then the opposite direction is tried
+        trial = tuner.decide(tuning_processor, _window(130.0, 0.010))
+        assert (trial[0]["from"], trial[0]["to"]) == (3, 2)
+
+    def test_latency_gain_is_kept(self, tuning_processor):
+        """Test that a latency improvement at equal throughput is kept."""
+        tuner = ParallelismTuner()
+        tuner.decide(tuning_processor, _window(100.0, 0.010))
+        
+        changes = tuner.decide(tuning_processor, _window(100.0, 0.008))
+        
+        assert changes[0]["action"] == "keep"
+        assert tuner.stats["kept"] == 1
+
+    def test_unavailable_knobs_skipped(self, tuning_processor):
+        """Test that chunk size and mode are only tuned when they apply."""
+        tuner = ParallelismTuner()
+        tuning_processor.min_workers = tuning_processor.max_workers_limit = 2
+        
+        # Worker count pinned, no work stealing and no hybrid pools
+        assert tuner.decide(tuning_processor, _window(100.0, 0.010)) == []
+        
+        tuning_processor.work_stealing = True
+        trial = tuner.decide(tuning_processor, _window(100.0, 0.010))
+        
+        assert (trial[0]["knob"], trial[0]["from"], trial[0]["to"]) == ("chunk_size", None, 16)
+        assert tuning_processor.steal_chunk_size == 16
+
+    def test_measure_needs_samples(self, tuning_processor):
+        """Test that windows are only judged after enough completed tasks."""
+        tuner = ParallelismTuner(min_samples=10)
+        
+        assert tuner.measure(tuning_processor, {}) is None
+        tuning_processor.process_batch(list(range(5)), abs)
+        assert tuner.measure(tuning_processor, {}) is None
+        tuning_processor.process_batch(list(range(5)), abs)
+        window = tuner.measure(tuning_processor, {"general": {"count": 4, "total_time": 0.2}})
+        
+        assert window["tasks"] == 10
+        assert window["throughput"] > 0
+        assert window["latency"] == pytest.approx(0.05)
+
+    def test_measure_counts_completions_per_second(self, tuning_processor):
+        """Test that idle workers do not add to the measured throughput."""
+        tuner = ParallelismTuner(min_samples=10)
+        tuner.measure(tuning_processor, {})
+        
+        start = time.monotonic()
+        for _ in range(10):
+            tuning_processor.process_batch([0.01], time.sleep)
+            time.sleep(0.02)
+        elapsed = time.monotonic() - start
+        window = tuner.measure(tuning_processor, {})
+        
+        assert window["utilization"] < 0.5
+        assert window["throughput"] == pytest.approx(10 / elapsed, rel=0.3)
+        assert window["throughput"] < 40
+
+    def test_engine_optimize_records_changes(self):
+        """Test that optimization cycles tune the engine's processor."""
+        config = EngineConfig(max_workers=2, max_workers_limit=4, auto_optimize=False)
+        engine = HybridEngine(config)
+        engine.initialize()
+        engine.optimizer.tuner.min_samples = 10
+        try:
+            engine.batch_process(list(range(20)), task_type="edge")
+            result = engine.optimize()
+        finally:
+            engine.shutdown()
+        
+        tuning = [change for change in result["changes"] if change["knob"] == "workers"]
+        assert tuning[0]["action"] == "trial"
+        assert engine.processor.max_workers == 3
+        assert engine.optimizer.get_optimization_history()[-1]["changes"] == result["changes"]
+
+
+class TestBackgroundOptimization:
+    """Test cases for the background optimization loop."""
+
+    def test_interval_triggers_optimization(self):
+        """Test that cycles run on optimization_interval without requests."""
+        optimizer = SelfOptimizer(EngineConfig(optimization_interval=0))
+        optimizer.initialize()
+        optimizer.start(lambda: {"general": {"avg_time": 0.01, "count": 1}})
+        try:
+            _wait_for(lambda: len(optimizer.get_optimization_history()) >= 2)
+        finally:
+            optimizer.stop()
+        
+        assert optimizer.last_analysis["status"] == "healthy"
+        assert not optimizer.get_loop_stats()["running"]
+
+    def test_event_wakes_loop(self):
+        """Test that notify() analyzes early and optimizes on attention-worthy metrics."""
+        optimizer = SelfOptimizer(EngineConfig(optimization_interval=3600))
+        optimizer.initialize()
+        optimizer.start(lambda: {"slow": {"avg_time": 5.0, "count": 1}})
+        try:
+            optimizer.notify()
+            _wait_for(lambda: optimizer.get_loop_stats()["optimizations"] == 1)
+        finally:
+            optimizer.stop()
+        
+        assert optimizer.get_loop_stats()["events"] == 1
+        assert optimizer.last_analysis["status"] == "needs_attention"
+
+    def test_event_without_attention_waits_for_interval(self):
+        """Test that healthy event analyses do not optimize early."""
+        optimizer = SelfOptimizer(EngineConfig(optimization_interval=3600))
+        optimizer.initialize()
+        
+        assert optimizer.run_cycle(event=True) is None
+        assert optimizer.last_analysis["status"] == "healthy"
+
+    def test_process_does_not_analyze(self, monkeypatch):
+        """Test that requests never run the analysis on the calling thread."""
+        engine = HybridEngine(EngineConfig(max_workers=2, optimization_interval=3600))
+        calls = []
+        original = engine.optimizer.analyze_metrics
+        
+        def analyze(metrics):
+            calls.append(threading.current_thread().name)
+            return original(metrics)
+        
+        monkeypatch.setattr(engine.optimizer, "analyze_metrics", analyze)
+        engine.initialize()
+        try:
+            for _ in range(20):
+                engine.process({"x": 1}, task_type="general")
+            _wait_for(lambda: calls)
+            assert engine.optimizer.get_loop_stats()["running"]
+        finally:
+            engine.shutdown()
+        
+        assert set(calls) == {"uhip-optimizer"}
+        assert not engine.optimizer.get_loop_stats()["running"]
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def tuning_processor():
+    """Initialized processor with room to grow from 2 to 4 workers."""
+    processor = ParallelProcessor(max_workers=2, min_workers=1, max_workers_limit=4)
+    processor.initialize()
+    yield processor
+    processor.shutdown()
+
+
 @pytest.fixture
 def optimizer():
     """Fixture providing an initialized optimizer."""
@@ -0,0 +1,107 @@
+"""
+Tests for CPU placement of process workers
+"""
+
+import pytest
+
+from uhip.core.placement import (
+    affinity_supported,
+    numa_topology,
+    parse_cpulist,
+    plan_placement,
+)
+from uhip.core.processor import ParallelProcessor
+
+DUAL_SOCKET = {0: [0, 1, 2, 3], 1: [4, 5, 6, 7]}
+
+
+class TestPlacementPlanning:
+    """Test cases for topology discovery and placement plans."""
+
+    def test_parse_cpulist(self):
+        """Test parsing kernel CPU lists."""
+        assert parse_cpulist("0-3,8,10-11\n") == {0, 1, 2, 3, 8, 10, 11}
+        assert parse_cpulist("") == set()
+
+    def test_topology_from_sysfs(self, tmp_path):
+        """Test reading NUMA nodes restricted to the allowed CPUs."""
+        if not affinity_supported():
+            pytest.skip("CPU affinity not supported")
+        for node, cpulist in ((0, "0-1023"), (1, "2048-2050")):
+            (tmp_path / f"node{node}").mkdir()
+            (tmp_path / f"node{node}" / "cpulist").write_text(cpulist)
+        
+        topology = numa_topology(str(tmp_path))
+        
+        # Node 1 has no CPUs this process may use
+        assert list(topology) == [0]
+
+    def test_topology_fallback_without_numa(self, tmp_path):
+        """Test that machines without NUMA information report one node."""
+        topology = numa_topology(str(tmp_path))
+        
+        assert list(topology) == [0]
+        assert topology[0]
+
+    def test_core_plan_stays_on_one_node(self):
+        """Test that a pool that fits on one node is pinned there."""
+        plan = plan_placement("core", 3, DUAL_SOCKET)
+        
+        assert plan == [[0], [1], [2]]
+
+    def test_core_plan_spills_to_second_node(self):
+        """Test that larger pools use the next node."""
+        plan = plan_placement("core", 6, DUAL_SOCKET)
+        
+        assert plan == [[0], [1], [2], [3], [4], [5]]
+
+    def test_node_plan(self):
+        """Test node-level pinning, with and without spilling."""
+        assert plan_placement("node", 2, DUAL_SOCKET) == [[0, 1, 2, 3]] * 2
+        assert plan_placement("node", 5, DUAL_SOCKET) == [[0, 1, 2, 3]] * 4 + [[4, 5, 6, 7]]
+
+    def test_node_plan_prefers_smallest_fitting_node(self):
+        """Test that small pools leave the largest node free."""
+        topology = {0: list(range(8)), 1: [8, 9]}
+        
+        assert plan_placement("node", 2, topology) == [[8, 9]] * 2
+
+    def test_none_and_unknown_policies(self):
+        """Test the disabled policy and validation."""
+        assert plan_placement("none", 4, DUAL_SOCKET) == []
+        with pytest.raises(ValueError):
+            plan_placement("socket", 4, DUAL_SOCKET)
+
+
+class TestProcessorPlacement:
+    """Test cases for placement in ParallelProcessor."""
+
+    def test_pinned_process_workers(self):
+        """Test that process workers run on their planned CPUs."""
+        if not affinity_supported():
+            pytest.skip("CPU affinity not supported")
+        processor = ParallelProcessor(max_workers=2, use_processes=True, placement="core")
+        processor.initialize()
+        processor.prestart(timeout=10)
+        
+        placement = processor.get_stats()["placement"]
+        planned = [cpu for cpus in placement["plan"] for cpu in cpus]
+        assert placement["applied"]
+        assert len(placement["plan"]) == 2
+        assert placement["workers"]
+        for cpus in placement["workers"].values():
+            assert len(cpus) == 1
+            assert cpus[0] in planned
+        
+        processor.shutdown()
+
+    def test_thread_pools_not_pinned(self):
+        """Test that placement only applies to process pools."""
+        processor = ParallelProcessor(max_workers=2, placement="node")
+        
+        assert processor.get_stats()["placement"]["applied"] is False
+
+    def test_invalid_placement(self):
+        """Test that unknown policies are rejected."""
+        with pytest.raises(ValueError):
+            ParallelProcessor(placement="socket")
@@ -0,0 +1,182 @@
+"""
+Tests for ResizableThreadPool
+"""
+
+import os
+import threading
+import time
+from concurrent.futures.thread import BrokenThreadPool
+
+import pytest
+
+from uhip.core.pool import (
+    POOL_PROCESS,
+    POOL_THREAD,
+    ResizableProcessPool,
+    ResizableThreadPool,
+    WorkloadProfiler,
+    timed_call,
+)
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestResizableThreadPool:
+    """Test cases for ResizableThreadPool."""
+
+    def test_submit(self):
+        """Test basic task execution."""
+        pool = ResizableThreadPool(max_workers=2)
+        
+        assert pool.submit(pow, 2, 10).result(timeout=1) == 1024
+        
+        pool.shutdown()
+
+    def test_grow_and_shrink(self):
+        """Test that resizing changes the live worker count."""
+        pool = ResizableThreadPool(max_workers=2)
+        
+        pool.resize(5)
+        assert pool.size == 5
+        assert pool.live_threads() == 5
+        
+        pool.resize(1)
+        assert _wait_for(lambda: pool.live_threads() == 1)
+        
+        pool.shutdown()
+
+    def test_shrink_waits_for_running_tasks(self):
+        """Test that busy workers finish their task before retiring."""
+        pool = ResizableThreadPool(max_workers=2)
+        gate = threading.Event()
+        futures = [pool.submit(gate.wait, 5) for _ in range(2)]
+        
+        pool.resize(1)
+        time.sleep(0.05)
+        assert not any(f.done() for f in futures)
+        
+        gate.set()
+        assert all(f.result(timeout=1) for f in futures)
+        assert _wait_for(lambda: pool.live_threads() == 1)
+        
+        pool.shutdown()
+
+    def test_initializer_runs_per_thread(self):
+        """Test that each new worker runs the initializer."""
+        calls = []
+        pool = ResizableThreadPool(max_workers=2, initializer=calls.append, initargs=(1,))
+        pool.resize(3)
+        
+        assert _wait_for(lambda: len(calls) == 3)
+        
+        pool.shutdown()
+
+    def test_failing_initializer_breaks_pool(self):
+        """Test that queued work fails instead of hanging when init fails."""
+        gate = threading.Event()
+        
+        def initializer():
+            gate.wait(5)
+            raise ValueError("no state")
+        
+        pool = ResizableThreadPool(max_workers=2, initializer=initializer)
+        future = pool.submit(pow, 2, 10)
+        gate.set()
+        
+        with pytest.raises(BrokenThreadPool):
+            future.result(timeout=2)
+        with pytest.raises(BrokenThreadPool):
+            pool.submit(pow, 2, 10)
+        assert _wait_for(lambda: pool.live_threads() == 0)
+        
+        pool.shutdown()
+
+    def test_shutdown_rejects_new_work(self):
+        """Test that submit fails after shutdown."""
+        pool = ResizableThreadPool(max_workers=1)
+        pool.shutdown()
+        
+        with pytest.raises(RuntimeError):
+            pool.submit(print)
+
+
+class TestResizableProcessPool:
+    """Test cases for ResizableProcessPool."""
+
+    def test_grow_keeps_running_workers(self):
+        """Test that growing adds workers without restarting the others."""
+        pool = ResizableProcessPool(max_workers=1)
+        first = pool.submit(os.getpid).result(timeout=10)
+        
+        pool.resize(3)
+        pids = {f.result(timeout=10) for f in [pool.submit(os.getpid) for _ in range(6)]}
+        
+        assert pool.size == 3
+        assert first in pids
+        assert first in pool.pids()
+        
+        pool.shutdown()
+
+    def test_replace_one_worker(self):
+        """Test that replacing a worker leaves the others running."""
+        pool = ResizableProcessPool(max_workers=2)
+        [f.result(timeout=10) for f in [pool.submit(time.sleep, 0.05) for _ in range(2)]]
+        old, kept = sorted(pool.pids())
+        
+        assert pool.replace(old)
+        assert not pool.replace(old)
+        [f.result(timeout=10) for f in [pool.submit(time.sleep, 0.05) for _ in range(2)]]
+        
+        assert kept in pool.pids()
+        assert old not in pool.pids()
+        assert len(pool.pids()) == 2
+        
+        pool.shutdown()
+
+
+class TestWorkloadProfiler:
+    """Test cases for WorkloadProfiler."""
+
+    def test_unknown_task_type_uses_threads(self):
+        """Test the default pool before any samples exist."""
+        assert WorkloadProfiler().choose("new") == POOL_THREAD
+
+    def test_cpu_bound_moves_to_processes(self):
+        """Test that a high CPU/wall ratio routes to the process pool."""
+        profiler = WorkloadProfiler(min_samples=3)
+        for _ in range(2):
+            profiler.record("crunch", 0.9, 1.0)
+        
+        assert profiler.choose("crunch") == POOL_THREAD
+        
+        profiler.record("crunch", 0.9, 1.0)
+        
+        assert profiler.choose("crunch") == POOL_PROCESS
+        assert profiler.get_stats()["crunch"]["samples"] == 3
+
+    def test_hysteresis_between_thresholds(self):
+        """Test that ratios between the thresholds keep the current pool."""
+        profiler = WorkloadProfiler(min_samples=1, alpha=1.0)
+        profiler.record("mixed", 1.0, 1.0)
+        profiler.record("mixed", 0.4, 1.0)
+        
+        assert profiler.choose("mixed") == POOL_PROCESS
+        
+        profiler.record("mixed", 0.1, 1.0)
+        
+        assert profiler.choose("mixed") == POOL_THREAD
+
+    def test_timed_call_measures_wall_time(self):
+        """Test that timed_call returns the result with its timings."""
+        result, cpu_time, wall_time = timed_call(time.sleep, 0.05)
+        
+        assert result is None
+        assert wall_time >= 0.05
+        assert cpu_time < wall_time
@@ -2,10 +2,49 @@
 Tests for ParallelProcessor
 """
 
+import threading
+import time
 import pytest
+from uhip.core.exceptions import DeadlineExceeded
+from uhip.core.pool import POOL_PROCESS
 from uhip.core.processor import ParallelProcessor
 
 
+def _double(x):
+    """Module-level worker so it can be pickled into process pools."""
+    return x * 2
+
+
+def _set_marker(value):
+    """Worker initializer used to verify per-worker setup."""
+    global _MARKER
+    _MARKER = value
+
+
+def _read_marker(_):
+    return _MARKER
+
+
+_MARKER = None
+
+
+def _square(x):
+    return x * x
+
+
+def _add(a, b):
+    return a + b
+
+
+def _wrap(x):
+    return [x]
+
+
+def _sleep_zero(seconds):
+    time.sleep(seconds)
+    return 0
+
+
 class TestParallelProcessor:
     """Test cases for ParallelProcessor."""
 
@@ -38,9 +77,30 @@ class TestParallelProcessor:
 
     def test_process_based_processing(self):
         """Test process-based parallel processing."""
-        # Skip this test as local functions can't be pickled for process-based execution
-        # This is expected behavior for ProcessPoolExecutor
-        pytest.skip("Process-based execution requires picklable functions")
+        processor = ParallelProcessor(max_workers=2, use_processes=True)
+        processor.initialize()
+        
+        results = processor.process_batch([1, 2, 3, 4, 5], _double)
+        
+        assert results == [2, 4, 6, 8, 10]
+        
+        processor.shutdown()
+
+    def test_worker_initializer(self):
+        """Test that the initializer runs inside each worker process."""
+        processor = ParallelProcessor(
+            max_workers=2,
+            use_processes=True,
+            initializer=_set_marker,
+            initargs=("ready",),
+        )
+        processor.initialize()
+        
+        results = processor.process_batch([1, 2, 3], _read_marker)
+        
+        assert results == ["ready", "ready", "ready"]
+        
+        processor.shutdown()
 
     def test_empty_batch(self):
         """Test processing empty batch."""
@@ -126,6 +186,276 @@ class TestParallelProcessor:
         assert not processor.initialized
 
 
+class TestDeadlines:
+    """Test cases for deadline-aware scheduling."""
+
+    def test_batch_timeout_bounds_latency(self):
+        """Test that a hanging item does not hold the caller past the timeout."""
+        processor = ParallelProcessor(max_workers=2)
+        processor.initialize()
+        release = threading.Event()
+        
+        def worker(x):
+            if x == 0:
+                release.wait(5)
+            return x
+        
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            processor.process_batch([0, 1, 2, 3], worker, timeout=0.2, task_type="edge")
+        
+        assert time.monotonic() - start < 1.0
+        assert processor.get_stats()["timeouts"]["edge"]["abandoned"] == 1
+        
+        release.set()
+        processor.shutdown()
+
+    def test_expired_tasks_dropped_before_start(self):
+        """Test that queued tasks past their deadline never run."""
+        processor = ParallelProcessor(max_workers=1)
+        processor.initialize()
+        started = []
+        gate = threading.Event()
+        running = threading.Event()
+        
+        def block():
+            running.set()
+            gate.wait(5)
+        
+        blocker = processor.submit(block)
+        running.wait(5)
+        late = processor.submit(started.append, (1,), task_type="general",
+                                deadline=time.monotonic() + 0.05)
+        time.sleep(0.1)
+        gate.set()
+        
+        blocker.result(timeout=5)
+        with pytest.raises(DeadlineExceeded):
+            late.result(timeout=5)
+        assert started == []
+        assert processor.get_stats()["timeouts"]["general"]["expired"] == 1
+        
+        processor.shutdown()
+
+    def test_earliest_deadline_first(self):
+        """Test that queued tasks run in deadline order."""
+        processor = ParallelProcessor(max_workers=1)
+        processor.initialize()
+        order = []
+        gate = threading.Event()
+        running = threading.Event()
+        now = time.monotonic()
+        
+        def block():
+            running.set()
+            gate.wait(5)
+        
+        processor.submit(block)
+        running.wait(5)
+        futures = [
+            processor.submit(order.append, ("none",)),
+            processor.submit(order.append, ("late",), deadline=now + 30),
+            processor.submit(order.append, ("early",), deadline=now + 10),
+        ]
+        gate.set()
+        
+        for future in futures:
+            future.result(timeout=5)
+        assert order == ["early", "late", "none"]
+        
+        processor.shutdown()
+
+
+class TestResizing:
+    """Test cases for runtime pool resizing."""
+
+    def test_resize_threads_clamped_to_bounds(self):
+        """Test resizing a thread pool within its bounds."""
+        processor = ParallelProcessor(max_workers=2, min_workers=1, max_workers_limit=6)
+        processor.initialize()
+        
+        assert processor.resize(4) == 4
+        assert processor.executor.size == 4
+        assert processor.resize(100) == 6
+        assert processor.resize(0) == 1
+        assert processor.process_batch([1, 2, 3], _double) == [2, 4, 6]
+        assert [entry["to"] for entry in processor.resize_history] == [4, 6, 1]
+        
+        processor.shutdown()
+
+    def test_resize_processes_keeps_in_flight_work(self):
+        """Test that swapping the process pool does not drop running tasks."""
+        processor = ParallelProcessor(max_workers=2, use_processes=True, max_workers_limit=4)
+        processor.initialize()
+        
+        futures = [processor.submit(time.sleep, (0.2,)) for _ in range(2)]
+        time.sleep(0.05)
+        processor.resize(3)
+        
+        assert [f.result(timeout=5) for f in futures] == [None, None]
+        assert processor.process_batch([1, 2, 3], _double) == [2, 4, 6]
+        assert processor.get_stats()["max_workers"] == 3
+        
+        processor.shutdown()
+
+    def test_resize_processes_reuses_warm_workers(self):
+        """Test that resizing a process pool keeps the running workers."""
+        processor = ParallelProcessor(max_workers=2, use_processes=True, max_workers_limit=4)
+        processor.initialize()
+        processor.prestart(timeout=10)
+        before = set(processor.worker_pids()[POOL_PROCESS])
+        
+        assert processor.resize(4) == 4
+        processor.prestart(timeout=10)
+        grown = set(processor.worker_pids()[POOL_PROCESS])
+        assert before < grown and len(grown) == 4
+        
+        assert processor.resize(3) == 3
+        assert len(set(processor.worker_pids()[POOL_PROCESS]) & grown) == 3
+        assert processor.process_batch([1, 2, 3], _double) == [2, 4, 6]
+        
+        processor.shutdown()
+
+    def test_evaluate_scaling_grows_under_backlog(self):
+        """Test that queued work on a busy pool triggers growth."""
+        processor = ParallelProcessor(max_workers=1, max_workers_limit=4)
+        processor.initialize()
+        gate = threading.Event()
+        futures = [processor.submit(gate.wait, (5,)) for _ in range(4)]
+        time.sleep(0.05)
+        
+        processor.evaluate_scaling()
+        size = processor.evaluate_scaling()
+        
+        assert size > 1
+        gate.set()
+        for future in futures:
+            future.result(timeout=5)
+        processor.shutdown()
+
+    def test_evaluate_scaling_shrinks_when_idle(self):
+        """Test that an idle pool shrinks one worker at a time."""
+        processor = ParallelProcessor(max_workers=4, min_workers=2)
+        processor.initialize()
+        
+        assert processor.evaluate_scaling() == 3
+        assert processor.evaluate_scaling() == 2
+        assert processor.evaluate_scaling() == 2
+        
+        processor.shutdown()
+
+
+class TestHybridPools:
+    """Test cases for side-by-side thread and process pools."""
+
+    def test_explicit_pool_routing(self):
+        """Test that tasks run on the pool they ask for."""
+        processor = ParallelProcessor(max_workers=2, hybrid=True, secondary_workers=2)
+        processor.initialize()
+        
+        assert processor.pools == ["thread", "process"]
+        assert processor.submit(_double, (2,), pool="process").result(timeout=10) == 4
+        assert processor.submit(_double, (3,), pool="thread").result(timeout=10) == 6
+        
+        pools = processor.get_stats()["pools"]
+        assert pools["process"]["completed"] == 1
+        assert pools["thread"]["completed"] == 1
+        
+        processor.shutdown()
+
+    def test_profiled_routing(self):
+        """Test that an I/O-bound task type stays on the thread pool."""
+        processor = ParallelProcessor(max_workers=2, hybrid=True, secondary_workers=1)
+        processor.profiler.min_samples = 2
+        processor.initialize()
+        
+        processor.process_batch([0.02] * 4, time.sleep, task_type="io")
+        
+        stats = processor.get_stats()
+        assert stats["profiles"]["io"]["pool"] == "thread"
+        assert stats["pools"]["thread"]["completed"] == 4
+        assert stats["pools"]["process"]["completed"] == 0
+        
+        processor.profiler.record("crunch", 1.0, 1.0)
+        processor.profiler.record("crunch", 1.0, 1.0)
+        assert processor.submit(_double, (5,), task_type="crunch").result(timeout=10) == 10
+        assert processor.get_stats()["pools"]["process"]["completed"] == 1
+        
+        processor.shutdown()
+
+    def test_resize_secondary_pool(self):
+        """Test resizing one pool leaves the other untouched."""
+        processor = ParallelProcessor(
+            max_workers=2, hybrid=True, secondary_workers=1, max_workers_limit=4
+        )
+        processor.initialize()
+        
+        assert processor.resize(3, pool="process") == 3
+        
+        pools = processor.get_stats()["pools"]
+        assert pools["process"]["max_workers"] == 3
+        assert pools["thread"]["max_workers"] == 2
+        assert processor.resize_history[-1]["pool"] == "process"
+        
+        processor.shutdown()
+
+
+class TestReduce:
+    """Test cases for process_reduce."""
+
+    def test_sum_of_squares(self):
+        """Test a chunked map-reduce against the serial result."""
+        processor = ParallelProcessor(max_workers=3)
+        processor.initialize()
+        
+        result = processor.process_reduce(list(range(100)), _square, _add, 0, chunk_size=7)
+        
+        assert result == sum(x * x for x in range(100))
+        
+        processor.shutdown()
+
+    def test_order_preserved(self):
+        """Test that a non-commutative combine keeps input order."""
+        processor = ParallelProcessor(max_workers=4)
+        processor.initialize()
+        
+        result = processor.process_reduce(list(range(50)), _wrap, _add, [], chunk_size=3, fan_in=3)
+        
+        assert result == list(range(50))
+        
+        processor.shutdown()
+
+    def test_empty_input_returns_init(self):
+        """Test reducing nothing."""
+        processor = ParallelProcessor(max_workers=1)
+        processor.initialize()
+        
+        assert processor.process_reduce([], _square, _add, 0) == 0
+        with pytest.raises(ValueError):
+            processor.process_reduce([1], _square, _add, 0, fan_in=1)
+        
+        processor.shutdown()
+
+    def test_process_pool(self):
+        """Test map-reduce on a process pool."""
+        processor = ParallelProcessor(max_workers=2, use_processes=True)
+        processor.initialize()
+        
+        assert processor.process_reduce(list(range(20)), _square, _add, 0) == 2470
+        
+        processor.shutdown()
+
+    def test_deadline(self):
+        """Test that a reduction honours its deadline."""
+        processor = ParallelProcessor(max_workers=1)
+        processor.initialize()
+        
+        with pytest.raises(DeadlineExceeded):
+            processor.process_reduce([0.05] * 10, _sleep_zero, _add, 0, chunk_size=1, timeout=0.1)
+        
+        processor.shutdown()
+
+
 @pytest.fixture
 def processor():
     """Fixture providing an initialized processor."""
@@ -0,0 +1,238 @@
+"""
+Tests for workload fingerprinting and profile persistence
+"""
+
+import json
+import os
+
+import pytest
+
+from uhip import HybridEngine
+from uhip.config import EngineConfig
+from uhip.core.optimizer import OptimizationProfile
+from uhip.core.profiles import (
+    ProfileStore,
+    WorkloadFingerprint,
+    WorkloadTracker,
+    _log2_bucket,
+)
+
+MIXED = WorkloadFingerprint(mix=(("edge", 0.5), ("general", 0.5)), size_bucket=6, rate_bucket=10)
+SCAN = WorkloadFingerprint(mix=(("general", 1.0),), size_bucket=20, rate_bucket=2)
+
+
+def _record(fingerprint, max_workers, score=1.0):
+    return {
+        "fingerprint": fingerprint.to_dict(),
+        "profile": {"name": "tuned", "adaptation_threshold": 0.3},
+        "settings": {"max_workers": max_workers},
+        "score": score,
+    }
+
+
+def _engine(profile_dir):
+    config = EngineConfig(
+        max_workers=2,
+        max_workers_limit=4,
+        auto_optimize=False,
+        tune_parallelism=False,
+        profile_dir=str(profile_dir),
+    )
+    engine = HybridEngine(config)
+    engine.initialize()
+    return engine
+
+
+class TestWorkloadTracker:
+    """Test cases for WorkloadTracker."""
+
+    def test_fingerprint_buckets(self):
+        """Test that mix shares are rounded and small types dropped."""
+        tracker = WorkloadTracker(min_requests=10)
+        for i in range(100):
+            task_type = "edge" if i % 3 == 0 else "general"
+            tracker.record(task_type, b"x" * 100)
+        tracker.record("rare", b"x")
+
+        fingerprint = tracker.fingerprint()
+
+        assert fingerprint.mix == (("edge", 0.3), ("general", 0.7))
+        assert fingerprint.size_bucket == 6
+        assert tracker.fingerprint() is None
+
+    def test_similar_windows_match(self):
+        """Test that windows differing by noise share a fingerprint."""
+        keys = set()
+        for offset in range(3):
+            tracker = WorkloadTracker(min_requests=10)
+            for i in range(100 + offset):
+                tracker.record("general" if i % 2 else "edge", list(range(10)))
+            fingerprint = tracker.fingerprint()
+            keys.add((fingerprint.mix, fingerprint.size_bucket))
+
+        assert len(keys) == 1
+
+    def test_buckets_have_hysteresis(self):
+        """Test that a value near a bucket edge keeps its previous bucket."""
+        assert _log2_bucket(1000.0, None) == 9
+        assert _log2_bucket(1030.0, 9) == 9
+        assert _log2_bucket(980.0, 10) == 10
+        assert _log2_bucket(1300.0, 9) == 10
+        assert _log2_bucket(300.0, 9) == 8
+
+    def test_batches_count_every_item(self):
+        """Test that a batch contributes its item count."""
+        tracker = WorkloadTracker(min_requests=50)
+        tracker.record("general", 1, count=60)
+
+        assert tracker.fingerprint().mix == (("general", 1.0),)
+
+
+class TestWorkloadFingerprint:
+    """Test cases for WorkloadFingerprint."""
+
+    def test_round_trip_and_key(self):
+        """Test that serialized fingerprints keep their key."""
+        restored = WorkloadFingerprint.from_dict(MIXED.to_dict())
+
+        assert restored == MIXED
+        assert restored.key == MIXED.key
+        assert MIXED.key != SCAN.key
+
+    def test_distance(self):
+        """Test mix and bucket contributions to the distance."""
+        shifted = WorkloadFingerprint(MIXED.mix, MIXED.size_bucket + 1, MIXED.rate_bucket)
+
+        assert MIXED.distance(MIXED) == 0.0
+        assert MIXED.distance(shifted) == pytest.approx(0.25)
+        assert MIXED.distance(SCAN) > 1.0
+
+
+class TestProfileStore:
+    """Test cases for ProfileStore."""
+
+    def test_save_keeps_best_score(self, tmp_path):
+        """Test that a worse score does not replace a stored profile."""
+        store = ProfileStore(str(tmp_path / "profiles"))
+
+        assert store.save(MIXED, {"name": "a"}, {"max_workers": 4}, score=100.0)
+        assert not store.save(MIXED, {"name": "b"}, {"max_workers": 2}, score=50.0)
+        assert store.get(MIXED.key)["settings"] == {"max_workers": 4}
+        assert os.listdir(str(tmp_path / "profiles")) == [f"{MIXED.key}.json"]
+
+    def test_stale_score_ages_out(self, tmp_path):
+        """Test that an old score is replaced by a lower but current one."""
+        store = ProfileStore(str(tmp_path), score_half_life=3600.0)
+        assert store.save(MIXED, {"name": "a"}, {"max_workers": 4}, score=100.0)
+        assert not store.save(MIXED, {"name": "b"}, {"max_workers": 2}, score=100.0)
+
+        record = store.get(MIXED.key)
+        record["updated"] -= 2 * 3600.0
+        with open(str(tmp_path / f"{MIXED.key}.json"), "w") as f:
+            json.dump(record, f)
+
+        assert store.aged_score(record) == pytest.approx(25.0, rel=0.01)
+        assert store.save(MIXED, {"name": "b"}, {"max_workers": 2}, score=50.0)
+        assert store.get(MIXED.key)["settings"] == {"max_workers": 2}
+
+    def test_replace_revalidates(self, tmp_path):
+        """Test that a re-measurement overwrites the stored score."""
+        store = ProfileStore(str(tmp_path))
+        store.save(MIXED, {}, {"max_workers": 4}, score=100.0)
+
+        assert store.save(MIXED, {}, {"max_workers": 4}, score=40.0, replace=True)
+        assert store.get(MIXED.key)["score"] == 40.0
+
+    def test_best_match(self, tmp_path):
+        """Test nearest-fingerprint lookup within the distance limit."""
+        store = ProfileStore(str(tmp_path))
+        store.save(MIXED, {}, {"max_workers": 4}, score=1.0)
+        store.save(SCAN, {}, {"max_workers": 1}, score=1.0)
+        nearby = WorkloadFingerprint(MIXED.mix, MIXED.size_bucket, MIXED.rate_bucket + 1)
+        unknown = WorkloadFingerprint((("quantum", 1.0),), 0, 0)
+
+        assert store.best_match(nearby)["settings"] == {"max_workers": 4}
+        assert store.best_match(unknown) is None
+
+    def test_unreadable_profile_ignored(self, tmp_path):
+        """Test that a corrupt file does not break lookups."""
+        store = ProfileStore(str(tmp_path))
+        (tmp_path / "broken.json").write_text("{")
+
+        assert store.records() == []
+        assert store.latest() is None
+
+    def test_malformed_record_ignored(self, tmp_path):
+        """Test that a record with a bad fingerprint is skipped."""
+        store = ProfileStore(str(tmp_path))
+        record = _record(MIXED, max_workers=3)
+        record["fingerprint"] = {"mix": [["general", 1.0]]}
+        (tmp_path / "bad.json").write_text(json.dumps(record))
+
+        assert store.records() == []
+        assert store.best_match(MIXED) is None
+
+
+class TestEngineProfiles:
+    """Test cases for profile selection in the engine."""
+
+    def test_restart_restores_latest_profile(self, tmp_path):
+        """Test that a new engine starts from the saved settings."""
+        with open(str(tmp_path / f"{MIXED.key}.json"), "w") as f:
+            json.dump(_record(MIXED, max_workers=3), f)
+
+        engine = _engine(tmp_path)
+        try:
+            assert engine.processor.max_workers == 3
+            assert engine.optimizer.profile.name == "tuned"
+            assert engine.optimizer.fingerprint == MIXED
+        finally:
+            engine.shutdown()
+
+    def test_invalid_profile_fields_skipped(self, tmp_path):
+        """Test that a stored profile with unknown fields does not break startup."""
+        record = _record(MIXED, max_workers=3)
+        record["profile"]["unknown_field"] = 1
+        with open(str(tmp_path / f"{MIXED.key}.json"), "w") as f:
+            json.dump(record, f)
+
+        engine = _engine(tmp_path)
+        try:
+            assert engine.processor.max_workers == 2
+            assert engine.optimizer.profile.name == "default"
+            assert engine.optimizer.fingerprint is None
+        finally:
+            engine.shutdown()
+
+    def test_shift_loads_matching_profile(self, tmp_path, monkeypatch):
+        """Test that a workload shift loads the stored profile of the new workload."""
+        ProfileStore(str(tmp_path)).save(SCAN, _record(SCAN, 3)["profile"], {"max_workers": 3}, 1.0)
+        engine = _engine(tmp_path / "empty")
+        engine.optimizer.profiles = ProfileStore(str(tmp_path))
+        monkeypatch.setattr(engine.optimizer.workload, "fingerprint", lambda: SCAN)
+        try:
+            result = engine.optimize()
+        finally:
+            engine.shutdown()
+
+        assert result["fingerprint"] == SCAN.key
+        loaded = [change for change in result["changes"] if change["action"] == "load_profile"]
+        assert loaded[0]["knob"] == "workers"
+        assert loaded[0]["to"] == 3
+        assert engine.optimizer.profile.adaptation_threshold == 0.3
+
+    def test_stable_workload_is_saved(self, tmp_path, monkeypatch):
+        """Test that the converged state is persisted for an unchanged fingerprint."""
+        engine = _engine(tmp_path)
+        engine.optimizer.update_profile(OptimizationProfile(name="learned"))
+        monkeypatch.setattr(engine.optimizer.workload, "fingerprint", lambda: MIXED)
+        try:
+            engine.optimize()
+            assert engine.optimizer.profiles.get(MIXED.key) is None
+            engine.optimize()
+        finally:
+            engine.shutdown()
+
+        record = ProfileStore(str(tmp_path)).get(MIXED.key)
+        assert record["profile"]["name"] == "learned"
+        assert record["settings"]["max_workers"] == 2
@@ -0,0 +1,192 @@
+"""
+Tests for partial-result batches, retries and checkpoints
+"""
+
+import os
+
+import pytest
+
+from uhip import HybridEngine
+from uhip.config import EngineConfig
+from uhip.core.exceptions import DeadlineExceeded
+from uhip.core.handlers import TASK_HANDLERS, register_handler
+from uhip.core.processor import ParallelProcessor
+from uhip.core.recovery import BatchCheckpoint, RetryPolicy
+
+CALLS = []
+
+
+def _flaky(x):
+    """Odd items fail on their first call, item 4 always fails."""
+    CALLS.append(x)
+    if x == 4:
+        raise ValueError("item 4 is broken")
+    if x % 2 and CALLS.count(x) == 1:
+        raise ConnectionError(f"transient failure on {x}")
+    return x * 10
+
+
+def _square(x):
+    CALLS.append(x)
+    return x * x
+
+
+def _fragile_handler(data):
+    if data < 0:
+        raise ValueError("negative payload")
+    return data + 1
+
+
+@pytest.fixture
+def processor():
+    """Initialized thread processor."""
+    CALLS.clear()
+    processor = ParallelProcessor(max_workers=2)
+    processor.initialize()
+    yield processor
+    processor.shutdown()
+
+
+class TestRetryPolicy:
+    """Test cases for RetryPolicy."""
+
+    def test_should_retry(self):
+        """Test attempt limits and the retryable exception types."""
+        policy = RetryPolicy(max_attempts=2, retry_on=(ConnectionError,))
+        
+        assert policy.should_retry(ConnectionError(), 1)
+        assert not policy.should_retry(ConnectionError(), 2)
+        assert not policy.should_retry(ValueError(), 1)
+        assert not RetryPolicy().should_retry(DeadlineExceeded(), 1)
+
+    def test_exponential_delay(self):
+        """Test that the backoff grows by the multiplier up to its cap."""
+        policy = RetryPolicy(backoff=0.1, multiplier=2.0, max_backoff=0.3)
+        
+        assert policy.delay(1) == pytest.approx(0.1)
+        assert policy.delay(2) == pytest.approx(0.2)
+        assert policy.delay(5) == pytest.approx(0.3)
+
+    def test_invalid_attempts(self):
+        """Test that at least one attempt is required."""
+        with pytest.raises(ValueError):
+            RetryPolicy(max_attempts=0)
+
+
+class TestBatchCheckpoint:
+    """Test cases for BatchCheckpoint."""
+
+    def test_records_survive_reopen(self, tmp_path):
+        """Test that recorded results are read back by a new checkpoint."""
+        path = str(tmp_path / "batch.ckpt")
+        checkpoint = BatchCheckpoint(path)
+        assert checkpoint.load(3) == {}
+        checkpoint.record(0, "a")
+        checkpoint.record(2, {"b": 1})
+        checkpoint.close()
+        
+        assert BatchCheckpoint(path).load(3) == {0: "a", 2: {"b": 1}}
+
+    def test_torn_record_discarded(self, tmp_path):
+        """Test that a partially written record is dropped and overwritten."""
+        path = str(tmp_path / "batch.ckpt")
+        checkpoint = BatchCheckpoint(path)
+        checkpoint.load(2)
+        checkpoint.record(0, "a")
+        checkpoint.close()
+        with open(path, "ab") as f:
+            f.write(b"\x80\x04\x95garbage")
+        
+        checkpoint = BatchCheckpoint(path)
+        assert checkpoint.load(2) == {0: "a"}
+        checkpoint.record(1, "b")
+        checkpoint.close()
+        
+        assert BatchCheckpoint(path).load(2) == {0: "a", 1: "b"}
+
+    def test_size_mismatch(self, tmp_path):
+        """Test that a checkpoint cannot be resumed for a different batch."""
+        path = str(tmp_path / "batch.ckpt")
+        checkpoint = BatchCheckpoint(path)
+        checkpoint.load(3)
+        checkpoint.close()
+        
+        with pytest.raises(ValueError):
+            BatchCheckpoint(path).load(4)
+
+
+class TestPartialBatch:
+    """Test cases for ParallelProcessor.process_batch_partial."""
+
+    def test_errors_do_not_discard_results(self, processor):
+        """Test that completed results are returned next to error records."""
+        batch = processor.process_batch_partial(list(range(6)), _flaky)
+        
+        assert batch.results == [0, None, 20, None, None, None]
+        assert batch.failed == [1, 3, 4, 5]
+        assert batch.errors[0].error_type == "ConnectionError"
+        assert batch.succeeded == 2
+        assert not batch.ok
+
+    def test_retry_only_failed_subset(self, processor):
+        """Test that retries resubmit only the items that failed."""
+        batch = processor.process_batch_partial(
+            list(range(6)), _flaky, retry=RetryPolicy(max_attempts=3)
+        )
+        
+        assert batch.results == [0, 10, 20, 30, None, 50]
+        assert batch.failed == [4]
+        assert batch.errors[0].attempts == 3
+        assert batch.attempts == 3
+        assert CALLS.count(0) == 1
+        assert CALLS.count(1) == 2
+        assert CALLS.count(4) == 3
+
+    def test_resume_from_checkpoint(self, processor, tmp_path):
+        """Test that a rerun with the same checkpoint skips finished items."""
+        path = str(tmp_path / "batch.ckpt")
+        first = processor.process_batch_partial(list(range(6)), _flaky, checkpoint=path)
+        assert first.failed == [1, 3, 4, 5]
+        assert os.path.exists(path)
+        
+        seen = len(CALLS)
+        second = processor.process_batch_partial(list(range(6)), _flaky, checkpoint=path)
+        
+        assert second.resumed == 2
+        assert sorted(CALLS[seen:]) == [1, 3, 4, 5]
+        assert second.results == [0, 10, 20, 30, None, 50]
+        assert second.failed == [4]
+
+    def test_checkpoint_removed_on_success(self, processor, tmp_path):
+        """Test that a fully successful batch deletes its checkpoint."""
+        path = str(tmp_path / "batch.ckpt")
+        batch = processor.process_batch_partial([1, 2, 3], _square, checkpoint=path)
+        
+        assert batch.ok
+        assert batch.results == [1, 4, 9]
+        assert not os.path.exists(path)
+
+    def test_empty_batch(self, processor):
+        """Test that an empty batch returns an empty result."""
+        batch = processor.process_batch_partial([], _square)
+        
+        assert batch.results == []
+        assert batch.ok
+
+
+class TestEnginePartialBatch:
+    """Test cases for HybridEngine.batch_process_partial."""
+
+    def test_engine_partial_batch(self):
+        """Test per-item errors through the engine's handler registry."""
+        register_handler("fragile", _fragile_handler)
+        engine = HybridEngine(EngineConfig(max_workers=2, prestart_workers=False))
+        engine.initialize()
+        try:
+            batch = engine.batch_process_partial([1, -1, 2], task_type="fragile")
+        finally:
+            engine.shutdown()
+            TASK_HANDLERS.pop("fragile", None)
+        
+        assert batch.results == [2, None, 3]
+        assert batch.errors[0].message == "negative payload"
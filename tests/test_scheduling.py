@@ -0,0 +1,153 @@
+"""
+Tests for the task scheduler
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from uhip.core.exceptions import DeadlineExceeded, EngineOverloaded
+from uhip.core.scheduling import ScheduledTask, TaskScheduler
+
+
+def _task(task_type, deadline=float("inf"), priority=None):
+    return ScheduledTask(
+        func=None, args=(), future=Future(), task_type=task_type,
+        deadline=deadline, priority=priority,
+    )
+
+
+class TestTaskScheduler:
+    """Test cases for TaskScheduler."""
+
+    def test_interactive_before_bulk_backlog(self):
+        """Test that interactive work jumps a queued bulk backlog."""
+        scheduler = TaskScheduler()
+        for _ in range(100):
+            scheduler.push(_task("general"))
+        scheduler.push(_task("edge"))
+        
+        assert scheduler.pop().task_type == "edge"
+        assert len(scheduler) == 100
+
+    def test_priority_override(self):
+        """Test that a per-task priority overrides the task type's class."""
+        scheduler = TaskScheduler()
+        scheduler.push(_task("edge", priority="bulk"))
+        scheduler.push(_task("general"))
+        
+        assert scheduler.pop().task_type == "general"
+
+    def test_weighted_fair_share(self):
+        """Test that flows in one class are served in proportion to weight."""
+        scheduler = TaskScheduler(
+            priorities={"a": "normal", "b": "normal"}, weights={"a": 3.0, "b": 1.0}
+        )
+        for _ in range(40):
+            scheduler.push(_task("a"))
+            scheduler.push(_task("b"))
+        
+        served = [scheduler.pop().task_type for _ in range(20)]
+        assert served.count("a") == 15
+        assert served.count("b") == 5
+
+    def test_deadline_order_within_flow(self):
+        """Test earliest-deadline-first ordering inside one task type."""
+        scheduler = TaskScheduler()
+        scheduler.push(_task("general", deadline=30))
+        scheduler.push(_task("general"))
+        scheduler.push(_task("general", deadline=10))
+        
+        assert [scheduler.pop().deadline for _ in range(3)] == [10, 30, float("inf")]
+
+    def test_stats(self):
+        """Test per-class depth and wait statistics."""
+        scheduler = TaskScheduler()
+        scheduler.push(_task("edge"))
+        scheduler.push(_task("general"))
+        scheduler.pop()
+        
+        stats = scheduler.get_stats()
+        assert stats["interactive"]["dispatched"] == 1
+        assert stats["normal"]["depth"] == 1
+        assert stats["interactive"]["avg_wait"] >= 0.0
+
+    def test_invalid_configuration(self):
+        """Test that unknown classes and non-positive weights are rejected."""
+        with pytest.raises(ValueError):
+            TaskScheduler(priorities={"edge": "urgent"})
+        with pytest.raises(ValueError):
+            TaskScheduler(weights={"edge": 0})
+
+
+class TestAdmissionControl:
+    """Test cases for bounded queues and overload policies."""
+
+    def test_reject_policy(self):
+        """Test that saturated queues reject until drained to the low watermark."""
+        scheduler = TaskScheduler(high_watermark=4, low_watermark=2, overload_policy="reject")
+        for _ in range(4):
+            scheduler.push(_task("general"))
+        
+        with pytest.raises(EngineOverloaded):
+            scheduler.push(_task("general"))
+        
+        scheduler.pop()
+        with pytest.raises(EngineOverloaded):
+            scheduler.push(_task("general"))
+        
+        scheduler.pop()
+        scheduler.push(_task("general"))
+        
+        stats = scheduler.get_admission_stats()
+        assert stats["rejected"] == {"general": 2}
+        assert stats["saturated"] is False
+
+    def test_shed_policy_displaces_lower_priority(self):
+        """Test that shedding drops queued bulk work for interactive work."""
+        scheduler = TaskScheduler(high_watermark=2, low_watermark=1, overload_policy="shed")
+        bulk = [_task("general", priority="bulk") for _ in range(2)]
+        for task in bulk:
+            scheduler.push(task)
+        
+        scheduler.push(_task("edge"))
+        
+        assert len(scheduler) == 2
+        with pytest.raises(EngineOverloaded):
+            bulk[1].future.result(timeout=1)
+        assert scheduler.get_admission_stats()["shed"] == {"general": 1}
+        
+        # Nothing lower than bulk to shed, so bulk arrivals are rejected
+        with pytest.raises(EngineOverloaded):
+            scheduler.push(_task("general", priority="bulk"))
+
+    def test_block_policy_waits_for_drain(self):
+        """Test that blocking admission resumes once the queue drains."""
+        scheduler = TaskScheduler(high_watermark=2, low_watermark=0, overload_policy="block")
+        scheduler.push(_task("general"))
+        scheduler.push(_task("general"))
+        admitted = threading.Event()
+        
+        def producer():
+            scheduler.push(_task("general"))
+            admitted.set()
+        
+        thread = threading.Thread(target=producer)
+        thread.start()
+        time.sleep(0.05)
+        assert not admitted.is_set()
+        
+        scheduler.pop()
+        scheduler.pop()
+        thread.join(timeout=1)
+        assert admitted.is_set()
+
+    def test_block_policy_respects_deadline(self):
+        """Test that a blocked submission gives up at its deadline."""
+        scheduler = TaskScheduler(high_watermark=1, low_watermark=0, overload_policy="block")
+        scheduler.push(_task("general"))
+        
+        with pytest.raises(DeadlineExceeded):
+            scheduler.push(_task("general", deadline=time.monotonic() + 0.05))
@@ -0,0 +1,149 @@
+"""
+Tests for work-stealing batch execution
+"""
+
+import threading
+import time
+
+import pytest
+
+from uhip.core.exceptions import DeadlineExceeded
+from uhip.core.processor import ParallelProcessor
+from uhip.core.stealing import WorkStealingRun, run_chunk
+
+
+def _double(x):
+    return x * 2
+
+
+def _skewed_sleep(x):
+    """Item 0 is expensive, every other item is cheap."""
+    time.sleep(0.2 if x == 0 else 0.02)
+    return x
+
+
+def _fail_on_three(x):
+    if x == 3:
+        raise ValueError("bad item")
+    return x
+
+
+class TestWorkStealingRun:
+    """Test cases for WorkStealingRun."""
+
+    def test_contiguous_shares(self):
+        """Test that chunks are dealt out as contiguous shares."""
+        run = WorkStealingRun(list(range(8)), workers=2, chunk_size=2)
+        
+        assert run.chunks == 4
+        assert run.next_chunk(0) == (0, [0, 1])
+        assert run.next_chunk(1) == (4, [4, 5])
+
+    def test_idle_worker_steals_back_half(self):
+        """Test that an empty deque steals the back half of the fullest one."""
+        run = WorkStealingRun(list(range(8)), workers=2, chunk_size=1)
+        for _ in range(4):
+            run.next_chunk(1)
+        
+        # Worker 0 still holds chunks 0-3; worker 1 takes 2 and 3
+        assert run.next_chunk(1) == (2, [2])
+        assert run.next_chunk(1) == (3, [3])
+        assert run.steals == 1
+        assert run.stolen_chunks == 2
+        assert run.next_chunk(0) == (0, [0])
+
+    def test_every_chunk_delivered_once(self):
+        """Test that concurrent drivers see each chunk exactly once."""
+        run = WorkStealingRun(list(range(500)), workers=4, chunk_size=3)
+        seen = []
+        lock = threading.Lock()
+        
+        def drive(worker):
+            while True:
+                chunk = run.next_chunk(worker)
+                if chunk is None:
+                    return
+                with lock:
+                    seen.extend(chunk[1])
+        
+        threads = [threading.Thread(target=drive, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert sorted(seen) == list(range(500))
+
+    def test_stealing_disabled(self):
+        """Test that a static run never takes another worker's chunks."""
+        run = WorkStealingRun(list(range(4)), workers=2, chunk_size=1, steal=False)
+        
+        assert run.next_chunk(1) == (2, [2])
+        assert run.next_chunk(1) == (3, [3])
+        assert run.next_chunk(1) is None
+        assert run.pending() == 2
+
+    def test_run_chunk(self):
+        """Test the chunk worker."""
+        assert run_chunk(_double, [1, 2, 3]) == [2, 4, 6]
+
+
+class TestProcessorWorkStealing:
+    """Test cases for work-stealing mode in ParallelProcessor."""
+
+    def test_results_in_order(self):
+        """Test that chunked results come back in input order."""
+        processor = ParallelProcessor(max_workers=3, steal_chunk_size=2)
+        processor.initialize()
+        
+        results = processor.process_batch(list(range(25)), _double, work_stealing=True)
+        
+        assert results == [x * 2 for x in range(25)]
+        assert processor.get_stats()["work_stealing"]["chunks"] == 13
+        
+        processor.shutdown()
+
+    def test_skewed_batch_steals(self):
+        """Test that cheap items move away from the driver stuck on a slow one."""
+        processor = ParallelProcessor(max_workers=2, work_stealing=True, steal_chunk_size=1)
+        processor.initialize()
+        
+        start = time.perf_counter()
+        results = processor.process_batch(list(range(20)), _skewed_sleep)
+        elapsed = time.perf_counter() - start
+        
+        assert results == list(range(20))
+        assert processor.get_stats()["work_stealing"]["steals"] >= 1
+        # Static halves would take 0.2 + 9 * 0.02; stealing hides the cheap items
+        assert elapsed < 0.33
+        
+        processor.shutdown()
+
+    def test_error_propagates(self):
+        """Test that a failing item fails the batch."""
+        processor = ParallelProcessor(max_workers=2, work_stealing=True, steal_chunk_size=1)
+        processor.initialize()
+        
+        with pytest.raises(ValueError):
+            processor.process_batch(list(range(6)), _fail_on_three)
+        
+        processor.shutdown()
+
+    def test_deadline(self):
+        """Test that a work-stealing batch honours its deadline."""
+        processor = ParallelProcessor(max_workers=1, work_stealing=True, steal_chunk_size=1)
+        processor.initialize()
+        
+        with pytest.raises(DeadlineExceeded):
+            processor.process_batch([0.05] * 10, time.sleep, timeout=0.1)
+        
+        processor.shutdown()
+
+    def test_process_pool(self):
+        """Test work stealing on a process pool."""
+        processor = ParallelProcessor(max_workers=2, use_processes=True, work_stealing=True)
+        processor.initialize()
+        
+        assert processor.process_batch(list(range(10)), _double) == [x * 2 for x in range(10)]
+        
+        processor.shutdown()
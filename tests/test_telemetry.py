@@ -0,0 +1,178 @@
+"""
+Tests for worker metric shards and their shipping
+"""
+
+import queue
+import threading
+
+from uhip import HybridEngine
+from uhip.config import EngineConfig
+from uhip.core.telemetry import WorkerMetricsReporter, drain_worker_metrics
+from uhip.utils.metrics import MetricShard, ShardedMetrics
+
+
+class TestShardedMetrics:
+    """Test cases for ShardedMetrics."""
+
+    def test_concurrent_records_are_exact(self):
+        """Test that no increment is lost across recording threads."""
+        metrics = ShardedMetrics()
+
+        def worker():
+            for _ in range(5000):
+                metrics.record("general", 1000)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        summary = metrics.summary()
+        assert summary["general"]["count"] == 40000
+        assert summary["general"]["total_time"] == 40000 * 1e-6
+        assert summary["general"]["latency"]["all"]["count"] == 40000
+        # Shards of the exited threads were folded into the retired shard
+        assert metrics._shards == []
+
+    def test_counts_without_histograms(self):
+        """Test that the cheap summary matches the full one."""
+        metrics = ShardedMetrics()
+        assert metrics.record("edge", 2000)
+        assert not metrics.record("edge", 4000)
+        metrics.record("general", 3000, count=3)
+
+        summary = metrics.summary(histograms=False)
+
+        assert summary["edge"] == {"count": 2, "total_time": 6e-6, "avg_time": 3e-6}
+        assert summary["general"]["count"] == 3
+        assert "latency" not in summary["general"]
+        assert metrics.summary()["general"]["latency"]["all"]["p50"] == 1e-6
+
+    def test_merge_shard(self):
+        """Test that shipped shards add to the local ones."""
+        metrics = ShardedMetrics()
+        metrics.record("general", 1000)
+        shard = MetricShard()
+        shard.record("general", 5000)
+        shard.record("quantum", 7000)
+
+        metrics.merge_shard(shard)
+
+        summary = metrics.summary()
+        assert summary["general"]["count"] == 2
+        assert summary["quantum"]["latency"]["1m"]["max"] == 7e-6
+
+        metrics.reset()
+        assert metrics.summary() == {}
+
+
+class TestWorkerMetricsReporter:
+    """Test cases for WorkerMetricsReporter and draining."""
+
+    def test_ships_batches(self):
+        """Test that deltas are shipped once per flush_items tasks."""
+        channel = queue.Queue()
+        reporter = WorkerMetricsReporter(channel, flush_items=10, flush_interval=60.0)
+        for _ in range(25):
+            reporter.record("general", 1000)
+
+        assert channel.qsize() == 2
+        reporter.flush()
+        reporter.flush()
+        assert channel.qsize() == 3
+
+        metrics = ShardedMetrics()
+        assert drain_worker_metrics(channel, metrics) == 3
+        assert metrics.summary()["general"]["count"] == 25
+        assert drain_worker_metrics(channel, metrics) == 0
+
+    def test_interval_flush(self):
+        """Test that a slow worker ships on the first task after the interval."""
+        channel = queue.Queue()
+        reporter = WorkerMetricsReporter(channel, flush_items=1000, flush_interval=0.0)
+        reporter.record("general", 1000)
+
+        assert channel.qsize() == 1
+
+
+class TestEngineWorkerMetrics:
+    """Test cases for handler metrics from process workers."""
+
+    def test_process_workers_report(self):
+        """Test that handler times recorded in workers reach get_metrics()."""
+        config = EngineConfig(
+            max_workers=2,
+            use_processes=True,
+            auto_optimize=False,
+            prestart_workers=False,
+            metrics_flush_items=4,
+        )
+        engine = HybridEngine(config)
+        engine.initialize()
+        try:
+            engine.batch_process([{"id": i} for i in range(20)], task_type="ai_ml")
+            for i in range(3):
+                engine.process({"id": 100 + i}, task_type="ai_ml")
+        finally:
+            engine.shutdown()
+
+        metrics = engine.get_metrics()["ai_ml"]
+        assert metrics["count"] == 3
+        assert metrics["worker"]["count"] == 23
+        assert metrics["worker"]["latency"]["all"]["count"] == 23
+
+    def test_shutdown_with_unread_deltas(self):
+        """Test that shutdown returns when workers shipped many unread deltas."""
+        config = EngineConfig(
+            max_workers=4,
+            use_processes=True,
+            auto_optimize=False,
+            cache_enabled=False,
+            metrics_flush_items=1,
+        )
+        engine = HybridEngine(config)
+        engine.initialize()
+        # One delta per task: far more than the pipe buffer holds
+        for i in range(3000):
+            engine.process({"id": i}, task_type="ai_ml")
+        engine.processor.recycle_workers("test")
+
+        finished = threading.Event()
+        stopper = threading.Thread(target=lambda: (engine.shutdown(), finished.set()), daemon=True)
+        stopper.start()
+
+        assert finished.wait(30)
+        assert engine.get_metrics()["ai_ml"]["worker"]["count"] == 3000
+
+    def test_recycled_workers_keep_their_counts(self):
+        """Test that a worker's pending delta survives recycling it."""
+        config = EngineConfig(
+            max_workers=2,
+            use_processes=True,
+            auto_optimize=False,
+            metrics_flush_items=1000,
+            metrics_flush_interval=60.0,
+        )
+        engine = HybridEngine(config)
+        engine.initialize()
+        try:
+            for i in range(10):
+                engine.process({"id": i}, task_type="ai_ml")
+            pid = engine.processor.worker_pids()["process"][0]
+            assert engine.recycle_workers(pids=[pid], reason="test")
+            for i in range(10, 20):
+                engine.process({"id": i}, task_type="ai_ml")
+        finally:
+            engine.shutdown()
+
+        assert engine.get_metrics()["ai_ml"]["worker"]["count"] == 20
+
+    def test_thread_pools_have_no_channel(self):
+        """Test that engines without process workers skip the telemetry queue."""
+        engine = HybridEngine(EngineConfig(auto_optimize=False))
+        engine.initialize()
+        try:
+            assert engine._metrics_channel is None
+        finally:
+            engine.shutdown()
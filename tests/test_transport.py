@@ -0,0 +1,100 @@
+"""
+Tests for the shared-memory payload transport
+"""
+
+import pytest
+
+from uhip.core.processor import ParallelProcessor
+from uhip.core.transport import SharedArray, SharedMemoryArena, run_shared
+
+
+def _total(array):
+    return float(array.sum())
+
+
+def _scale(array):
+    return array * 2
+
+
+def _window_mean(window):
+    return float(window["samples"].mean())
+
+
+class TestSharedMemoryArena:
+    """Test cases for SharedMemoryArena."""
+
+    def test_large_arrays_become_descriptors(self):
+        """Test that only arrays above the threshold are exported."""
+        np = pytest.importorskip("numpy")
+        arena = SharedMemoryArena(threshold=1024)
+        large = np.arange(1024, dtype=np.float64)
+        small = np.arange(4)
+        
+        args, shared = arena.export_args(({"big": large, "small": small}, [large]))
+        
+        assert isinstance(args[0]["big"], SharedArray)
+        assert args[0]["small"] is small
+        assert args[1][0] == args[0]["big"]
+        assert arena.get_stats()["exported"] == 1
+        assert arena.get_stats()["reused"] == 1
+        
+        arena.release(shared)
+        assert arena.get_stats()["live_blocks"] == 0
+
+    def test_reference_counting(self):
+        """Test that a block lives until its last task releases it."""
+        np = pytest.importorskip("numpy")
+        arena = SharedMemoryArena(threshold=1)
+        array = np.ones(16)
+        
+        _, first = arena.export_args((array,))
+        _, second = arena.export_args((array,))
+        arena.release(first)
+        
+        assert arena.get_stats()["live_blocks"] == 1
+        assert run_shared(1 << 30, _total, *second) == 16.0
+        
+        arena.release(second)
+        assert arena.get_stats()["live_blocks"] == 0
+
+    def test_results_round_trip(self):
+        """Test that large results come back through shared memory."""
+        np = pytest.importorskip("numpy")
+        arena = SharedMemoryArena(threshold=1)
+        args, shared = arena.export_args((np.arange(8.0),))
+        
+        result = arena.import_result(run_shared(1, _scale, *args))
+        arena.release(shared)
+        
+        assert result.tolist() == [x * 2 for x in range(8)]
+        assert arena.get_stats()["results"] == 1
+
+
+class TestProcessorTransport:
+    """Test cases for shared-memory transport in ParallelProcessor."""
+
+    def test_process_batch_with_arrays(self):
+        """Test a process-pool batch of array payloads."""
+        np = pytest.importorskip("numpy")
+        processor = ParallelProcessor(
+            max_workers=2, use_processes=True, shared_memory_threshold=1024
+        )
+        processor.initialize()
+        windows = [{"samples": np.full(4096, float(i))} for i in range(4)]
+        
+        assert processor.process_batch(windows, _window_mean) == [0.0, 1.0, 2.0, 3.0]
+        assert processor.submit(_scale, (np.ones(512),)).result(timeout=10).sum() == 1024
+        
+        stats = processor.get_stats()["shared_memory"]
+        assert stats["exported"] == 5
+        assert stats["results"] == 1
+        assert stats["live_blocks"] == 0
+        
+        processor.shutdown()
+
+    def test_disabled_for_threads(self):
+        """Test that thread pools never use the transport."""
+        processor = ParallelProcessor(max_workers=1, shared_memory_threshold=1024)
+        
+        assert processor.arena is None
+        assert processor.get_stats()["shared_memory"] is None
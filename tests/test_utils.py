@@ -2,8 +2,18 @@
 Tests for Utilities
 """
 
+import math
+import pickle
+import random
 import pytest
-from uhip.utils import MetricsCollector, setup_logging, validate_data, format_metrics
+from uhip.utils import (
+    LatencyHistogram,
+    MetricsCollector,
+    WindowedHistogram,
+    setup_logging,
+    validate_data,
+    format_metrics,
+)
 from uhip.config.settings import LoggingConfig
 
 
@@ -81,6 +91,102 @@ class TestMetricsCollector:
         assert len(collector.gauges) == 0
 
 
+class TestLatencyHistogram:
+    """Test cases for LatencyHistogram."""
+
+    def test_percentiles_within_precision(self):
+        """Test that percentiles match exact ones within the relative error."""
+        rng = random.Random(7)
+        values = sorted(int(rng.lognormvariate(13, 1.0)) for _ in range(10000))
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+        
+        for q in (50, 90, 95, 99, 99.9):
+            exact = values[math.ceil(q * len(values) / 100) - 1]
+            assert histogram.percentile(q) == pytest.approx(exact, rel=2 ** -5)
+        assert histogram.percentile(100) == values[-1]
+        assert histogram.percentile(0) == values[0]
+        assert len(histogram.counts) < 400
+
+    def test_small_values_exact(self):
+        """Test that values below 2**precision are stored exactly."""
+        histogram = LatencyHistogram()
+        for value in range(1, 11):
+            histogram.record(value)
+        
+        assert histogram.percentile(50) == 5
+        assert histogram.mean_ns() == 5.5
+        assert LatencyHistogram().percentile(99) == 0
+
+    def test_merge_and_pickle(self):
+        """Test that merged shards equal one histogram of all values."""
+        combined = LatencyHistogram()
+        shards = [LatencyHistogram() for _ in range(4)]
+        for value in range(1000, 200000, 37):
+            combined.record(value)
+            shards[value % 4].record(value)
+        
+        merged = LatencyHistogram()
+        for shard in shards:
+            merged.merge(pickle.loads(pickle.dumps(shard)))
+        
+        assert merged.counts == combined.counts
+        assert merged.summary() == combined.summary()
+        with pytest.raises(ValueError):
+            merged.merge(LatencyHistogram(precision=8))
+
+    def test_values_clamped(self):
+        """Test that huge and negative values stay in range."""
+        histogram = LatencyHistogram(max_ns=2 ** 20)
+        histogram.record(2 ** 30)
+        histogram.record(-5)
+        
+        assert histogram.max_seen_ns == 2 ** 20
+        assert histogram.min_ns == 0
+
+
+class TestWindowedHistogram:
+    """Test cases for WindowedHistogram."""
+
+    def test_windows(self):
+        """Test that old slots drop out of short windows only."""
+        histogram = WindowedHistogram(slot_seconds=10.0, horizon=300.0)
+        histogram.record(1000, now=900.0)
+        histogram.record(2000, now=1200.0)
+        histogram.record(3000, now=1290.0)
+        
+        assert histogram.window(60.0, now=1295.0).count == 1
+        assert histogram.window(300.0, now=1295.0).count == 2
+        assert histogram.lifetime().count == 3
+        summary = histogram.summary(now=1295.0)
+        assert summary["1m"]["max"] == pytest.approx(3e-6)
+        assert summary["all"]["min"] == pytest.approx(1e-6)
+
+    def test_ring_reuses_slots(self):
+        """Test that a slot is cleared when the ring wraps around."""
+        histogram = WindowedHistogram(slot_seconds=1.0, horizon=5.0)
+        histogram.record(1000, now=0.5)
+        histogram.record(2000, now=5.5)
+        
+        window = histogram.window(5.0, now=5.5)
+        assert window.count == 1
+        assert window.max_seen_ns == 2000
+
+    def test_merge_aligns_slots(self):
+        """Test that merging adds slots recorded at the same time."""
+        first = WindowedHistogram()
+        second = WindowedHistogram()
+        first.record(1000, now=100.0)
+        second.record(2000, now=105.0)
+        second.record(4000, now=50.0)
+        
+        first.merge(second)
+        
+        assert first.window(10.0, now=105.0).count == 2
+        assert first.lifetime().count == 3
+
+
 class TestHelpers:
     """Test cases for helper functions."""
 
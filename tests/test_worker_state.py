@@ -0,0 +1,128 @@
+"""
+Tests for per-worker state
+"""
+
+import os
+
+import pytest
+
+from uhip.core import worker_state
+from uhip.core.processor import ParallelProcessor
+from uhip.core.worker_state import (
+    STATE_FACTORIES,
+    clear_state,
+    get_state,
+    init_worker_state,
+    register_state,
+    state_specs,
+    state_stats,
+)
+
+BUILDS = []
+
+
+def _build_table():
+    """Module-level factory so it can be rebuilt in process workers."""
+    BUILDS.append(os.getpid())
+    return {"limit": 42}
+
+
+def _read_table(_):
+    preloaded = "threshold_table" in state_stats()["keys"]
+    return get_state("threshold_table")["limit"], preloaded
+
+
+def _record_hook(tag):
+    os.environ["UHIP_TEST_HOOK"] = tag
+
+
+def _read_hook(_):
+    return os.environ.get("UHIP_TEST_HOOK")
+
+
+@pytest.fixture
+def table_state():
+    """Register a test factory and remove it afterwards."""
+    BUILDS.clear()
+    register_state("threshold_table", _build_table)
+    yield
+    clear_state("threshold_table")
+    STATE_FACTORIES.pop("threshold_table", None)
+
+
+class TestWorkerState:
+    """Test cases for the worker state cache."""
+
+    def test_built_once(self, table_state):
+        """Test that state is built on first use and then cached."""
+        first = get_state("threshold_table")
+        second = get_state("threshold_table")
+        
+        assert first is second
+        assert len(BUILDS) == 1
+        assert "threshold_table" in state_stats()["keys"]
+
+    def test_unknown_key(self):
+        """Test that unregistered keys raise KeyError."""
+        with pytest.raises(KeyError):
+            get_state("missing")
+
+    def test_reregister_drops_cached_state(self, table_state):
+        """Test that registering a key again rebuilds its state."""
+        get_state("threshold_table")
+        register_state("threshold_table", _build_table)
+        get_state("threshold_table")
+        
+        assert len(BUILDS) == 2
+
+    def test_specs_and_preload(self, table_state):
+        """Test that specs rebuild factories and preload requested keys."""
+        specs = state_specs(preload=["threshold_table", "missing"])
+        
+        assert specs["factories"]["threshold_table"] == "tests.test_worker_state:_build_table"
+        
+        STATE_FACTORIES.pop("threshold_table")
+        init_worker_state(specs)
+        
+        assert STATE_FACTORIES["threshold_table"] is _build_table
+        assert "threshold_table" in worker_state._STATE
+
+
+class TestInitializerHooks:
+    """Test cases for ParallelProcessor initializer hooks and pre-spawning."""
+
+    def test_hooks_run_in_thread_workers(self):
+        """Test that hooks run after the main initializer in each worker."""
+        processor = ParallelProcessor(max_workers=2)
+        processor.add_initializer(_record_hook, "first")
+        processor.add_initializer(_record_hook, "second")
+        processor.initialize()
+        
+        assert processor.process_batch([1], _read_hook) == ["second"]
+        with pytest.raises(RuntimeError):
+            processor.add_initializer(_record_hook, "late")
+        
+        processor.shutdown()
+        os.environ.pop("UHIP_TEST_HOOK", None)
+
+    def test_prestart_process_workers_with_state(self, table_state):
+        """Test that pre-spawned process workers already hold their state."""
+        processor = ParallelProcessor(max_workers=2, use_processes=True)
+        processor.add_initializer(init_worker_state, state_specs(preload=["threshold_table"]))
+        processor.initialize()
+        
+        warm = processor.prestart(timeout=10)
+        
+        assert 1 <= warm["process"] <= 2
+        assert processor.get_stats()["warm_workers"] == warm
+        # Preloaded in the initializer, so the task itself never builds it
+        limit, preloaded = processor.submit(_read_table, (None,)).result(timeout=10)
+        assert limit == 42
+        assert preloaded
+        
+        processor.shutdown()
+
+    def test_prestart_requires_initialization(self):
+        """Test that prestart needs an initialized processor."""
+        with pytest.raises(RuntimeError):
+            ParallelProcessor(max_workers=1).prestart()
@@ -4,7 +4,7 @@ Configuration settings for UHIP system
 
 import os
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 
 @dataclass
@@ -19,6 +19,65 @@ class EngineConfig:
         default_factory=lambda: os.getenv("UHIP_USE_PROCESSES", "false").lower() == "true"
     )
     
+    # Worker pool resizing bounds and autoscaling (max_workers_limit 0 = max_workers)
+    min_workers: int = field(
+        default_factory=lambda: int(os.getenv("UHIP_MIN_WORKERS", "1"))
+    )
+    max_workers_limit: int = field(
+        default_factory=lambda: int(os.getenv("UHIP_MAX_WORKERS_LIMIT", "0"))
+    )
+    autoscale: bool = field(
+        default_factory=lambda: os.getenv("UHIP_AUTOSCALE", "false").lower() == "true"
+    )
+    autoscale_interval: float = 1.0
+    
+    # Hybrid mode: run a pool of the other kind next to the primary one and
+    # route task types between them (secondary_pool_workers 0 = CPU count)
+    hybrid_pools: bool = field(
+        default_factory=lambda: os.getenv("UHIP_HYBRID_POOLS", "false").lower() == "true"
+    )
+    secondary_pool_workers: int = field(
+        default_factory=lambda: int(os.getenv("UHIP_SECONDARY_POOL_WORKERS", "0"))
+    )
+    
+    # Run batches as chunks over per-worker deques with work stealing
+    # (steal_chunk_size 0 = about eight chunks per worker)
+    work_stealing: bool = field(
+        default_factory=lambda: os.getenv("UHIP_WORK_STEALING", "false").lower() == "true"
+    )
+    steal_chunk_size: int = 0
+    
+    # Worker warm-up: spawn pool workers during engine warm-up and build
+    # these worker-state keys (see uhip.core.worker_state) in every worker
+    prestart_workers: bool = field(
+        default_factory=lambda: os.getenv("UHIP_PRESTART_WORKERS", "true").lower() == "true"
+    )
+    worker_preload: List[str] = field(
+        default_factory=lambda: [
+            key.strip() for key in os.getenv("UHIP_WORKER_PRELOAD", "").split(",") if key.strip()
+        ]
+    )
+    
+    # Pass NumPy arrays of at least this many bytes to process workers
+    # through shared memory instead of pickling them (0 = disabled)
+    shared_memory_threshold: int = field(
+        default_factory=lambda: int(os.getenv("UHIP_SHM_THRESHOLD", str(1 << 20)))
+    )
+    
+    # CPU placement of process workers: "none", "core" or "node" (Linux)
+    cpu_placement: str = field(
+        default_factory=lambda: os.getenv("UHIP_CPU_PLACEMENT", "none")
+    )
+    
+    # Hedged execution: re-run idempotent tasks that exceed their type's p95
+    # on an idle worker, with at most hedge_budget extra work
+    hedging: bool = field(
+        default_factory=lambda: os.getenv("UHIP_HEDGING", "false").lower() == "true"
+    )
+    hedge_budget: float = field(
+        default_factory=lambda: float(os.getenv("UHIP_HEDGE_BUDGET", "0.05"))
+    )
+    
     # Optimization settings
     auto_optimize: bool = field(
         default_factory=lambda: os.getenv("UHIP_AUTO_OPTIMIZE", "true").lower() == "true"
@@ -26,6 +85,22 @@ class EngineConfig:
     optimization_interval: int = field(
         default_factory=lambda: int(os.getenv("UHIP_OPT_INTERVAL", "100"))
     )
+    # Let optimization cycles hill-climb worker count, chunk size and pool mode
+    tune_parallelism: bool = field(
+        default_factory=lambda: os.getenv("UHIP_TUNE_PARALLELISM", "true").lower() == "true"
+    )
+    # A/B experiments: share of traffic sent to a candidate configuration
+    # and the significance level its latency/throughput tests must reach
+    experiment_fraction: float = field(
+        default_factory=lambda: float(os.getenv("UHIP_EXPERIMENT_FRACTION", "0.1"))
+    )
+    experiment_alpha: float = field(
+        default_factory=lambda: float(os.getenv("UHIP_EXPERIMENT_ALPHA", "0.05"))
+    )
+    # Directory of tuned profiles per workload fingerprint ("" = not persisted)
+    profile_dir: str = field(
+        default_factory=lambda: os.getenv("UHIP_PROFILE_DIR", "")
+    )
     
     # Processing settings
     batch_size: int = field(
@@ -35,15 +110,66 @@ class EngineConfig:
         default_factory=lambda: int(os.getenv("UHIP_TIMEOUT", "300"))
     )
     
+    # Micro-batching of concurrent single requests (batch_size caps a batch)
+    micro_batch_enabled: bool = field(
+        default_factory=lambda: os.getenv("UHIP_MICRO_BATCH", "false").lower() == "true"
+    )
+    micro_batch_max_wait_ms: float = field(
+        default_factory=lambda: float(os.getenv("UHIP_MICRO_BATCH_WAIT_MS", "2.0"))
+    )
+    
+    # Scheduling: task type -> priority class ("interactive", "normal",
+    # "bulk") and task type -> weighted fair share within a class
+    task_priorities: Dict[str, str] = field(default_factory=dict)
+    task_weights: Dict[str, float] = field(default_factory=dict)
+    
+    # Admission control: bounded submission queue with hysteresis and the
+    # policy applied while saturated ("block", "reject" or "shed")
+    queue_high_watermark: int = field(
+        default_factory=lambda: int(os.getenv("UHIP_QUEUE_HIGH_WATERMARK", "10000"))
+    )
+    queue_low_watermark: int = field(
+        default_factory=lambda: int(os.getenv("UHIP_QUEUE_LOW_WATERMARK", "8000"))
+    )
+    overload_policy: str = field(
+        default_factory=lambda: os.getenv("UHIP_OVERLOAD_POLICY", "block")
+    )
+    
+    # Share one execution between identical in-flight requests of idempotent handlers
+    coalesce_requests: bool = field(
+        default_factory=lambda: os.getenv("UHIP_COALESCE", "true").lower() == "true"
+    )
+    
     # Module settings
     enable_ai_ml: bool = True
     enable_quantum: bool = True
     enable_blockchain: bool = True
     enable_edge: bool = True
     
-    # Performance settings
+    # Performance settings: per-task-type result cache (cache_size is the
+    # initial capacity; optimization cycles resize it within the budget)
     cache_enabled: bool = True
     cache_size: int = 1000
+    cache_memory_budget_mb: float = field(
+        default_factory=lambda: float(os.getenv("UHIP_CACHE_MEMORY_MB", "64"))
+    )
+    # Fraction of keys the miss-ratio sampler tracks (SHARDS sampling)
+    cache_sample_rate: float = field(
+        default_factory=lambda: float(os.getenv("UHIP_CACHE_SAMPLE_RATE", "0.1"))
+    )
+    # Engine plus worker RSS budget; 0 uses 75% of physical memory
+    memory_budget_mb: float = field(
+        default_factory=lambda: float(os.getenv("UHIP_MEMORY_BUDGET_MB", "0"))
+    )
+    
+    # Process workers ship per-task metric deltas after this many tasks
+    # or seconds, whichever comes first
+    metrics_flush_items: int = field(
+        default_factory=lambda: int(os.getenv("UHIP_METRICS_FLUSH_ITEMS", "256"))
+    )
+    metrics_flush_interval: float = field(
+        default_factory=lambda: float(os.getenv("UHIP_METRICS_FLUSH_INTERVAL", "1.0"))
+    )
     
     # Logging
     log_level: str = field(
@@ -55,16 +181,47 @@ class EngineConfig:
         return {
             "max_workers": self.max_workers,
             "use_processes": self.use_processes,
+            "min_workers": self.min_workers,
+            "max_workers_limit": self.max_workers_limit,
+            "autoscale": self.autoscale,
+            "autoscale_interval": self.autoscale_interval,
+            "hybrid_pools": self.hybrid_pools,
+            "secondary_pool_workers": self.secondary_pool_workers,
+            "work_stealing": self.work_stealing,
+            "steal_chunk_size": self.steal_chunk_size,
+            "prestart_workers": self.prestart_workers,
+            "worker_preload": list(self.worker_preload),
+            "shared_memory_threshold": self.shared_memory_threshold,
+            "cpu_placement": self.cpu_placement,
+            "hedging": self.hedging,
+            "hedge_budget": self.hedge_budget,
             "auto_optimize": self.auto_optimize,
             "optimization_interval": self.optimization_interval,
+            "tune_parallelism": self.tune_parallelism,
+            "experiment_fraction": self.experiment_fraction,
+            "experiment_alpha": self.experiment_alpha,
+            "profile_dir": self.profile_dir,
             "batch_size": self.batch_size,
             "timeout": self.timeout,
+            "micro_batch_enabled": self.micro_batch_enabled,
+            "micro_batch_max_wait_ms": self.micro_batch_max_wait_ms,
+            "task_priorities": dict(self.task_priorities),
+            "task_weights": dict(self.task_weights),
+            "queue_high_watermark": self.queue_high_watermark,
+            "queue_low_watermark": self.queue_low_watermark,
+            "overload_policy": self.overload_policy,
+            "coalesce_requests": self.coalesce_requests,
             "enable_ai_ml": self.enable_ai_ml,
             "enable_quantum": self.enable_quantum,
             "enable_blockchain": self.enable_blockchain,
             "enable_edge": self.enable_edge,
             "cache_enabled": self.cache_enabled,
             "cache_size": self.cache_size,
+            "cache_memory_budget_mb": self.cache_memory_budget_mb,
+            "cache_sample_rate": self.cache_sample_rate,
+            "memory_budget_mb": self.memory_budget_mb,
+            "metrics_flush_items": self.metrics_flush_items,
+            "metrics_flush_interval": self.metrics_flush_interval,
             "log_level": self.log_level,
         }
     
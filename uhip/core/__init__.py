@@ -3,11 +3,23 @@ Core UHIP modules for hybrid intelligence processing
 """
 
 from uhip.core.engine import HybridEngine
+from uhip.core.exceptions import DeadlineExceeded, EngineOverloaded
+from uhip.core.handlers import register_handler
 from uhip.core.optimizer import SelfOptimizer
 from uhip.core.processor import ParallelProcessor
+from uhip.core.recovery import BatchCheckpoint, BatchResult, RetryPolicy
+from uhip.core.worker_state import get_state, register_state
 
 __all__ = [
     "HybridEngine",
     "SelfOptimizer",
     "ParallelProcessor",
+    "DeadlineExceeded",
+    "EngineOverloaded",
+    "register_handler",
+    "register_state",
+    "get_state",
+    "BatchResult",
+    "BatchCheckpoint",
+    "RetryPolicy",
 ]
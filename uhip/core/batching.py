@@ -0,0 +1,170 @@
+"""
+Micro-batching for UHIP
+Aggregates concurrent single-item requests into batched handler calls
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Collects concurrent submissions for one task type and runs them as a
+    single batch once the batch is full or the oldest item has waited
+    max_wait seconds. Each caller receives a future for its own result.
+    """
+
+    def __init__(
+        self,
+        batch_func: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 32,
+        max_wait: float = 0.002,
+        submit: Optional[Callable[..., Future]] = None,
+        name: str = "batcher",
+    ):
+        """
+        Initialize the Micro-Batcher.
+
+        Args:
+            batch_func: Callable mapping a list of payloads to a list of results
+            max_batch_size: Maximum number of items per batch
+            max_wait: Maximum time in seconds the oldest item waits for a batch
+            submit: Optional executor submit function. When given, batches are
+                   dispatched asynchronously via submit(batch_func, items)
+                   so the next batch can form while the previous one runs.
+            name: Name used for the flusher thread and log messages
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.batch_func = batch_func
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.submit_func = submit
+        self.name = name
+
+        self._pending: List[Tuple[Any, Future, float]] = []
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, item: Any) -> Future:
+        """
+        Queue an item for the next batch.
+
+        Args:
+            item: Payload to process
+
+        Returns:
+            Future resolving to the item's result
+        """
+        future: Future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError(f"Micro-batcher '{self.name}' is closed")
+
+            self._pending.append((item, future, time.perf_counter()))
+
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"uhip-{self.name}", daemon=True
+                )
+                self._thread.start()
+
+            self._condition.notify()
+        return future
+
+    def _take_batch(self) -> List[Tuple[Any, Future, float]]:
+        """Wait for a full or expired batch and remove it from the queue."""
+        with self._condition:
+            while not self._pending and not self._closed:
+                self._condition.wait()
+
+            while (
+                not self._closed
+                and len(self._pending) < self.max_batch_size
+            ):
+                oldest = self._pending[0][2]
+                remaining = oldest + self.max_wait - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            batch = self._pending[:self.max_batch_size]
+            del self._pending[:self.max_batch_size]
+            return batch
+
+    def _run(self) -> None:
+        """Flusher loop executing batches until closed and drained."""
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                if self._closed:
+                    return
+                continue
+
+            self.batches += 1
+            self.items += len(batch)
+            items = [entry[0] for entry in batch]
+            futures = [entry[1] for entry in batch]
+
+            try:
+                if self.submit_func is not None:
+                    outer = self.submit_func(self.batch_func, items)
+                    outer.add_done_callback(partial(self._scatter_future, futures=futures))
+                else:
+                    self._scatter(self.batch_func(items), futures)
+            except Exception as e:
+                logger.error(f"Micro-batch '{self.name}' failed: {e}")
+                for future in futures:
+                    future.set_exception(e)
+
+    def _scatter_future(self, outer: Future, futures: List[Future]) -> None:
+        """Distribute the result of an asynchronously executed batch."""
+        error = outer.exception()
+        if error is not None:
+            for future in futures:
+                future.set_exception(error)
+            return
+        try:
+            self._scatter(outer.result(), futures)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+
+    def _scatter(self, results: List[Any], futures: List[Future]) -> None:
+        """Hand each waiting caller its own result."""
+        if len(results) != len(futures):
+            raise RuntimeError(
+                f"Batch function returned {len(results)} results for {len(futures)} items"
+            )
+        for future, result in zip(futures, results):
+            future.set_result(result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching statistics."""
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": self.items / self.batches if self.batches else 0.0,
+            "pending": len(self._pending),
+        }
+
+    def close(self) -> None:
+        """Flush pending items and stop the flusher thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
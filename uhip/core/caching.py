@@ -0,0 +1,397 @@
+"""
+Result Caching for UHIP
+Per-task-type LRU result cache sized from sampled miss-ratio curves
+"""
+
+import copy
+import heapq
+import logging
+import pickle
+import sys
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_HASH_BITS = 24
+_MODULUS = 1 << _HASH_BITS
+_DEFAULT_ENTRY_BYTES = 1024.0
+
+# Candidate cache sizes (entries) at which miss-ratio curves are evaluated
+CACHE_SIZE_LADDER = [0] + [16 << i for i in range(17)]
+
+
+def _spatial_hash(key: Hashable) -> int:
+    """Map a key to a well-mixed value in [0, 2**24) for spatial sampling."""
+    return ((hash(key) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> (64 - _HASH_BITS)
+
+
+class _TypeSamples:
+    """Sampled reference stream of one task type."""
+
+    __slots__ = (
+        "lock", "threshold", "clock", "last", "times", "heap", "histogram", "cold", "references",
+    )
+
+    def __init__(self, threshold: int):
+        self.lock = threading.Lock()
+        self.threshold = threshold
+        self.clock = 0
+        self.last: Dict[Hashable, Tuple[int, int]] = {}  # key -> (last access, hash)
+        self.times: List[int] = []  # Sorted last-access clocks of tracked keys
+        self.heap: List[Tuple[int, Hashable]] = []  # (-hash, key) for eviction
+        self.histogram: Dict[int, float] = {}  # Scaled reuse distance -> references
+        self.cold = 0.0
+        self.references = 0.0
+
+
+class ReuseDistanceSampler:
+    """
+    SHARDS-style estimator of LRU miss-ratio curves.
+
+    Only references whose key hashes below a threshold are tracked, so the
+    sample is a fixed random subset of keys and every reference to a sampled
+    key is seen. The reuse distance of a sampled reference (distinct sampled
+    keys touched since the previous reference) divided by the sampling rate
+    estimates the full-stream reuse distance. In fixed-size mode the
+    threshold starts at rate 1.0 and drops whenever more than max_keys keys
+    are tracked, evicting the key with the largest hash, so memory stays
+    bounded however many distinct keys a task type has. Each task type has
+    its own lock, and unsampled references are rejected before taking it.
+    """
+
+    def __init__(self, rate: float = 1.0, max_keys: int = 8192):
+        """
+        Initialize the sampler.
+
+        Args:
+            rate: Initial fraction of keys sampled
+            max_keys: Maximum tracked keys per task type
+        """
+        self.initial_threshold = max(1, int(rate * _MODULUS))
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._types: Dict[str, _TypeSamples] = {}
+
+    def sampled(self, task_type: str, key: Hashable) -> bool:
+        """Check whether a key currently belongs to the task type's sample."""
+        samples = self._types.get(task_type)
+        threshold = samples.threshold if samples is not None else self.initial_threshold
+        return _spatial_hash(key) < threshold
+
+    def record(self, task_type: str, key: Hashable) -> bool:
+        """
+        Record one reference to a key.
+
+        Returns:
+            True if the reference was sampled
+        """
+        value = _spatial_hash(key)
+        samples = self._types.get(task_type)
+        if samples is None:
+            with self._lock:
+                samples = self._types.setdefault(
+                    task_type, _TypeSamples(self.initial_threshold)
+                )
+        if value >= samples.threshold:
+            return False
+
+        with samples.lock:
+            # The threshold may have dropped while waiting for the lock
+            if value >= samples.threshold:
+                return False
+            samples.clock += 1
+            samples.references += 1
+            previous = samples.last.get(key)
+            if previous is None:
+                samples.cold += 1
+                heapq.heappush(samples.heap, (-value, key))
+            else:
+                position = bisect_left(samples.times, previous[0])
+                distance = len(samples.times) - position - 1
+                samples.times.pop(position)
+                scaled = int(distance * _MODULUS / samples.threshold)
+                samples.histogram[scaled] = samples.histogram.get(scaled, 0) + 1
+            samples.last[key] = (samples.clock, value)
+            samples.times.append(samples.clock)
+
+            while len(samples.last) > self.max_keys:
+                self._shrink(samples)
+            return True
+
+    @staticmethod
+    def _shrink(samples: _TypeSamples) -> None:
+        """Drop the largest-hash key and lower the threshold below it."""
+        negative, key = heapq.heappop(samples.heap)
+        clock, _ = samples.last.pop(key)
+        samples.times.pop(bisect_left(samples.times, clock))
+        # Rescale counts taken at the higher rate to the new rate
+        scale = -negative / samples.threshold
+        samples.threshold = -negative
+        samples.cold *= scale
+        samples.references *= scale
+        for distance in samples.histogram:
+            samples.histogram[distance] *= scale
+
+    def miss_ratio_curve(self, task_type: str, sizes: List[int]) -> Dict[int, float]:
+        """
+        Estimate the LRU miss ratio of a task type at each cache size.
+
+        Args:
+            task_type: Task type to evaluate
+            sizes: Cache sizes in entries
+
+        Returns:
+            Cache size -> estimated miss ratio (1.0 without samples)
+        """
+        samples = self._types.get(task_type)
+        if samples is None:
+            return {size: 1.0 for size in sizes}
+        with samples.lock:
+            if not samples.references:
+                return {size: 1.0 for size in sizes}
+            distances = sorted(samples.histogram.items())
+            total = samples.references
+
+        keys = [distance for distance, _ in distances]
+        cumulative = []
+        running = 0.0
+        for _, count in distances:
+            running += count
+            cumulative.append(running)
+
+        curve = {}
+        for size in sizes:
+            # A reference hits in an LRU cache of size c iff its distance < c
+            index = bisect_right(keys, size - 1) if size > 0 else 0
+            hits = cumulative[index - 1] if index else 0
+            curve[size] = 1.0 - hits / total
+        return curve
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get sampled references, tracked keys and sampling rate per task type."""
+        stats = {}
+        for task_type, samples in list(self._types.items()):
+            with samples.lock:
+                stats[task_type] = {
+                    "references": samples.references,
+                    "cold": samples.cold,
+                    "tracked_keys": len(samples.last),
+                    "rate": samples.threshold / _MODULUS,
+                }
+        return stats
+
+
+class ResultCache:
+    """
+    LRU cache of handler results with a separate capacity per task type.
+
+    Every lookup also feeds the reuse-distance sampler, including lookups
+    of task types whose capacity is 0, so the optimizer always has a
+    current miss-ratio curve to size the cache from.
+
+    Results are deep-copied on the way in and on every hit, so callers
+    never share a result object: mutating one returned result cannot
+    change what later hits see. Entry sizes (pickled bytes) are measured
+    on one put in size_sample_interval per task type.
+    """
+
+    def __init__(
+        self,
+        default_capacity: int = 1000,
+        sample_rate: float = 0.1,
+        max_sampled_keys: int = 8192,
+        size_sample_interval: int = 16,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            default_capacity: Entries per task type until the optimizer resizes it
+            sample_rate: Initial fraction of keys sampled for reuse distances
+            max_sampled_keys: Maximum keys tracked by the sampler per task type
+            size_sample_interval: Puts per task type between entry size measurements
+        """
+        self.default_capacity = default_capacity
+        self.size_sample_interval = max(1, size_sample_interval)
+        self.sampler = ReuseDistanceSampler(sample_rate, max_sampled_keys)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, "OrderedDict[Hashable, Any]"] = {}
+        self.capacity: Dict[str, int] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def get(self, task_type: str, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a cached result.
+
+        Returns:
+            Tuple of (hit, result)
+        """
+        self.sampler.record(task_type, key)
+        with self._lock:
+            stats = self._type_stats(task_type)
+            entries = self._entries.get(task_type)
+            if entries is not None and key in entries:
+                entries.move_to_end(key)
+                stats["hits"] += 1
+                stats["window_hits"] += 1
+                value = entries[key]
+            else:
+                stats["misses"] += 1
+                stats["window_misses"] += 1
+                return False, None
+        # Stored values are never mutated, so they can be copied unlocked
+        return True, copy.deepcopy(value)
+
+    def put(self, task_type: str, key: Hashable, value: Any) -> None:
+        """Store a copy of a result, evicting the least recently used entries."""
+        stored = copy.deepcopy(value)
+        with self._lock:
+            stats = self._type_stats(task_type)
+            stats["puts"] += 1
+            measure = (stats["puts"] - 1) % self.size_sample_interval == 0
+            capacity = self.capacity.get(task_type, self.default_capacity)
+            if capacity > 0:
+                entries = self._entries.setdefault(task_type, OrderedDict())
+                entries[key] = stored
+                entries.move_to_end(key)
+                while len(entries) > capacity:
+                    entries.popitem(last=False)
+                    stats["evictions"] += 1
+        if measure:
+            size = self._entry_size(stored)
+            with self._lock:
+                stats["entry_bytes"] = 0.9 * stats["entry_bytes"] + 0.1 * size
+
+    def resize(self, task_type: str, capacity: int) -> int:
+        """Set a task type's capacity; returns the previous capacity."""
+        with self._lock:
+            previous = self.capacity.get(task_type, self.default_capacity)
+            self.capacity[task_type] = capacity
+            entries = self._entries.get(task_type)
+            while entries and len(entries) > capacity:
+                entries.popitem(last=False)
+                self._type_stats(task_type)["evictions"] += 1
+            return previous
+
+    def observe_window(self, task_type: str) -> Optional[float]:
+        """Get the hit rate since the previous call and start a new window."""
+        with self._lock:
+            stats = self._type_stats(task_type)
+            lookups = stats["window_hits"] + stats["window_misses"]
+            rate = stats["window_hits"] / lookups if lookups else None
+            stats["window_hits"] = stats["window_misses"] = 0
+            return rate
+
+    def entry_bytes(self, task_type: str) -> float:
+        """Get the estimated memory per cached result of a task type."""
+        with self._lock:
+            return float(self._type_stats(task_type)["entry_bytes"])
+
+    def memory_bytes(self) -> Dict[str, float]:
+        """Get the estimated bytes held by each task type's cached results."""
+        with self._lock:
+            return {
+                task_type: len(self._entries.get(task_type, ())) * stats["entry_bytes"]
+                for task_type, stats in self._stats.items()
+            }
+
+    def task_types(self) -> List[str]:
+        """Get the task types that have been looked up."""
+        with self._lock:
+            return list(self._stats)
+
+    def clear(self) -> None:
+        """Drop all cached results, keeping capacities and statistics."""
+        with self._lock:
+            self._entries.clear()
+
+    def _type_stats(self, task_type: str) -> Dict[str, Any]:
+        stats = self._stats.get(task_type)
+        if stats is None:
+            stats = self._stats[task_type] = {
+                "hits": 0,
+                "misses": 0,
+                "evictions": 0,
+                "window_hits": 0,
+                "window_misses": 0,
+                "puts": 0,
+                "entry_bytes": _DEFAULT_ENTRY_BYTES,
+            }
+        return stats
+
+    @staticmethod
+    def _entry_size(value: Any) -> int:
+        try:
+            return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            return sys.getsizeof(value)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get size, capacity and hit statistics per task type."""
+        with self._lock:
+            result = {}
+            for task_type, stats in self._stats.items():
+                lookups = stats["hits"] + stats["misses"]
+                result[task_type] = {
+                    "size": len(self._entries.get(task_type, ())),
+                    "capacity": self.capacity.get(task_type, self.default_capacity),
+                    "hits": stats["hits"],
+                    "misses": stats["misses"],
+                    "evictions": stats["evictions"],
+                    "hit_rate": stats["hits"] / lookups if lookups else 0.0,
+                    "entry_bytes": stats["entry_bytes"],
+                }
+            return result
+
+
+def plan_cache_sizes(
+    curves: Dict[str, Dict[int, float]],
+    lookups: Dict[str, float],
+    entry_bytes: Dict[str, float],
+    budget: float,
+) -> Dict[str, int]:
+    """
+    Split a memory budget between task types to maximize expected hits.
+
+    Greedy over the size ladder: each round grows the task type whose next
+    step (to any larger candidate size, so plateaus followed by a drop in
+    the curve are not missed) buys the most expected hits per byte.
+
+    Args:
+        curves: Task type -> cache size -> miss ratio
+        lookups: Task type -> lookups per window, weighting the curves
+        entry_bytes: Task type -> estimated bytes per cached entry
+        budget: Memory budget in bytes
+
+    Returns:
+        Task type -> cache size in entries
+    """
+    chosen = {task_type: 0 for task_type in curves}
+    spent = 0.0
+
+    while True:
+        best: Optional[Tuple[float, str, int, float]] = None
+        for task_type, curve in curves.items():
+            sizes = sorted(curve)
+            current = chosen[task_type]
+            hits_now = lookups.get(task_type, 0.0) * (1.0 - curve[current])
+            for size in sizes:
+                if size <= current:
+                    continue
+                cost = (size - current) * entry_bytes[task_type]
+                if spent + cost > budget:
+                    break
+                gain = lookups.get(task_type, 0.0) * (1.0 - curve[size]) - hits_now
+                if gain <= 0:
+                    continue
+                ratio = gain / cost
+                if best is None or ratio > best[0]:
+                    best = (ratio, task_type, size, cost)
+        if best is None:
+            return chosen
+        _, task_type, size, cost = best
+        chosen[task_type] = size
+        spent += cost
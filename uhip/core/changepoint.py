@@ -0,0 +1,261 @@
+"""
+Changepoint Detection for UHIP
+Streaming EWMA/CUSUM detection of latency and throughput shifts per task type
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+METRIC_LATENCY = "latency"
+METRIC_THROUGHPUT = "throughput"
+
+KIND_REGRESSION = "regression"
+KIND_IMPROVEMENT = "improvement"
+
+_Z_CLIP = 3.0
+_MIN_DEVIATION = 0.05  # In log units, i.e. about 5%
+# Floor of the window utilization throughput is normalized by, so a nearly
+# idle window cannot inflate its sample without bound
+_MIN_UTILIZATION = 0.05
+
+
+class ChangepointDetector:
+    """
+    Two-sided CUSUM on standardized samples around an EWMA baseline.
+
+    Samples are log-transformed (latency and throughput are multiplicative
+    and heavy-tailed) and standardized by the EWMA mean and deviation; each
+    standardized sample is clipped to +-3 so a single outlier cannot raise
+    an alarm on its own. An upper and a lower CUSUM accumulate evidence of
+    a shift larger than `drift` deviations and alarm when either exceeds
+    `threshold`. The onset of the change is the last time the alarming sum
+    left zero. The baseline only learns from samples while neither sum is
+    halfway to an alarm, so a slow drift cannot hide itself, and restarts
+    after an alarm so the new level becomes the reference. Every update is
+    O(1) in time and memory.
+    """
+
+    __slots__ = (
+        "alpha", "threshold", "drift", "warmup", "count", "mean", "var",
+        "upper", "lower", "upper_start", "lower_start",
+    )
+
+    def __init__(
+        self,
+        alpha: float = 0.02,
+        threshold: float = 10.0,
+        drift: float = 0.5,
+        warmup: int = 30,
+    ):
+        """
+        Initialize the detector.
+
+        Args:
+            alpha: EWMA weight of a new sample in the baseline
+            threshold: CUSUM value (in deviations) that raises an alarm
+            drift: Shift (in deviations) below which evidence does not accumulate
+            warmup: Samples used to learn the baseline before detecting
+        """
+        self.alpha = alpha
+        self.threshold = threshold
+        self.drift = drift
+        self.warmup = warmup
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the baseline; the next samples learn a new one."""
+        self.count = 0
+        self.mean = 0.0
+        self.var = 0.0
+        self.upper = 0.0
+        self.lower = 0.0
+        self.upper_start = 0.0
+        self.lower_start = 0.0
+
+    def update(self, value: float) -> Optional[Tuple[int, float, float]]:
+        """
+        Add one sample.
+
+        Args:
+            value: Positive sample (non-positive samples are ignored)
+
+        Returns:
+            (direction, onset, baseline) on an alarm, with direction +1 for
+            an upward and -1 for a downward shift and baseline in sample
+            units; None otherwise
+        """
+        if value <= 0:
+            return None
+        x = math.log(value)
+        self.count += 1
+        if self.count <= self.warmup:
+            # Cumulative mean and variance until the EWMA takes over
+            weight = 1.0 / self.count
+            delta = x - self.mean
+            self.mean += weight * delta
+            self.var += weight * (delta * (x - self.mean) - self.var)
+            return None
+
+        # Shifts under a few percent are not worth an alarm on a very stable series
+        std = max(math.sqrt(self.var), _MIN_DEVIATION)
+        z = max(-_Z_CLIP, min(_Z_CLIP, (x - self.mean) / std))
+        if self.upper == 0.0 and z > self.drift:
+            self.upper_start = time.time()
+        if self.lower == 0.0 and -z > self.drift:
+            self.lower_start = time.time()
+        self.upper = max(0.0, self.upper + z - self.drift)
+        self.lower = max(0.0, self.lower - z - self.drift)
+
+        if self.upper > self.threshold or self.lower > self.threshold:
+            direction = 1 if self.upper > self.threshold else -1
+            onset = self.upper_start if direction > 0 else self.lower_start
+            baseline = math.exp(self.mean)
+            self.reset()
+            return direction, onset, baseline
+
+        if max(self.upper, self.lower) < self.threshold / 2:
+            delta = x - self.mean
+            self.mean += self.alpha * delta
+            self.var = (1 - self.alpha) * (self.var + self.alpha * delta * delta)
+        return None
+
+
+class RegressionMonitor:
+    """
+    Changepoint detectors for per-task-type latency and throughput.
+
+    Latency is fed one request at a time; throughput is fed one analysis
+    window at a time from the request counters, as completions per
+    wall-clock second normalized by the pools' utilization in that window,
+    so that it follows delivered capacity rather than traffic. Detected
+    shifts become structured events; regressions (latency up, throughput down) are also
+    passed to the on_regression callback so the optimizer can react without
+    waiting for its interval. Latency updates take no lock, so concurrent
+    requests of one task type may occasionally interleave; each detector
+    stays bounded and only its precision suffers.
+    """
+
+    def __init__(
+        self,
+        on_regression: Optional[Callable[[Dict[str, Any]], None]] = None,
+        latency_warmup: int = 30,
+        throughput_warmup: int = 5,
+        max_events: int = 256,
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            on_regression: Called with each regression event
+            latency_warmup: Requests that form a task type's latency baseline
+            throughput_warmup: Windows that form a task type's throughput baseline
+            max_events: Events kept for get_events()
+        """
+        self.on_regression = on_regression
+        self.latency_warmup = latency_warmup
+        self.throughput_warmup = throughput_warmup
+        self._detectors: Dict[Tuple[str, str], ChangepointDetector] = {}
+        self._last_counts: Dict[str, Tuple[float, float, Optional[float]]] = {}
+        self._lock = threading.Lock()
+        self._pending: List[Dict[str, Any]] = []
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=max_events)
+
+    def _detector(self, task_type: str, metric: str) -> ChangepointDetector:
+        detector = self._detectors.get((task_type, metric))
+        if detector is None:
+            warmup = self.latency_warmup if metric == METRIC_LATENCY else self.throughput_warmup
+            detector = self._detectors.setdefault(
+                (task_type, metric), ChangepointDetector(warmup=warmup)
+            )
+        return detector
+
+    def observe_latency(self, task_type: str, seconds: float) -> None:
+        """Feed one request's latency."""
+        alarm = self._detector(task_type, METRIC_LATENCY).update(seconds)
+        if alarm is not None:
+            self._emit(task_type, METRIC_LATENCY, alarm, seconds)
+
+    def observe_counts(
+        self,
+        task_type: str,
+        count: float,
+        busy_time: Optional[float] = None,
+        workers: int = 1,
+        now: Optional[float] = None,
+    ) -> None:
+        """
+        Feed a task type's cumulative request count and the pools' busy time.
+
+        The throughput sample is completions per wall-clock second since the
+        previous call divided by the pools' utilization over the same window
+        (busy time over wall time times workers). Less traffic lowers both
+        alike and leaves the sample unchanged, while fewer workers, queueing
+        or lost parallelism complete fewer requests per second at the same
+        utilization and lower it. Without busy_time the raw completion rate
+        is used. Windows in which the task type completed nothing give no
+        sample.
+
+        Args:
+            task_type: Task type of the counters
+            count: Cumulative completed requests
+            busy_time: Cumulative seconds the pools' workers spent busy
+            workers: Workers in the pools
+            now: Time of the counters (time.monotonic()); defaults to now
+        """
+        now = time.monotonic() if now is None else now
+        last = self._last_counts.get(task_type)
+        self._last_counts[task_type] = (now, count, busy_time)
+        if last is None or count <= last[1] or now <= last[0]:
+            return
+        elapsed = now - last[0]
+        capacity = (count - last[1]) / elapsed
+        if busy_time is not None and last[2] is not None:
+            utilization = (busy_time - last[2]) / (elapsed * max(1, workers))
+            capacity /= min(1.0, max(_MIN_UTILIZATION, utilization))
+        alarm = self._detector(task_type, METRIC_THROUGHPUT).update(capacity)
+        if alarm is not None:
+            self._emit(task_type, METRIC_THROUGHPUT, alarm, capacity)
+
+    def _emit(
+        self, task_type: str, metric: str, alarm: Tuple[int, float, float], value: float
+    ) -> None:
+        direction, onset, baseline = alarm
+        worse = direction > 0 if metric == METRIC_LATENCY else direction < 0
+        event = {
+            "task_type": task_type,
+            "metric": metric,
+            "kind": KIND_REGRESSION if worse else KIND_IMPROVEMENT,
+            "onset": onset,
+            "detected": time.time(),
+            "baseline": baseline,
+            "current": value,
+            "ratio": value / baseline if baseline else None,
+        }
+        with self._lock:
+            self._pending.append(event)
+            self.events.append(event)
+        log = logger.warning if worse else logger.info
+        since = time.strftime("%H:%M:%S", time.localtime(onset))
+        log(
+            f"{metric.capitalize()} {event['kind']} in '{task_type}': "
+            f"{baseline:.6g} -> {value:.6g} since {since}"
+        )
+        if worse and self.on_regression is not None:
+            self.on_regression(event)
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Get the events detected since the previous drain."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        return pending
+
+    def get_events(self) -> List[Dict[str, Any]]:
+        """Get the most recent events, oldest first."""
+        with self._lock:
+            return list(self.events)
@@ -0,0 +1,142 @@
+"""
+Request Coalescing for UHIP
+Single-flight deduplication of identical in-flight requests
+"""
+
+import copy
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _freeze(value: Any) -> Hashable:
+    """Convert a payload into a hashable, type-tagged canonical form."""
+    if isinstance(value, dict):
+        return ("dict", frozenset((_freeze(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(_freeze(v) for v in value))
+    if isinstance(value, (set, frozenset)):
+        return ("set", frozenset(_freeze(v) for v in value))
+    hash(value)  # Raises TypeError for unhashable payloads
+    return (type(value).__name__, value)
+
+
+def request_key(task_type: str, data: Any) -> Optional[Hashable]:
+    """
+    Build the coalescing key for a request.
+
+    Args:
+        task_type: Task type of the request
+        data: Request payload
+
+    Returns:
+        Hashable key, or None if the payload cannot be keyed (e.g. arrays)
+    """
+    try:
+        return (task_type, _freeze(data))
+    except TypeError:
+        return None
+
+
+def share_result(result: Any) -> Any:
+    """
+    Copy a shared result for one of its followers.
+
+    Followers must not see each other's mutations, nor the leader's, so each
+    gets its own deep copy of the leader's result.
+    """
+    return copy.deepcopy(result)
+
+
+class SingleFlight:
+    """
+    Tracks in-flight computations by key so that concurrent identical
+    requests share one execution. The leader runs the computation and every
+    follower receives its own copy of the result (or the same exception).
+    """
+
+    def __init__(self) -> None:
+        """Initialize the single-flight group."""
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+        self.coalesced: Dict[str, int] = {}
+
+    def acquire(self, key: Hashable, task_type: str) -> Tuple[Future, bool]:
+        """
+        Join or start the computation for a key.
+
+        Args:
+            key: Request key from request_key()
+            task_type: Task type, used for statistics
+
+        Returns:
+            Tuple of (future, is_leader). The leader must call release().
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced[task_type] = self.coalesced.get(task_type, 0) + 1
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            return future, True
+
+    def release(
+        self,
+        key: Optional[Hashable],
+        future: Future,
+        result: Any = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """
+        Publish the leader's outcome and stop accepting followers.
+
+        Args:
+            key: Key passed to acquire(), or None for an unkeyed request
+            future: Future returned by acquire()
+            result: Computation result
+            error: Exception raised by the computation, if any
+        """
+        if key is not None:
+            with self._lock:
+                self._inflight.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def record(self, task_type: str, count: int = 1) -> None:
+        """Count requests coalesced outside acquire(), e.g. batch duplicates."""
+        with self._lock:
+            self.coalesced[task_type] = self.coalesced.get(task_type, 0) + count
+
+    def do(self, key: Hashable, task_type: str, func: Callable[[], Any]) -> Any:
+        """
+        Run func once for all concurrent callers with the same key.
+
+        Args:
+            key: Request key from request_key()
+            task_type: Task type, used for statistics
+            func: Zero-argument callable performing the computation
+
+        Returns:
+            Result of the shared computation
+        """
+        future, leader = self.acquire(key, task_type)
+        if not leader:
+            return share_result(future.result())
+
+        try:
+            result = func()
+        except BaseException as e:
+            self.release(key, future, error=e)
+            raise
+        self.release(key, future, result=result)
+        return result
+
+    def in_flight(self) -> int:
+        """Get the number of keys currently being computed."""
+        return len(self._inflight)
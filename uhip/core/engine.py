@@ -5,15 +5,51 @@ Integrates AI/ML, Quantum, Blockchain, and Edge Computing
 
 import logging
 import time
-from typing import Any, Dict, List, Optional
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures import Future, TimeoutError as FuturesTimeoutError
+from functools import partial
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Tuple
+from uhip.core import handlers
+from uhip.core.batching import MicroBatcher
+from uhip.core.caching import ResultCache
+from uhip.core.coalescing import SingleFlight, request_key, share_result
+from uhip.core.exceptions import DeadlineExceeded
+from uhip.core.experiments import Experiment
+from uhip.core.handlers import (
+    DEFAULT_TASK_TYPE,
+    EXECUTOR_INLINE,
+    EXECUTOR_PROCESS,
+    EXECUTOR_THREAD,
+    TaskHandler,
+    handler_specs,
+    init_worker,
+    run_batch,
+    run_task,
+)
 from uhip.core.optimizer import SelfOptimizer
+from uhip.core.pool import POOL_PROCESS, POOL_THREAD
 from uhip.core.processor import ParallelProcessor
+from uhip.core.recovery import BatchResult, RetryPolicy
+from uhip.core.telemetry import WorkerMetricsChannel, init_worker_metrics
+from uhip.core.worker_state import init_worker_state, state_specs
 from uhip.config.settings import EngineConfig
+from uhip.utils.metrics import ShardedMetrics
 
 
 logger = logging.getLogger(__name__)
 
+MODE_INLINE = "inline"
+MODE_POOL = "pool"
+
+
+class DispatchEntry(NamedTuple):
+    """Precomputed routing decision for a task type."""
+    
+    handler: TaskHandler
+    single_mode: str
+    batch_mode: str
+    batcher: Optional[MicroBatcher] = None
+    pool: Optional[str] = None
+
 
 class HybridEngine:
     """
@@ -29,16 +65,90 @@ class HybridEngine:
             config: Engine configuration object. If None, uses default config.
         """
         self.config = config or EngineConfig()
-        self.optimizer = SelfOptimizer(self.config)
-        self.processor = ParallelProcessor(
-            max_workers=self.config.max_workers,
-            use_processes=self.config.use_processes
+        self.optimizer = SelfOptimizer(self.config, engine=self)
+        self.processor = self._create_processor()
+        # Request metrics are sharded per calling thread; handler metrics
+        # arrive from process workers as batched deltas over the channel
+        self.metrics = ShardedMetrics()
+        self.worker_metrics = ShardedMetrics()
+        self._metrics_channel: Optional[WorkerMetricsChannel] = None
+        self._dispatch: Dict[str, DispatchEntry] = {}
+        self._dispatch_version = -1
+        self.coalescer = SingleFlight()
+        self.cache = (
+            ResultCache(
+                default_capacity=self.config.cache_size,
+                sample_rate=self.config.cache_sample_rate,
+            )
+            if self.config.cache_enabled else None
         )
-        self.performance_metrics: Dict[str, Any] = {}
         self.initialized = False
         
         logger.info(f"Hybrid Engine initialized with config: {self.config}")
 
+    def _create_processor(self, **overrides: Any) -> ParallelProcessor:
+        """Build a processor from the engine config, with optional argument overrides."""
+        settings: Dict[str, Any] = dict(
+            max_workers=self.config.max_workers,
+            use_processes=self.config.use_processes,
+            initializer=init_worker,
+            priorities=self.config.task_priorities,
+            weights=self.config.task_weights,
+            high_watermark=self.config.queue_high_watermark,
+            low_watermark=self.config.queue_low_watermark,
+            overload_policy=self.config.overload_policy,
+            min_workers=self.config.min_workers,
+            max_workers_limit=self.config.max_workers_limit or None,
+            autoscale=self.config.autoscale,
+            autoscale_interval=self.config.autoscale_interval,
+            hybrid=self.config.hybrid_pools,
+            secondary_workers=self.config.secondary_pool_workers or None,
+            work_stealing=self.config.work_stealing,
+            steal_chunk_size=self.config.steal_chunk_size or None,
+            shared_memory_threshold=self.config.shared_memory_threshold,
+            placement=self.config.cpu_placement,
+            hedge_budget=self.config.hedge_budget if self.config.hedging else 0.0,
+        )
+        settings.update(overrides)
+        return ParallelProcessor(**settings)
+
+    def create_shadow_processor(self, **overrides: Any) -> ParallelProcessor:
+        """
+        Start a second processor configured like the live one except for overrides.
+        
+        Settings tuned at runtime (worker count, chunk size, default pool)
+        are copied from the live processor. Used by configuration
+        experiments; the caller shuts it down.
+        
+        Args:
+            **overrides: ParallelProcessor arguments to change, e.g. max_workers=8
+        
+        Returns:
+            Initialized processor whose workers share the engine's handlers
+        """
+        settings = {
+            "max_workers": self.processor.max_workers,
+            "steal_chunk_size": self.processor.steal_chunk_size,
+            **overrides,
+        }
+        shadow = self._create_processor(**settings)
+        shadow.default_pool = self.processor.default_pool
+        shadow.initargs = (handler_specs(),)
+        shadow.add_initializer(init_worker_state, state_specs(self.config.worker_preload))
+        if self._metrics_channel is not None:
+            shadow.add_initializer(init_worker_metrics, *self._worker_metrics_args())
+        shadow.initialize()
+        return shadow
+
+    def _worker_metrics_args(self) -> Tuple[Any, int, float]:
+        """Arguments of the init_worker_metrics() worker hook."""
+        assert self._metrics_channel is not None
+        return (
+            self._metrics_channel.queue,
+            self.config.metrics_flush_items,
+            self.config.metrics_flush_interval,
+        )
+
     def initialize(self) -> bool:
         """
         Initialize all engine components.
@@ -52,12 +162,31 @@ class HybridEngine:
             # Initialize optimizer
             self.optimizer.initialize()
             
-            # Initialize processor
+            # Initialize processor; workers rebuild the handler registry
+            # and worker-state factories from importable references
+            # instead of receiving the engine
+            self.processor.initargs = (handler_specs(),)
+            if not self.processor.initialized:
+                self.processor.add_initializer(
+                    init_worker_state, state_specs(self.config.worker_preload)
+                )
+                # Only process workers ship metrics; thread pools need no channel
+                if self.processor.has_process_pool:
+                    self._metrics_channel = WorkerMetricsChannel(self.worker_metrics)
+                    self._metrics_channel.start()
+                    self.processor.add_initializer(
+                        init_worker_metrics, *self._worker_metrics_args()
+                    )
             self.processor.initialize()
+            self._build_dispatch_table()
             
             # Warm up the system
             self._warmup()
             
+            # Analysis and optimization run off the request path
+            if self.config.auto_optimize:
+                self.optimizer.start(self._metrics_snapshot)
+            
             self.initialized = True
             logger.info("Hybrid Engine initialization complete")
             return True
@@ -69,38 +198,59 @@ class HybridEngine:
     def _warmup(self) -> None:
         """Warm up the engine for optimal performance."""
         logger.info("Warming up engine...")
+        # Spawn pool workers now so the first request does not pay for
+        # process start-up, imports and worker-state construction
+        if self.config.prestart_workers:
+            self.processor.prestart(timeout=self.config.timeout or None)
+        # Start from the settings tuned in a previous run
+        self.optimizer.restore_profile()
         # Perform initial optimization
         self.optimizer.optimize()
 
-    def process(self, data: Any, task_type: str = "general") -> Any:
+    def process(
+        self, data: Any, task_type: str = "general", timeout: Optional[float] = None
+    ) -> Any:
         """
         Process data through the hybrid engine.
         
         Args:
             data: Input data to process
             task_type: Type of task (ai_ml, quantum, blockchain, edge, general)
+            timeout: Time budget in seconds. Defaults to EngineConfig.timeout.
             
         Returns:
             Processed result
+            
+        Raises:
+            DeadlineExceeded: If the result is not available within the timeout
         """
         if not self.initialized:
             raise RuntimeError("Engine not initialized. Call initialize() first.")
         
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
+        deadline = self._deadline(timeout)
+        self.optimizer.workload.record(task_type, data)
         
         try:
             logger.info(f"Processing task type: {task_type}")
             
-            # Route to appropriate processing module
-            result = self._route_task(data, task_type)
+            # Serve repeated requests to cacheable handlers from the result
+            # cache; misses run (or join) the computation and fill it
+            key = None
+            if self.config.coalesce_requests or self.cache is not None:
+                key = request_key(task_type, data)
+            cache = None
+            if key is not None and self._lookup(task_type).handler.cacheable:
+                cache = self.cache
+            hit, result = cache.get(task_type, key) if cache is not None else (False, None)
+            if not hit:
+                result = self._execute(data, task_type, deadline, key)
+                if cache is not None:
+                    cache.put(task_type, key, result)
             
             # Record performance metrics
-            processing_time = time.time() - start_time
-            self._record_metrics(task_type, processing_time)
-            
-            # Trigger self-optimization if needed
-            if self.config.auto_optimize:
-                self.optimizer.analyze_metrics(self.performance_metrics)
+            elapsed_ns = time.perf_counter_ns() - start_ns
+            processing_time = self._record_metrics(task_type, elapsed_ns)
             
             logger.info(f"Task completed in {processing_time:.4f} seconds")
             return result
@@ -109,110 +259,439 @@ class HybridEngine:
             logger.error(f"Error processing task: {e}")
             raise
 
-    def _route_task(self, data: Any, task_type: str) -> Any:
-        """Route task to appropriate processing module."""
-        routing_map = {
-            "ai_ml": self._process_ai_ml,
-            "quantum": self._process_quantum,
-            "blockchain": self._process_blockchain,
-            "edge": self._process_edge,
-            "general": self._process_general,
-        }
+    def _execute(
+        self, data: Any, task_type: str, deadline: Optional[float], key: Optional[Hashable]
+    ) -> Any:
+        """
+        Route a request to its processing module, sharing the result of an
+        identical request that is already in flight.
         
-        processor_func = routing_map.get(task_type, self._process_general)
-        return processor_func(data)
+        Only idempotent handlers are coalesced: sharing a result would skip
+        the side effects of every request but the leader.
+        """
+        if (
+            key is None
+            or not self.config.coalesce_requests
+            or not self._lookup(task_type).handler.idempotent
+        ):
+            return self._route_task(data, task_type, deadline)
+        
+        future, leader = self.coalescer.acquire(key, task_type)
+        if not leader:
+            return share_result(self._wait(future, deadline, task_type))
+        try:
+            result = self._route_task(data, task_type, deadline)
+        except BaseException as e:
+            self.coalescer.release(key, future, error=e)
+            raise
+        self.coalescer.release(key, future, result=result)
+        return result
 
-    def _process_ai_ml(self, data: Any) -> Dict[str, Any]:
-        """Process AI/ML tasks."""
-        logger.info("Processing AI/ML task")
-        # Use parallel processing for AI/ML workloads
-        return self.processor.process_batch([data], self._ai_ml_worker)[0]
+    def _build_dispatch_table(self) -> None:
+        """
+        Precompute how each registered task type is executed.
+        
+        Single requests only hop to the pool when a CPU-bound handler can run
+        in a separate process; everything else runs inline on the caller's
+        thread. Batches use the pool unless the handler asked to stay inline.
+        
+        In hybrid mode the pool comes from the handler's declaration; task
+        types that declare nothing are routed by their measured CPU profile.
+        """
+        self._close_batchers()
+        
+        table = {}
+        for task_type, handler in handlers.TASK_HANDLERS.items():
+            preferred = handler.preferred_executor
+            pool = self._select_pool(handler)
+            single_mode = (
+                MODE_POOL if pool == POOL_PROCESS and self.processor.has_pool(pool) else MODE_INLINE
+            )
+            batch_mode = MODE_INLINE if preferred == EXECUTOR_INLINE else MODE_POOL
+            batcher = None
+            if self.config.micro_batch_enabled and handler.batchable:
+                batcher = self._create_batcher(handler, single_mode, pool)
+            table[task_type] = DispatchEntry(handler, single_mode, batch_mode, batcher, pool)
+        
+        self._dispatch = table
+        self._dispatch_version = handlers.registry_version()
 
-    def _process_quantum(self, data: Any) -> Dict[str, Any]:
-        """Process Quantum computing tasks."""
-        logger.info("Processing Quantum task")
+    @staticmethod
+    def _select_pool(handler: TaskHandler) -> Optional[str]:
+        """Map a handler's preferred executor to a pool; None means profiled."""
         return {
-            "status": "processed",
-            "module": "quantum",
-            "data": data,
-            "qubits_used": 5,
-        }
+            EXECUTOR_THREAD: POOL_THREAD,
+            EXECUTOR_PROCESS: POOL_PROCESS,
+        }.get(handler.preferred_executor)
 
-    def _process_blockchain(self, data: Any) -> Dict[str, Any]:
-        """Process Blockchain tasks."""
-        logger.info("Processing Blockchain task")
-        return {
-            "status": "processed",
-            "module": "blockchain",
-            "data": data,
-            "block_hash": "0x" + "a" * 64,
-        }
+    def _create_batcher(
+        self,
+        handler: TaskHandler,
+        single_mode: str,
+        pool: Optional[str] = None,
+    ) -> MicroBatcher:
+        """Create the micro-batcher that aggregates single requests for a handler."""
+        submit = None
+        if single_mode == MODE_POOL:
+            submit = partial(self._submit_batch, handler.task_type, pool)
+        return MicroBatcher(
+            batch_func=partial(run_batch, handler.task_type),
+            max_batch_size=self.config.batch_size,
+            max_wait=self.config.micro_batch_max_wait_ms / 1000.0,
+            submit=submit,
+            name=f"batcher-{handler.task_type}",
+        )
 
-    def _process_edge(self, data: Any) -> Dict[str, Any]:
-        """Process Edge computing tasks."""
-        logger.info("Processing Edge computing task")
-        return {
-            "status": "processed",
-            "module": "edge",
-            "data": data,
-            "edge_nodes": 3,
-        }
+    def _submit_batch(
+        self,
+        task_type: str,
+        pool: Optional[str],
+        batch_func: Any,
+        items: List[Any],
+    ) -> Future:
+        """Submit one micro-batch to the processor."""
+        return self.processor.submit(batch_func, (items,), task_type=task_type, pool=pool)
 
-    def _process_general(self, data: Any) -> Dict[str, Any]:
-        """Process general tasks."""
-        logger.info("Processing general task")
-        return {
-            "status": "processed",
-            "module": "general",
-            "data": data,
-        }
+    def _close_batchers(self) -> None:
+        """Flush and stop all micro-batchers."""
+        for entry in self._dispatch.values():
+            if entry.batcher is not None:
+                entry.batcher.close()
 
-    def _ai_ml_worker(self, item: Any) -> Dict[str, Any]:
-        """Worker function for AI/ML processing."""
-        return {
-            "status": "processed",
-            "module": "ai_ml",
-            "data": item,
-            "model": "hybrid-v1",
-        }
+    def _lookup(self, task_type: str) -> DispatchEntry:
+        """Look up the dispatch entry for a task type."""
+        if self._dispatch_version != handlers.registry_version():
+            self._build_dispatch_table()
+        entry = self._dispatch.get(task_type)
+        if entry is None:
+            entry = self._dispatch[DEFAULT_TASK_TYPE]
+        return entry
 
-    def _record_metrics(self, task_type: str, processing_time: float) -> None:
-        """Record performance metrics."""
-        if task_type not in self.performance_metrics:
-            self.performance_metrics[task_type] = {
-                "count": 0,
-                "total_time": 0.0,
-                "avg_time": 0.0,
-            }
+    def _route_task(self, data: Any, task_type: str, deadline: Optional[float] = None) -> Any:
+        """Route task to appropriate processing module."""
+        entry = self._lookup(task_type)
+        if deadline is not None and time.monotonic() >= deadline:
+            self.processor.record_timeout(task_type, "expired")
+            raise DeadlineExceeded(f"Deadline passed before '{task_type}' task started")
+        if entry.batcher is not None:
+            return self._wait(entry.batcher.submit(data), deadline, task_type)
+        if entry.single_mode == MODE_POOL:
+            processor, experiment, treatment = self._experiment_arm()
+            start = time.perf_counter()
+            future = processor.submit(
+                run_task,
+                (entry.handler.task_type, data),
+                task_type=task_type,
+                deadline=deadline,
+                pool=entry.pool,
+                hedge=entry.handler.idempotent,
+            )
+            result = self._wait(future, deadline, task_type, cancel=True)
+            if experiment is not None:
+                experiment.record(treatment, time.perf_counter() - start)
+            return result
+        return entry.handler.func(data)
+
+    def _experiment_arm(self) -> Tuple[ParallelProcessor, Optional[Experiment], bool]:
+        """Pick the live or shadow processor for a pool-routed call."""
+        experiment = self.optimizer.experiment
+        if experiment is None:
+            return self.processor, None, False
+        treatment = experiment.assign()
+        return (experiment.shadow if treatment else self.processor), experiment, treatment
+
+    def _deadline(self, timeout: Optional[float]) -> Optional[float]:
+        """Convert a timeout (or the configured default) into a monotonic deadline."""
+        if timeout is None:
+            timeout = self.config.timeout
+        if timeout is None or timeout <= 0:
+            return None
+        return time.monotonic() + timeout
+
+    def _wait(
+        self,
+        future: Future,
+        deadline: Optional[float],
+        task_type: str,
+        cancel: bool = False,
+    ) -> Any:
+        """
+        Wait for a future until the deadline.
         
-        metrics = self.performance_metrics[task_type]
-        metrics["count"] += 1
-        metrics["total_time"] += processing_time
-        metrics["avg_time"] = metrics["total_time"] / metrics["count"]
+        Only futures owned by this caller may be cancelled on expiry; shared
+        futures (coalesced or micro-batched) are left for the other waiters.
+        """
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        try:
+            return future.result(timeout=remaining)
+        except FuturesTimeoutError:
+            if cancel:
+                future.cancel()
+            self.processor.record_timeout(task_type, "timed_out")
+            raise DeadlineExceeded(f"'{task_type}' task exceeded its deadline")
+
+    def _record_metrics(self, task_type: str, elapsed_ns: int) -> float:
+        """
+        Record performance metrics.
+        
+        Args:
+            task_type: Type of the completed task
+            elapsed_ns: Processing time in nanoseconds
+            
+        Returns:
+            Processing time in seconds
+        """
+        # The calling thread's shard takes no lock; a task type new to the
+        # thread (and so possibly to the engine) wakes the optimizer
+        processing_time = elapsed_ns / 1e9
+        if self.metrics.record(task_type, elapsed_ns):
+            self.optimizer.notify()
+        
+        # Slow requests wake the background optimizer as well
+        if processing_time > self.optimizer.profile.adaptation_threshold:
+            self.optimizer.notify()
+        self.optimizer.regressions.observe_latency(task_type, processing_time)
+        return processing_time
+
+    @property
+    def performance_metrics(self) -> Dict[str, Any]:
+        """Per-task-type count, total_time and avg_time merged across threads."""
+        return self._metrics_snapshot()
+
+    def _metrics_snapshot(self) -> Dict[str, Any]:
+        """
+        Merge the per-task-type counts without locking the request path.
+        
+        Only counts and times are merged, not the latency histograms, so a
+        snapshot is cheap enough for every optimization cycle. It may lag
+        updates still in flight but never counts one twice.
+        """
+        return self.metrics.summary(histograms=False)
+
+    def _drain_worker_metrics(self) -> None:
+        """Merge the metric deltas process workers have shipped so far."""
+        if self._metrics_channel is not None:
+            self._metrics_channel.drain()
 
-    def batch_process(self, items: List[Any], task_type: str = "general") -> List[Any]:
+    def recycle_workers(self, pids: Optional[List[int]] = None, reason: str = "manual") -> bool:
+        """
+        Replace process workers with fresh processes, one at a time.
+        
+        The deltas already shipped are merged first, so a worker's metrics
+        are accounted before it is retired; the delta it still holds is
+        flushed as it exits.
+        
+        Args:
+            pids: Workers to replace (default: every worker)
+            reason: Short label recorded in the processor's resize_history
+        
+        Returns:
+            True if any worker was replaced
+        """
+        self._drain_worker_metrics()
+        return self.processor.recycle_workers(reason=reason, pids=pids)
+
+    def batch_process(
+        self,
+        items: List[Any],
+        task_type: str = "general",
+        timeout: Optional[float] = None,
+        priority: Optional[str] = None,
+    ) -> List[Any]:
         """
         Process multiple items in parallel.
         
         Args:
             items: List of items to process
             task_type: Type of task
+            timeout: Time budget in seconds for the whole batch.
+                    Defaults to EngineConfig.timeout.
+            priority: Optional scheduling class overriding the task type's
+                     class, e.g. "bulk" for background jobs
             
         Returns:
             List of processed results
+            
+        Raises:
+            DeadlineExceeded: If the batch does not finish within the timeout
         """
         if not self.initialized:
             raise RuntimeError("Engine not initialized. Call initialize() first.")
         
         logger.info(f"Batch processing {len(items)} items of type: {task_type}")
+        if items:
+            self.optimizer.workload.record(task_type, items[0], count=len(items))
+        
+        entry = self._lookup(task_type)
+        deadline = self._deadline(timeout)
+        if not self.config.coalesce_requests or not entry.handler.idempotent:
+            return self._execute_batch(items, entry, deadline, priority)
+        
+        # Deduplicate within the batch and against in-flight requests; only
+        # the first occurrence of each payload (the leader) is executed
+        slots: List[Future] = []
+        claimed: Dict[Any, Future] = {}
+        leader_items: List[Any] = []
+        leader_claims: List[Tuple[Any, Future]] = []
         
-        # Use parallel processor for batch operations
-        worker_func = lambda x: self._route_task(x, task_type)
-        return self.processor.process_batch(items, worker_func)
+        for item in items:
+            key = request_key(task_type, item)
+            if key is None:
+                future: Future = Future()
+                leader_items.append(item)
+                leader_claims.append((None, future))
+            elif key in claimed:
+                future = claimed[key]
+                self.coalescer.record(task_type)
+            else:
+                future, leader = self.coalescer.acquire(key, task_type)
+                claimed[key] = future
+                if leader:
+                    leader_items.append(item)
+                    leader_claims.append((key, future))
+            slots.append(future)
+        
+        try:
+            results = self._execute_batch(leader_items, entry, deadline, priority)
+        except BaseException as e:
+            for key, future in leader_claims:
+                self.coalescer.release(key, future, error=e)
+            raise
+        
+        for (key, future), result in zip(leader_claims, results):
+            self.coalescer.release(key, future, result=result)
+        
+        # A leader's first slot gets its result; every other slot is a
+        # follower and gets a copy
+        owned = {id(future) for _, future in leader_claims}
+        results = []
+        for future in slots:
+            result = self._wait(future, deadline, task_type)
+            if id(future) in owned:
+                owned.discard(id(future))
+                results.append(result)
+            else:
+                results.append(share_result(result))
+        return results
+
+    def batch_process_partial(
+        self,
+        items: List[Any],
+        task_type: str = "general",
+        timeout: Optional[float] = None,
+        priority: Optional[str] = None,
+        retry: Optional[RetryPolicy] = None,
+        checkpoint: Optional[Any] = None,
+    ) -> BatchResult:
+        """
+        Process a batch, returning completed results alongside per-item errors.
+        
+        Items always run in the pool, one task each, without coalescing, so
+        every item gets its own result or error record.
+        
+        Args:
+            items: List of items to process
+            task_type: Type of task
+            timeout: Time budget in seconds for the whole batch including
+                    retries. Defaults to EngineConfig.timeout.
+            priority: Optional priority class for all items
+            retry: Retry policy for failed items; None runs each item once
+            checkpoint: BatchCheckpoint or file path; rerunning an interrupted
+                       batch with the same checkpoint skips finished items
+            
+        Returns:
+            BatchResult with results in input order and the failed items
+        """
+        if not self.initialized:
+            raise RuntimeError("Engine not initialized. Call initialize() first.")
+        if items:
+            self.optimizer.workload.record(task_type, items[0], count=len(items))
+        
+        entry = self._lookup(task_type)
+        handler = entry.handler
+        return self.processor.process_batch_partial(
+            items,
+            partial(run_task, handler.task_type),
+            retry=retry,
+            checkpoint=checkpoint,
+            deadline=self._deadline(timeout),
+            task_type=handler.task_type,
+            priority=priority,
+            pool=entry.pool,
+            hedge=handler.idempotent,
+        )
+
+    def _execute_batch(
+        self,
+        items: List[Any],
+        entry: DispatchEntry,
+        deadline: Optional[float] = None,
+        priority: Optional[str] = None,
+    ) -> List[Any]:
+        """Execute a batch according to the task type's dispatch entry."""
+        if not items:
+            return []
+        task_type = entry.handler.task_type
+        if entry.batch_mode == MODE_INLINE:
+            results = []
+            for item in items:
+                if deadline is not None and time.monotonic() >= deadline:
+                    self.processor.record_timeout(task_type, "expired")
+                    raise DeadlineExceeded(f"Batch deadline passed for '{task_type}'")
+                results.append(entry.handler.func(item))
+            return results
+        
+        # Use parallel processor for batch operations. The worker is a
+        # picklable module-level function so process pools work too.
+        worker_func = partial(run_task, task_type)
+        processor, experiment, treatment = self._experiment_arm()
+        start = time.perf_counter()
+        results = processor.process_batch(
+            items,
+            worker_func,
+            deadline=deadline,
+            task_type=task_type,
+            priority=priority,
+            pool=entry.pool,
+            hedge=entry.handler.idempotent,
+        )
+        if experiment is not None:
+            experiment.record(treatment, time.perf_counter() - start, len(items))
+        return results
 
     def get_metrics(self) -> Dict[str, Any]:
         """Get current performance metrics."""
-        return self.performance_metrics.copy()
+        metrics = self.metrics.summary()
+        self._drain_worker_metrics()
+        for task_type, stats in self.worker_metrics.summary().items():
+            metrics.setdefault(task_type, {})["worker"] = stats
+        for task_type, entry in self._dispatch.items():
+            if entry.batcher is not None and task_type in metrics:
+                metrics[task_type]["micro_batch"] = entry.batcher.get_stats()
+        for task_type, count in self.coalescer.coalesced.items():
+            metrics.setdefault(task_type, {})["coalesced"] = count
+        processor_stats = self.processor.get_stats()
+        for task_type, stats in processor_stats["timeouts"].items():
+            metrics.setdefault(task_type, {})["timeouts"] = stats
+        for kind in ("rejected", "shed"):
+            for task_type, count in processor_stats["admission"][kind].items():
+                metrics.setdefault(task_type, {})[kind] = count
+        if self.cache is not None:
+            for task_type, stats in self.cache.get_stats().items():
+                metrics.setdefault(task_type, {})["cache"] = stats
+        if processor_stats["hedging"] is not None:
+            for task_type, stats in processor_stats["hedging"]["task_types"].items():
+                metrics.setdefault(task_type, {})["hedging"] = stats
+        return metrics
+
+    def is_overloaded(self) -> bool:
+        """
+        Check whether admission control is currently saturated.
+        
+        Upstream callers can poll this to apply backpressure before
+        submitting more work.
+        """
+        return bool(self.processor.get_stats()["admission"]["saturated"])
 
     def optimize(self) -> Dict[str, Any]:
         """
@@ -227,6 +706,15 @@ class HybridEngine:
     def shutdown(self) -> None:
         """Gracefully shutdown the engine."""
         logger.info("Shutting down Hybrid Engine")
+        self.optimizer.stop()
+        self.optimizer.stop_experiment()
+        self._close_batchers()
+        # The telemetry channel keeps draining until the workers have
+        # exited; a worker with unread deltas could not finish otherwise
         self.processor.shutdown()
+        self.optimizer.memory.restore()
+        if self._metrics_channel is not None:
+            self._metrics_channel.close()
+            self._metrics_channel = None
         self.initialized = False
         logger.info("Hybrid Engine shutdown complete")
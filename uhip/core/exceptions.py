@@ -0,0 +1,15 @@
+"""
+Exceptions for UHIP core
+"""
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a task's deadline passes before it completes."""
+
+
+class EngineOverloaded(RuntimeError):
+    """Raised when admission control rejects or sheds a task."""
+
+    def __init__(self, message: str, queue_depth: int = 0):
+        super().__init__(message)
+        self.queue_depth = queue_depth
@@ -0,0 +1,218 @@
+"""
+Configuration Experiments for UHIP
+Online A/B evaluation of a shadow configuration against the live one
+"""
+
+import logging
+import math
+import random
+import statistics
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from uhip.core.tuning import KNOB_CHUNK_SIZE, KNOB_WORKERS
+
+logger = logging.getLogger(__name__)
+
+VERDICT_PROMOTE = "promote"
+VERDICT_REJECT = "reject"
+
+# Knobs a shadow processor can be built with: knob -> ParallelProcessor argument
+EXPERIMENT_KNOBS = {
+    KNOB_WORKERS: "max_workers",
+    KNOB_CHUNK_SIZE: "steal_chunk_size",
+}
+
+
+def mann_whitney_u(a: Sequence[float], b: Sequence[float]) -> Tuple[float, float]:
+    """
+    Two-sided Mann-Whitney U test.
+
+    Uses average ranks for ties and the tie-corrected normal approximation,
+    which is accurate for the sample sizes experiments collect (tens and up).
+
+    Args:
+        a: First sample
+        b: Second sample
+
+    Returns:
+        Tuple of (U statistic of a, two-sided p-value); p is 1.0 when either
+        sample is empty or all values are tied
+    """
+    n1, n2 = len(a), len(b)
+    if not n1 or not n2:
+        return 0.0, 1.0
+
+    pooled = sorted([(value, 0) for value in a] + [(value, 1) for value in b])
+    rank_sum = 0.0
+    tie_term = 0.0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        average_rank = (i + j) / 2 + 1
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        rank_sum += average_rank * sum(1 for k in range(i, j + 1) if pooled[k][1] == 0)
+        i = j + 1
+
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return u, 1.0
+    # Continuity-corrected z score
+    z = (abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(variance)
+    return u, min(1.0, math.erfc(max(0.0, z) / math.sqrt(2)))
+
+
+class Experiment:
+    """
+    A/B comparison of one candidate setting against the live configuration.
+
+    A fraction of pool-routed requests and batches is sent to a shadow
+    processor built with the candidate value. Every routed call records its
+    wall time as a latency sample and, for batches, items per second as a
+    throughput sample. Once both arms hold min_samples latencies the
+    distributions are compared with the Mann-Whitney U test: a significant
+    regression in either metric rejects the candidate, a significant
+    improvement (without a regression) promotes it, and a candidate still
+    inconclusive after max_samples treatment latencies is rejected.
+    """
+
+    def __init__(
+        self,
+        knob: str,
+        baseline: Any,
+        candidate: Any,
+        fraction: float = 0.1,
+        alpha: float = 0.05,
+        min_samples: int = 100,
+        max_samples: int = 2000,
+        min_batches: int = 10,
+    ):
+        """
+        Initialize the experiment.
+
+        Args:
+            knob: Setting under test (see EXPERIMENT_KNOBS)
+            baseline: Live value of the setting
+            candidate: Value the shadow configuration uses
+            fraction: Share of routed calls sent to the shadow configuration
+            alpha: Significance level of each test
+            min_samples: Latency samples per arm before testing
+            max_samples: Treatment samples after which an inconclusive
+                        candidate is rejected; also bounds memory per arm
+            min_batches: Throughput samples per arm before throughput is tested
+        """
+        if knob not in EXPERIMENT_KNOBS:
+            raise ValueError(f"Unsupported experiment knob: {knob}")
+        if not 0.0 < fraction < 1.0:
+            raise ValueError("fraction must be between 0 and 1")
+        self.knob = knob
+        self.baseline = baseline
+        self.candidate = candidate
+        self.fraction = fraction
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.min_batches = min_batches
+        self.shadow: Any = None
+        self.started = time.time()
+        # Index 0 is the control arm, 1 the treatment arm
+        self.latency: Tuple[Deque[float], Deque[float]] = (
+            deque(maxlen=max_samples), deque(maxlen=max_samples)
+        )
+        self.throughput: Tuple[Deque[float], Deque[float]] = (
+            deque(maxlen=max_samples), deque(maxlen=max_samples)
+        )
+        self.treated = 0
+        self.result: Optional[Dict[str, Any]] = None
+
+    def assign(self) -> bool:
+        """Decide whether the next call runs on the shadow configuration."""
+        return random.random() < self.fraction
+
+    def record(self, treatment: bool, seconds: float, items: int = 1) -> None:
+        """
+        Record one routed call.
+
+        A batch adds its wall time per item to the latency arm, so single
+        requests and batches of any size are compared on the same scale.
+
+        Args:
+            treatment: Whether the call ran on the shadow configuration
+            seconds: Wall time of the call
+            items: Items processed (batches record throughput too)
+        """
+        self.latency[treatment].append(seconds / max(1, items))
+        if treatment:
+            self.treated += 1
+        if items > 1 and seconds > 0:
+            self.throughput[treatment].append(items / seconds)
+
+    def evaluate(self) -> Optional[str]:
+        """
+        Test the collected samples.
+
+        Returns:
+            VERDICT_PROMOTE, VERDICT_REJECT, or None while inconclusive
+        """
+        control, treatment = (list(arm) for arm in self.latency)
+        if min(len(control), len(treatment)) < self.min_samples:
+            return None
+
+        latency = self._compare(control, treatment, higher_is_better=False)
+        throughput = None
+        control_rate, treatment_rate = (list(arm) for arm in self.throughput)
+        if min(len(control_rate), len(treatment_rate)) >= self.min_batches:
+            throughput = self._compare(control_rate, treatment_rate, higher_is_better=True)
+
+        outcomes = [latency] + ([throughput] if throughput else [])
+        if any(outcome["worse"] for outcome in outcomes):
+            verdict: Optional[str] = VERDICT_REJECT
+        elif any(outcome["better"] for outcome in outcomes):
+            verdict = VERDICT_PROMOTE
+        elif self.treated >= self.max_samples:
+            verdict = VERDICT_REJECT
+        else:
+            verdict = None
+
+        if verdict is not None:
+            self.result = {"verdict": verdict, "latency": latency, "throughput": throughput}
+        return verdict
+
+    def _compare(
+        self, control: List[float], treatment: List[float], higher_is_better: bool
+    ) -> Dict[str, Any]:
+        _, p_value = mann_whitney_u(treatment, control)
+        control_median = statistics.median(control)
+        treatment_median = statistics.median(treatment)
+        improved = treatment_median > control_median
+        if not higher_is_better:
+            improved = treatment_median < control_median
+        significant = p_value < self.alpha and treatment_median != control_median
+        return {
+            "p_value": p_value,
+            "control_median": control_median,
+            "treatment_median": treatment_median,
+            "control_samples": len(control),
+            "treatment_samples": len(treatment),
+            "better": significant and improved,
+            "worse": significant and not improved,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the setting under test, sample counts and the verdict."""
+        return {
+            "knob": self.knob,
+            "baseline": self.baseline,
+            "candidate": self.candidate,
+            "fraction": self.fraction,
+            "started": self.started,
+            "samples": [len(arm) for arm in self.latency],
+            "batches": [len(arm) for arm in self.throughput],
+            "result": self.result,
+        }
@@ -0,0 +1,308 @@
+"""
+Task Handlers for UHIP
+Module-level task handler registry shared by the engine and pool workers
+"""
+
+import importlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from uhip.core import telemetry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TASK_TYPE = "general"
+
+EXECUTOR_AUTO = "auto"
+EXECUTOR_INLINE = "inline"
+EXECUTOR_THREAD = "thread"
+EXECUTOR_PROCESS = "process"
+EXECUTORS = (EXECUTOR_AUTO, EXECUTOR_INLINE, EXECUTOR_THREAD, EXECUTOR_PROCESS)
+
+
+@dataclass(frozen=True)
+class TaskHandler:
+    """Registered handler for a task type and its execution traits."""
+    
+    task_type: str
+    func: Callable[[Any], Any]
+    cpu_bound: bool = False
+    batchable: bool = False
+    batch_func: Optional[Callable[[List[Any]], List[Any]]] = None
+    executor: str = EXECUTOR_AUTO
+    idempotent: bool = False
+    cacheable: bool = False
+
+    @property
+    def preferred_executor(self) -> str:
+        """Resolve "auto" to a concrete executor from the declared traits."""
+        if self.executor != EXECUTOR_AUTO:
+            return self.executor
+        return EXECUTOR_PROCESS if self.cpu_bound else EXECUTOR_INLINE
+
+
+# Registry of task type -> handler. Handlers are module-level functions so
+# they can be pickled by reference and rebuilt inside process-pool workers.
+TASK_HANDLERS: Dict[str, TaskHandler] = {}
+
+# Bumped on every registration so dispatch tables know when to rebuild
+_registry_version = 0
+
+
+def ai_ml_worker(item: Any) -> Dict[str, Any]:
+    """Worker function for AI/ML processing."""
+    return {
+        "status": "processed",
+        "module": "ai_ml",
+        "data": item,
+        "model": "hybrid-v1",
+    }
+
+
+def process_ai_ml(data: Any) -> Dict[str, Any]:
+    """Process AI/ML tasks."""
+    logger.info("Processing AI/ML task")
+    return ai_ml_worker(data)
+
+
+def process_ai_ml_batch(items: List[Any]) -> List[Dict[str, Any]]:
+    """Process a batch of AI/ML tasks in one model invocation."""
+    logger.info(f"Processing AI/ML batch of {len(items)} items")
+    return [ai_ml_worker(item) for item in items]
+
+
+def process_quantum(data: Any) -> Dict[str, Any]:
+    """Process Quantum computing tasks."""
+    logger.info("Processing Quantum task")
+    return {
+        "status": "processed",
+        "module": "quantum",
+        "data": data,
+        "qubits_used": 5,
+    }
+
+
+def process_blockchain(data: Any) -> Dict[str, Any]:
+    """Process Blockchain tasks."""
+    logger.info("Processing Blockchain task")
+    return {
+        "status": "processed",
+        "module": "blockchain",
+        "data": data,
+        "block_hash": "0x" + "a" * 64,
+    }
+
+
+def process_edge(data: Any) -> Dict[str, Any]:
+    """Process Edge computing tasks."""
+    logger.info("Processing Edge computing task")
+    return {
+        "status": "processed",
+        "module": "edge",
+        "data": data,
+        "edge_nodes": 3,
+    }
+
+
+def process_general(data: Any) -> Dict[str, Any]:
+    """Process general tasks."""
+    logger.info("Processing general task")
+    return {
+        "status": "processed",
+        "module": "general",
+        "data": data,
+    }
+
+
+def register_handler(
+    task_type: str,
+    func: Callable[[Any], Any],
+    cpu_bound: bool = False,
+    batchable: bool = False,
+    batch_func: Optional[Callable[[List[Any]], List[Any]]] = None,
+    executor: str = EXECUTOR_AUTO,
+    idempotent: bool = False,
+    cacheable: bool = False,
+) -> TaskHandler:
+    """
+    Register a handler for a task type.
+
+    Handlers that should run in process-pool workers must be module-level
+    functions; anything else only works with thread-based execution.
+
+    Args:
+        task_type: Task type the handler serves
+        func: Callable taking the task payload and returning the result
+        cpu_bound: True for compute-heavy handlers that benefit from processes
+        batchable: True if the handler can process several payloads at once
+        batch_func: Optional callable taking a list of payloads and returning
+                   a list of results; implies batchable
+        executor: Preferred executor: "auto", "inline", "thread" or "process"
+        idempotent: True if running the handler twice on the same payload is
+                   harmless, which allows hedged (duplicate) execution
+        cacheable: True if the result depends only on the payload, so the
+                  engine may serve repeated requests from its result cache
+        
+    Returns:
+        The registered TaskHandler
+    """
+    global _registry_version
+    
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor '{executor}', expected one of {EXECUTORS}")
+    
+    for candidate in (func, batch_func):
+        if candidate is not None and "<" in getattr(candidate, "__qualname__", "<"):
+            logger.warning(
+                f"Handler for '{task_type}' is not a module-level function and "
+                f"cannot be rebuilt in process workers"
+            )
+    
+    handler = TaskHandler(
+        task_type=task_type,
+        func=func,
+        cpu_bound=cpu_bound,
+        batchable=batchable or batch_func is not None,
+        batch_func=batch_func,
+        executor=executor,
+        idempotent=idempotent,
+        cacheable=cacheable,
+    )
+    TASK_HANDLERS[task_type] = handler
+    _registry_version += 1
+    logger.debug(f"Registered handler for task type: {task_type}")
+    return handler
+
+
+def registry_version() -> int:
+    """Get the registry version, incremented on every registration."""
+    return _registry_version
+
+
+def get_handler(task_type: str) -> TaskHandler:
+    """Get the handler for a task type, falling back to the general handler."""
+    handler = TASK_HANDLERS.get(task_type)
+    if handler is None:
+        handler = TASK_HANDLERS[DEFAULT_TASK_TYPE]
+    return handler
+
+
+def run_task(task_type: str, data: Any) -> Any:
+    """
+    Run a single task through its registered handler.
+
+    This is the picklable entry point submitted to pool workers; only the
+    task type and payload cross the process boundary. Worker processes
+    that ship metrics also record the handler's run time.
+    """
+    if not telemetry.reporting():
+        return get_handler(task_type).func(data)
+    start_ns = time.perf_counter_ns()
+    result = get_handler(task_type).func(data)
+    telemetry.record_worker_metric(task_type, time.perf_counter_ns() - start_ns)
+    return result
+
+
+def _run_batch(task_type: str, items: List[Any]) -> List[Any]:
+    handler = get_handler(task_type)
+    if handler.batch_func is not None:
+        return handler.batch_func(items)
+    return [handler.func(item) for item in items]
+
+
+def run_batch(task_type: str, items: List[Any]) -> List[Any]:
+    """Run several tasks through the handler's batch function if it has one."""
+    if not telemetry.reporting() or not items:
+        return _run_batch(task_type, items)
+    start_ns = time.perf_counter_ns()
+    results = _run_batch(task_type, items)
+    telemetry.record_worker_metric(task_type, time.perf_counter_ns() - start_ns, len(items))
+    return results
+
+
+def _reference(func: Optional[Callable[..., Any]]) -> Optional[str]:
+    """Build a "module:qualname" reference, or None if not importable."""
+    if func is None:
+        return None
+    qualname = getattr(func, "__qualname__", "<unknown>")
+    if "<" in qualname:
+        return None
+    return f"{func.__module__}:{qualname}"
+
+
+def handler_specs() -> List[Dict[str, Any]]:
+    """
+    Describe the registered handlers as importable references.
+
+    Returns:
+        List of picklable handler descriptions for module-level handlers
+    """
+    specs = []
+    for handler in TASK_HANDLERS.values():
+        func_ref = _reference(handler.func)
+        if func_ref is None:
+            continue
+        specs.append({
+            "task_type": handler.task_type,
+            "func": func_ref,
+            "batch_func": _reference(handler.batch_func),
+            "cpu_bound": handler.cpu_bound,
+            "batchable": handler.batchable,
+            "executor": handler.executor,
+            "idempotent": handler.idempotent,
+            "cacheable": handler.cacheable,
+        })
+    return specs
+
+
+def _resolve(reference: str) -> Callable[..., Any]:
+    """Import a handler from a "module:qualname" reference."""
+    module_name, qualname = reference.split(":", 1)
+    target: Any = importlib.import_module(module_name)
+    for attr in qualname.split("."):
+        target = getattr(target, attr)
+    if not callable(target):
+        raise TypeError(f"Handler reference {reference!r} is not callable")
+    func: Callable[..., Any] = target
+    return func
+
+
+def init_worker(specs: List[Dict[str, Any]]) -> None:
+    """
+    Pool worker initializer that rebuilds the handler registry.
+
+    Args:
+        specs: Handler descriptions as produced by handler_specs()
+    """
+    for spec in specs:
+        task_type = spec["task_type"]
+        try:
+            batch_ref = spec.get("batch_func")
+            TASK_HANDLERS[task_type] = TaskHandler(
+                task_type=task_type,
+                func=_resolve(spec["func"]),
+                cpu_bound=spec.get("cpu_bound", False),
+                batchable=spec.get("batchable", False),
+                batch_func=_resolve(batch_ref) if batch_ref else None,
+                executor=spec.get("executor", EXECUTOR_AUTO),
+                idempotent=spec.get("idempotent", False),
+                cacheable=spec.get("cacheable", False),
+            )
+        except (ImportError, AttributeError, ValueError) as e:
+            logger.warning(f"Could not rebuild handler for '{task_type}': {e}")
+
+
+register_handler(
+    "ai_ml",
+    process_ai_ml,
+    cpu_bound=True,
+    batch_func=process_ai_ml_batch,
+    idempotent=True,
+    cacheable=True,
+)
+register_handler("quantum", process_quantum, cpu_bound=True, idempotent=True, cacheable=True)
+register_handler("blockchain", process_blockchain, executor=EXECUTOR_THREAD)
+register_handler("edge", process_edge, executor=EXECUTOR_THREAD, idempotent=True, cacheable=True)
+register_handler("general", process_general, idempotent=True, cacheable=True)
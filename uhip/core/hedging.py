@@ -0,0 +1,145 @@
+"""
+Hedged Execution for UHIP
+Latency thresholds and work budget for duplicating straggler tasks
+"""
+
+import logging
+import math
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+HEDGE_WIN = "wins"
+HEDGE_LOSS = "losses"
+HEDGE_FAILURE = "failures"
+
+
+class HedgePolicy:
+    """
+    Decides when a running task deserves a duplicate.
+
+    A task becomes a straggler once it has run longer than the configured
+    percentile of recent run times of its task type. Duplicates are limited
+    to a fraction of all hedgeable tasks, so hedging cannot add more than
+    budget extra work even when a whole pool slows down.
+    """
+
+    def __init__(
+        self,
+        budget: float = 0.05,
+        percentile: float = 0.95,
+        min_samples: int = 20,
+        window: int = 256,
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            budget: Maximum duplicates as a fraction of hedgeable tasks
+            percentile: Run-time percentile after which a task is hedged
+            min_samples: Samples needed before a task type is hedged at all
+            window: Number of recent run times kept per task type
+        """
+        if not 0.0 < percentile < 1.0:
+            raise ValueError("percentile must be between 0 and 1")
+
+        self.budget = budget
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+        self._thresholds: Dict[str, float] = {}
+        self._stale: Dict[str, int] = {}
+        self.tasks = 0
+        self.hedges = 0
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def record(self, task_type: str, seconds: float) -> None:
+        """Record the run time of a completed task."""
+        with self._lock:
+            samples = self._samples.get(task_type)
+            if samples is None:
+                samples = self._samples[task_type] = deque(maxlen=self.window)
+            samples.append(seconds)
+            self._stale[task_type] = self._stale.get(task_type, 0) + 1
+
+    def threshold(self, task_type: str) -> Optional[float]:
+        """
+        Get the run time after which a task of this type is hedged.
+
+        Returns:
+            Threshold in seconds, or None while there are too few samples
+        """
+        with self._lock:
+            samples = self._samples.get(task_type)
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            # Re-sort only every few samples; the percentile moves slowly
+            if task_type not in self._thresholds or self._stale.get(task_type, 0) >= 16:
+                ordered = sorted(samples)
+                index = min(len(ordered) - 1, math.ceil(self.percentile * len(ordered)) - 1)
+                self._thresholds[task_type] = ordered[index]
+                self._stale[task_type] = 0
+            return self._thresholds[task_type]
+
+    def count_task(self, task_type: str) -> None:
+        """Count a dispatched hedgeable task towards the budget."""
+        with self._lock:
+            self.tasks += 1
+            self._task_stats(task_type)["tasks"] += 1
+
+    def admit(self, task_type: str) -> bool:
+        """Reserve budget for one duplicate; False if the budget is spent."""
+        with self._lock:
+            stats = self._task_stats(task_type)
+            if self.hedges + 1 > self.budget * self.tasks:
+                stats["over_budget"] += 1
+                return False
+            self.hedges += 1
+            stats["hedged"] += 1
+            return True
+
+    def record_outcome(self, task_type: str, outcome: str) -> None:
+        """
+        Count a hedge outcome: "wins" (duplicate succeeded first), "losses"
+        (primary succeeded first) or "failures" (both attempts raised).
+        """
+        with self._lock:
+            self._task_stats(task_type)[outcome] += 1
+
+    def skip(self, task_type: str) -> None:
+        """Count a straggler that could not be hedged for lack of an idle worker."""
+        with self._lock:
+            self._task_stats(task_type)["no_idle_worker"] += 1
+
+    def _task_stats(self, task_type: str) -> Dict[str, int]:
+        stats = self._stats.get(task_type)
+        if stats is None:
+            stats = self._stats[task_type] = {
+                "tasks": 0,
+                "hedged": 0,
+                HEDGE_WIN: 0,
+                HEDGE_LOSS: 0,
+                HEDGE_FAILURE: 0,
+                "over_budget": 0,
+                "no_idle_worker": 0,
+            }
+        return stats
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get budget usage and per-task-type hedge outcomes."""
+        with self._lock:
+            return {
+                "budget": self.budget,
+                "percentile": self.percentile,
+                "tasks": self.tasks,
+                "hedges": self.hedges,
+                "extra_work": self.hedges / self.tasks if self.tasks else 0.0,
+                "task_types": {
+                    task_type: dict(stats, threshold=self._thresholds.get(task_type))
+                    for task_type, stats in self._stats.items()
+                },
+            }
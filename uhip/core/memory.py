@@ -0,0 +1,279 @@
+"""
+Memory Control for UHIP
+Keeps engine and worker RSS within a budget by trimming, recycling and GC tuning
+"""
+
+import gc
+import logging
+import os
+import statistics
+import time
+from typing import Any, Dict, List, Optional
+
+try:
+    import psutil  # type: ignore[import]
+except ImportError:  # pragma: no cover - psutil is optional
+    psutil = None
+
+
+logger = logging.getLogger(__name__)
+
+# History buffers are cut to this many entries under memory pressure
+HISTORY_LIMIT = 100
+
+_GC_THRESHOLD_CAP = 50000
+
+
+def rss_bytes(pid: Optional[int] = None) -> Optional[int]:
+    """
+    Get the resident set size of a process.
+
+    Uses psutil when installed and /proc elsewhere on Linux.
+
+    Args:
+        pid: Process id; None for the calling process
+
+    Returns:
+        RSS in bytes, or None if it cannot be measured
+    """
+    pid = os.getpid() if pid is None else pid
+    if psutil is not None:
+        try:
+            return int(psutil.Process(pid).memory_info().rss)
+        except (psutil.Error, OSError):
+            return None
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def physical_memory() -> Optional[int]:
+    """Get the machine's physical memory in bytes, if known."""
+    if psutil is not None:
+        return int(psutil.virtual_memory().total)
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+class MemoryController:
+    """
+    Control loop keeping the engine's memory within a budget.
+
+    Each step measures the RSS of the engine process and of every process
+    worker, plus the estimated bytes held by the result cache. Crossing the
+    high-water mark triggers, in order: halving the result cache's budget
+    share (and its current capacities), trimming history buffers, recycling
+    process pools with bloated workers, and a full collection with default
+    GC thresholds. Below the low-water mark the cache share recovers
+    gradually, and allocation-heavy phases (many generation-0 collections
+    per second) get a higher generation-0 threshold so batches spend less
+    time in the collector.
+    """
+
+    def __init__(
+        self,
+        budget: Optional[int] = None,
+        high_water: float = 0.9,
+        low_water: float = 0.7,
+        gc_rate: float = 50.0,
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            budget: Memory budget in bytes; None uses 75% of physical memory
+            high_water: Fraction of the budget at which pressure relief starts
+            low_water: Fraction of the budget below which caches may regrow
+                      and GC thresholds may be raised
+            gc_rate: Generation-0 collections per second counted as an
+                    allocation-heavy phase
+        """
+        if budget is None:
+            total = physical_memory()
+            budget = int(total * 0.75) if total else None
+        self.budget = budget
+        self.high_water = high_water
+        self.low_water = low_water
+        self.gc_rate = gc_rate
+        self.cache_budget_factor = 1.0
+        self.default_gc_threshold = gc.get_threshold()
+        self._last_gc: Optional[tuple] = None
+        self.stats = {"steps": 0, "pressure": 0, "recycled": 0, "gc_collections": 0}
+
+    def measure(self, engine: Any) -> Dict[str, Any]:
+        """
+        Measure engine, worker and cache memory.
+
+        Returns:
+            Snapshot with "rss", "workers" (pid -> RSS), "cache" (task type
+            -> bytes) and "total" in bytes; "total" is None when RSS cannot
+            be measured on this platform
+        """
+        rss = rss_bytes()
+        workers: Dict[int, Optional[int]] = {}
+        for pids in engine.processor.worker_pids().values():
+            for pid in pids:
+                workers[pid] = rss_bytes(pid)
+        cache = engine.cache.memory_bytes() if getattr(engine, "cache", None) else {}
+        total = None
+        if rss is not None:
+            total = rss + sum(size for size in workers.values() if size is not None)
+        return {"rss": rss, "workers": workers, "cache": cache, "total": total}
+
+    def step(self, engine: Any) -> Dict[str, Any]:
+        """
+        Take one control decision.
+
+        Args:
+            engine: HybridEngine whose processor, cache and optimizer are managed
+
+        Returns:
+            Report with the memory snapshot, budget, pressure flag and the
+            actions taken
+        """
+        self.stats["steps"] += 1
+        snapshot = self.measure(engine)
+        total = snapshot["total"]
+        report: Dict[str, Any] = dict(snapshot, budget=self.budget, pressure=False, actions=[])
+        budget = self.budget
+        if total is None or not budget:
+            report["actions"].extend(self._tune_gc(relaxed=True))
+            return report
+
+        usage = total / budget
+        workers = snapshot["workers"]
+        report["usage"] = usage
+        if usage >= self.high_water:
+            report["pressure"] = True
+            self.stats["pressure"] += 1
+            logger.warning(
+                f"Memory pressure: {total / 2**20:.0f} MB of {budget / 2**20:.0f} MB budget"
+            )
+            report["actions"].extend(self._trim_cache(engine))
+            report["actions"].extend(self._trim_history(engine))
+            report["actions"].extend(self._recycle(engine, workers, budget, pressure=True))
+            report["actions"].extend(self._collect())
+        else:
+            report["actions"].extend(self._recycle(engine, workers, budget, pressure=False))
+            if usage < self.low_water and self.cache_budget_factor < 1.0:
+                previous = self.cache_budget_factor
+                self.cache_budget_factor = min(1.0, self.cache_budget_factor * 1.25)
+                report["actions"].append(
+                    _action("cache_budget", previous, self.cache_budget_factor)
+                )
+            report["actions"].extend(self._tune_gc(relaxed=usage < self.low_water))
+        return report
+
+    def _trim_cache(self, engine: Any) -> List[Dict[str, Any]]:
+        cache = getattr(engine, "cache", None)
+        if cache is None:
+            return []
+        previous = self.cache_budget_factor
+        self.cache_budget_factor = max(0.05, self.cache_budget_factor / 2)
+        actions = [_action("cache_budget", previous, self.cache_budget_factor)]
+        for task_type, stats in cache.get_stats().items():
+            if stats["capacity"] > 0:
+                capacity = stats["capacity"] // 2
+                cache.resize(task_type, capacity)
+                actions.append(
+                    _action("cache_trim", stats["capacity"], capacity, task_type=task_type)
+                )
+        return actions
+
+    @staticmethod
+    def _trim_history(engine: Any) -> List[Dict[str, Any]]:
+        actions = []
+        buffers = [
+            ("optimization_history", engine.optimizer.optimization_history),
+            ("resize_history", engine.processor.resize_history),
+        ]
+        for name, history in buffers:
+            if len(history) > HISTORY_LIMIT:
+                previous = len(history)
+                del history[:-HISTORY_LIMIT]
+                actions.append(_action("history_trim", previous, len(history), buffer=name))
+        return actions
+
+    def _recycle(
+        self, engine: Any, workers: Dict[int, Optional[int]], budget: int, pressure: bool
+    ) -> List[Dict[str, Any]]:
+        """Recycle the largest worker that outgrew its budget share, one per step."""
+        sizes = {pid: size for pid, size in workers.items() if size is not None}
+        if not sizes:
+            return []
+        share = budget / (len(sizes) + 1)
+        median = statistics.median(sizes.values())
+        bloated = [
+            pid for pid, size in sizes.items()
+            if size > share or (pressure and size > 1.5 * median)
+        ]
+        if not bloated:
+            return []
+        largest = max(bloated, key=lambda pid: sizes[pid])
+        if not engine.recycle_workers(pids=[largest], reason="memory"):
+            return []
+        self.stats["recycled"] += 1
+        return [_action("recycle_workers", sizes[largest], None, workers=[largest])]
+
+    def _collect(self) -> List[Dict[str, Any]]:
+        previous = gc.get_threshold()
+        gc.set_threshold(*self.default_gc_threshold)
+        gc.collect()
+        self.stats["gc_collections"] += 1
+        self._last_gc = None
+        return [_action("gc_collect", previous[0], self.default_gc_threshold[0])]
+
+    def _tune_gc(self, relaxed: bool) -> List[Dict[str, Any]]:
+        """Raise the gen-0 threshold in allocation-heavy phases, decay it otherwise."""
+        now = time.monotonic()
+        collections = gc.get_stats()[0]["collections"]
+        last, self._last_gc = self._last_gc, (now, collections)
+        if last is None or now <= last[0]:
+            return []
+
+        rate = (collections - last[1]) / (now - last[0])
+        threshold = list(gc.get_threshold())
+        default = self.default_gc_threshold[0]
+        if relaxed and rate > self.gc_rate:
+            target = min(_GC_THRESHOLD_CAP, threshold[0] * 2)
+        elif rate <= self.gc_rate and threshold[0] > default:
+            target = max(default, threshold[0] // 2)
+        else:
+            return []
+        if target == threshold[0]:
+            return []
+        previous = threshold[0]
+        threshold[0] = target
+        gc.set_threshold(*threshold)
+        return [_action("gc_threshold", previous, target, collections_per_second=rate)]
+
+    def restore(self) -> None:
+        """Restore the GC thresholds found at construction."""
+        gc.set_threshold(*self.default_gc_threshold)
+        self._last_gc = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get budget, cache share, GC thresholds and action counts."""
+        return {
+            **self.stats,
+            "budget": self.budget,
+            "cache_budget_factor": self.cache_budget_factor,
+            "gc_threshold": gc.get_threshold(),
+            "psutil": psutil is not None,
+        }
+
+
+def _action(action: str, previous: Any, value: Any, **details: Any) -> Dict[str, Any]:
+    """Build an optimization_history record of one memory action."""
+    return {
+        "timestamp": time.time(),
+        "action": action,
+        "knob": "memory",
+        "from": previous,
+        "to": value,
+        **details,
+    }
@@ -4,13 +4,33 @@ Provides automatic performance tuning and optimization
 """
 
 import logging
-from typing import Any, Dict, Optional
-from dataclasses import dataclass, field
+import threading
+from typing import Any, Callable, Dict, List, Optional
+from dataclasses import asdict, dataclass, field
 import time
+from uhip.core.caching import CACHE_SIZE_LADDER, plan_cache_sizes
+from uhip.core.changepoint import KIND_REGRESSION, RegressionMonitor
+from uhip.core.experiments import (
+    EXPERIMENT_KNOBS,
+    VERDICT_PROMOTE,
+    Experiment,
+)
+from uhip.core.memory import MemoryController
+from uhip.core.profiles import ProfileStore, WorkloadFingerprint, WorkloadTracker
+from uhip.core.tuning import KNOB_CHUNK_SIZE, KNOB_WORKERS, ParallelismTuner
 
 
 logger = logging.getLogger(__name__)
 
+# Sampled references a task type needs before its cache is resized
+MIN_CACHE_REFERENCES = 32
+
+# Minimum seconds between analyses woken by metric-change events
+MIN_EVENT_INTERVAL = 1.0
+
+# Setting changes that a regression starting soon after them is blamed on
+_REVERTIBLE_ACTIONS = ("trial", "keep", "promote", "load_profile")
+
 
 @dataclass
 class OptimizationProfile:
@@ -29,18 +49,43 @@ class SelfOptimizer:
     Analyzes performance metrics and adjusts system parameters automatically.
     """
 
-    def __init__(self, config: Any):
+    def __init__(self, config: Any, engine: Any = None):
         """
         Initialize the Self-Optimizer.
         
         Args:
             config: Configuration object containing optimization settings
+            engine: Optional HybridEngine whose processor and metrics are
+                   tuned; without one the optimizer only analyzes metrics
         """
         self.config = config
-        self.profile = OptimizationProfile()
+        self.engine = engine
+        self.profile = OptimizationProfile(
+            optimization_interval=getattr(config, "optimization_interval", 100)
+        )
+        self.tuner = ParallelismTuner()
+        budget_mb = getattr(config, "memory_budget_mb", 0)
+        self.memory = MemoryController(budget=int(budget_mb * 1024 * 1024) if budget_mb else None)
+        self.workload = WorkloadTracker()
+        profile_dir = getattr(config, "profile_dir", "")
+        self.profiles = ProfileStore(profile_dir) if profile_dir else None
+        self.fingerprint: Optional[WorkloadFingerprint] = None
+        self._revalidate = False
+        self.regressions = RegressionMonitor(on_regression=self._on_regression)
+        self._unhandled_regressions: List[Dict[str, Any]] = []
+        self.experiment: Optional[Experiment] = None
+        self.experiment_history: List[Dict[str, Any]] = []
+        self._retired_shadows: list = []
         self.optimization_history: list = []
         self.last_optimization: Optional[float] = None
+        self.last_analysis: Optional[Dict[str, Any]] = None
         self.initialized = False
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._metrics_source: Optional[Callable[[], Dict[str, Any]]] = None
+        self.loop_stats = {"cycles": 0, "events": 0, "optimizations": 0}
         
         logger.info("Self-Optimizer initialized")
 
@@ -66,7 +111,7 @@ class SelfOptimizer:
         """
         logger.info("Analyzing performance metrics")
         
-        analysis = {
+        analysis: Dict[str, Any] = {
             "timestamp": time.time(),
             "metrics_analyzed": len(metrics),
             "suggestions": [],
@@ -86,9 +131,119 @@ class SelfOptimizer:
                 })
                 analysis["status"] = "needs_attention"
         
+        # Request counters and pool busy time feed the throughput detectors; report
+        # every shift detected (per request or per window) since the last analysis
+        busy_time, workers = None, 1
+        if self.engine is not None:
+            pools = self.engine.processor.get_stats()["pools"].values()
+            busy_time = sum(pool["busy_time"] for pool in pools)
+            workers = sum(pool["max_workers"] for pool in pools)
+        now = time.monotonic()
+        for task_type, task_metrics in metrics.items():
+            if "count" in task_metrics:
+                self.regressions.observe_counts(
+                    task_type, task_metrics["count"], busy_time, workers, now=now
+                )
+        analysis["changepoints"] = self.regressions.drain()
+        for event in analysis["changepoints"]:
+            if event["kind"] != KIND_REGRESSION:
+                continue
+            analysis["suggestions"].append({
+                "type": event["task_type"],
+                "issue": f"{event['metric']}_regression",
+                "onset": event["onset"],
+                "ratio": event["ratio"],
+                "recommendation": "Revert recent setting changes or inspect the handler"
+            })
+            analysis["status"] = "needs_attention"
+        
         logger.info(f"Analysis complete: {analysis['status']}")
         return analysis
 
+    def _on_regression(self, event: Dict[str, Any]) -> None:
+        """Queue a regression for the next cycle and wake the background thread."""
+        self._unhandled_regressions.append(event)
+        self.notify()
+
+    def start(self, metrics_source: Callable[[], Dict[str, Any]]) -> None:
+        """
+        Start the background optimization thread.
+        
+        The thread sleeps until the optimization interval elapses or
+        notify() signals a metric change, then analyzes a fresh metrics
+        snapshot and optimizes when the interval is due or the analysis of
+        an event needs attention. Request threads only pay for notify() and
+        the O(1) latency changepoint update.
+        
+        Args:
+            metrics_source: Callable returning a snapshot of the per-task-type
+                           metrics; it is called on the optimizer thread
+        """
+        if self._thread is not None:
+            return
+        self._metrics_source = metrics_source
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run_loop, name="uhip-optimizer", daemon=True
+        )
+        self._thread.start()
+        logger.info("Background optimization started")
+
+    def notify(self) -> None:
+        """Signal a metric-change event, waking the background thread early."""
+        if not self._wake.is_set():
+            self._wake.set()
+
+    def stop(self) -> None:
+        """Stop the background optimization thread."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+        logger.info("Background optimization stopped")
+
+    def _run_loop(self) -> None:
+        while not self._stop.is_set():
+            remaining = float(self.profile.optimization_interval)
+            if self.last_optimization:
+                remaining -= time.time() - self.last_optimization
+            event = self._wake.wait(max(0.0, remaining))
+            if self._stop.is_set():
+                break
+            self._wake.clear()
+            try:
+                self.run_cycle(event=event)
+            except Exception as e:
+                logger.error(f"Background optimization failed: {e}")
+            if event:
+                # Debounce bursts of events into one analysis per interval
+                self._stop.wait(MIN_EVENT_INTERVAL)
+
+    def run_cycle(self, event: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Analyze the current metrics and optimize if due.
+        
+        Args:
+            event: Whether a metric-change event triggered the cycle; an
+                  event whose analysis needs attention optimizes before the
+                  interval has elapsed
+        
+        Returns:
+            Optimization results, or None if no optimization ran
+        """
+        self.loop_stats["cycles"] += 1
+        if event:
+            self.loop_stats["events"] += 1
+        metrics = self._metrics_source() if self._metrics_source is not None else {}
+        self.last_analysis = self.analyze_metrics(metrics)
+        urgent = event and self.last_analysis["status"] != "healthy"
+        if not (urgent or self.should_optimize()):
+            return None
+        self.loop_stats["optimizations"] += 1
+        return self.optimize()
+
     def optimize(self) -> Dict[str, Any]:
         """
         Perform optimization based on current metrics.
@@ -96,29 +251,59 @@ class SelfOptimizer:
         Returns:
             Optimization results
         """
+        # Manual and background cycles must not tune concurrently
+        with self._lock:
+            return self._optimize()
+
+    def _optimize(self) -> Dict[str, Any]:
         logger.info("Executing optimization cycle")
         
         current_time = time.time()
-        optimization_result = {
+        optimization_result: Dict[str, Any] = {
             "timestamp": current_time,
             "duration": 0.0,
             "actions": [],
+            "changes": [],
             "status": "completed",
         }
         
         start_time = time.time()
         
         try:
-            # Simulate optimization actions
-            self._optimize_memory()
+            memory_report = self._optimize_memory()
+            optimization_result["memory"] = memory_report
+            optimization_result["changes"].extend(memory_report.get("actions", []))
             optimization_result["actions"].append("memory_optimization")
             
-            self._optimize_cache()
+            cache_report = self._optimize_cache()
+            optimization_result["cache"] = cache_report
+            optimization_result["changes"].extend(
+                {
+                    "timestamp": current_time,
+                    "action": "resize",
+                    "knob": "cache_size",
+                    "task_type": task_type,
+                    "from": report["previous"],
+                    "to": report["capacity"],
+                }
+                for task_type, report in cache_report.items()
+                if report["capacity"] != report["previous"]
+            )
             optimization_result["actions"].append("cache_optimization")
             
-            self._optimize_parallelism()
+            optimization_result["changes"].extend(self._act_on_regressions())
+            optimization_result["actions"].append("regression_response")
+            
+            optimization_result["changes"].extend(self._evaluate_experiment())
+            optimization_result["actions"].append("experiment_evaluation")
+            
+            optimization_result["changes"].extend(self._optimize_parallelism())
             optimization_result["actions"].append("parallelism_optimization")
             
+            optimization_result["changes"].extend(self._optimize_profile())
+            optimization_result["fingerprint"] = self.fingerprint.key if self.fingerprint else None
+            optimization_result["actions"].append("profile_selection")
+            
             optimization_result["duration"] = time.time() - start_time
             self.last_optimization = current_time
             
@@ -137,23 +322,375 @@ class SelfOptimizer:
         
         return optimization_result
 
-    def _optimize_memory(self) -> None:
-        """Optimize memory usage."""
+    def _optimize_memory(self) -> Dict[str, Any]:
+        """
+        Keep engine and worker memory within the configured budget.
+        
+        Runs before cache sizing so a cache share cut under memory pressure
+        applies to the same cycle's plan.
+        
+        Returns:
+            Memory report: engine, worker and cache bytes, budget, pressure
+            flag and the actions taken
+        """
         logger.debug("Optimizing memory usage")
-        # Placeholder for memory optimization logic
-        pass
+        if self.engine is None:
+            return {}
+        return self.memory.step(self.engine)
 
-    def _optimize_cache(self) -> None:
-        """Optimize cache settings."""
+    def _optimize_cache(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Resize the engine's result cache per task type within the memory budget.
+        
+        Miss-ratio curves come from the cache's sampled reuse distances; the
+        budget is split where the curves promise the most hits per byte.
+        
+        Returns:
+            Task type -> new and previous capacity, predicted hit rates at
+            both, and the hit rate observed since the previous cycle
+        """
         logger.debug("Optimizing cache")
-        # Placeholder for cache optimization logic
-        pass
+        cache = getattr(self.engine, "cache", None)
+        if cache is None:
+            return {}
+        
+        sampled = cache.sampler.get_stats()
+        task_types = [
+            task_type for task_type, stats in sampled.items()
+            if stats["references"] >= MIN_CACHE_REFERENCES
+        ]
+        if not task_types:
+            return {}
+        
+        stats = cache.get_stats()
+        current = {task_type: stats[task_type]["capacity"] for task_type in task_types}
+        curves = {}
+        for task_type in task_types:
+            sizes = sorted(set(CACHE_SIZE_LADDER) | {current[task_type]})
+            curves[task_type] = cache.sampler.miss_ratio_curve(task_type, sizes)
+        lookups = {t: float(stats[t]["hits"] + stats[t]["misses"]) for t in task_types}
+        entry_bytes = {task_type: cache.entry_bytes(task_type) for task_type in task_types}
+        budget = self.config.cache_memory_budget_mb * 1024 * 1024 * self.memory.cache_budget_factor
+        plan = plan_cache_sizes(
+            {t: {size: curves[t][size] for size in CACHE_SIZE_LADDER} for t in task_types},
+            lookups,
+            entry_bytes,
+            budget,
+        )
+        
+        report = {}
+        for task_type in task_types:
+            capacity = plan[task_type]
+            observed = cache.observe_window(task_type)
+            previous = cache.resize(task_type, capacity)
+            report[task_type] = {
+                "capacity": capacity,
+                "previous": previous,
+                "predicted_hit_rate": 1.0 - curves[task_type][capacity],
+                "predicted_hit_rate_previous": 1.0 - curves[task_type][previous],
+                "observed_hit_rate": observed,
+                "entry_bytes": entry_bytes[task_type],
+            }
+        logger.info(f"Cache capacities: { {t: r['capacity'] for t, r in report.items()} }")
+        return report
 
-    def _optimize_parallelism(self) -> None:
-        """Optimize parallel processing parameters."""
+    def _optimize_parallelism(self) -> List[Dict[str, Any]]:
+        """
+        Take one hill-climbing step over worker count, chunk size and mode.
+        
+        Returns:
+            Setting changes applied (trials, kept trials and rollbacks)
+        """
         logger.debug("Optimizing parallelism")
-        # Placeholder for parallelism optimization logic
-        pass
+        if self.engine is None or not getattr(self.config, "tune_parallelism", True):
+            return []
+        processor = self.engine.processor
+        # Trials would change the control arm of a running experiment
+        if not processor.initialized or self.experiment is not None:
+            return []
+        return self.tuner.step(processor, self.engine.performance_metrics)
+
+    def start_experiment(
+        self,
+        knob: str,
+        value: Any,
+        fraction: Optional[float] = None,
+        alpha: Optional[float] = None,
+        **options: Any,
+    ) -> Experiment:
+        """
+        Start routing part of the traffic to a candidate configuration.
+        
+        Optimization cycles test the collected samples and promote the
+        candidate to the live processor or reject it.
+        
+        Args:
+            knob: Setting to change ("workers" or "chunk_size")
+            value: Candidate value
+            fraction: Share of traffic for the candidate; defaults to
+                     config.experiment_fraction
+            alpha: Significance level; defaults to config.experiment_alpha
+            **options: Further Experiment arguments (min_samples, max_samples, ...)
+        
+        Returns:
+            The running experiment
+        
+        Raises:
+            RuntimeError: If no engine is attached or an experiment is running
+            ValueError: If the knob is not supported, or is chunk_size while
+                       work stealing is off and the chunk size has no effect
+        """
+        if self.engine is None:
+            raise RuntimeError("Experiments need an attached engine")
+        if self.experiment is not None:
+            raise RuntimeError("An experiment is already running")
+        if knob not in EXPERIMENT_KNOBS:
+            raise ValueError(f"Unsupported experiment knob: {knob}")
+        processor = self.engine.processor
+        if knob == KNOB_CHUNK_SIZE and not processor.work_stealing:
+            raise ValueError("chunk_size experiments need work stealing enabled")
+        
+        if fraction is None:
+            fraction = getattr(self.config, "experiment_fraction", 0.1)
+        if alpha is None:
+            alpha = getattr(self.config, "experiment_alpha", 0.05)
+        baseline = processor.max_workers if knob == KNOB_WORKERS else processor.steal_chunk_size
+        experiment = Experiment(knob, baseline, value, fraction=fraction, alpha=alpha, **options)
+        experiment.shadow = self.engine.create_shadow_processor(**{EXPERIMENT_KNOBS[knob]: value})
+        self.experiment = experiment
+        logger.info(
+            f"Experiment started: {knob}={value} (live {baseline}) on "
+            f"{experiment.fraction:.0%} of traffic"
+        )
+        return experiment
+
+    def stop_experiment(self) -> None:
+        """Abandon the running experiment and shut down shadow processors."""
+        experiment, self.experiment = self.experiment, None
+        if experiment is not None:
+            self._retired_shadows.append(experiment.shadow)
+        for shadow in self._retired_shadows:
+            shadow.shutdown()
+        self._retired_shadows = []
+
+    def _act_on_regressions(self) -> List[Dict[str, Any]]:
+        """
+        Revert the setting change a regression most likely came from.
+        
+        The suspect is the latest tuner, experiment or profile change made
+        before the earliest regression onset and at most two optimization
+        intervals before it.
+        
+        Returns:
+            The revert record, if a change was reverted
+        """
+        pending, self._unhandled_regressions = self._unhandled_regressions, []
+        if not pending or self.engine is None:
+            return []
+        
+        onset = min(event["onset"] for event in pending)
+        horizon = onset - 2 * self.profile.optimization_interval
+        suspect = None
+        for result in reversed(self.optimization_history[-10:]):
+            for change in result.get("changes", []):
+                if (
+                    change.get("action") in _REVERTIBLE_ACTIONS
+                    and horizon <= change["timestamp"] <= onset
+                    and (suspect is None or change["timestamp"] > suspect["timestamp"])
+                ):
+                    suspect = change
+        if suspect is None or not self.tuner.revert(self.engine.processor, suspect):
+            return []
+        
+        logger.warning(
+            f"Reverted {suspect['knob']} from {suspect['to']} to {suspect['from']} "
+            f"after {len(pending)} regression(s)"
+        )
+        return [{
+            "timestamp": time.time(),
+            "action": "revert",
+            "knob": suspect["knob"],
+            "from": suspect["to"],
+            "to": suspect["from"],
+            "reason": "regression",
+            "regressions": pending,
+        }]
+
+    def _evaluate_experiment(self) -> List[Dict[str, Any]]:
+        """
+        Test the running experiment and act on its verdict.
+        
+        Returns:
+            The promotion or rejection record, if a verdict was reached
+        """
+        # Shadows retired last cycle have no routed calls left in flight
+        for shadow in self._retired_shadows:
+            shadow.shutdown()
+        self._retired_shadows = []
+        
+        experiment = self.experiment
+        if experiment is None:
+            return []
+        verdict = experiment.evaluate()
+        result = experiment.result
+        if verdict is None or result is None:
+            return []
+        
+        self.experiment = None
+        self._retired_shadows.append(experiment.shadow)
+        if verdict == VERDICT_PROMOTE:
+            processor = self.engine.processor
+            if experiment.knob == KNOB_WORKERS:
+                processor.resize(experiment.candidate, reason="experiment")
+            else:
+                processor.steal_chunk_size = experiment.candidate
+            # The tuner measures the promoted setting afresh
+            self.tuner.reset()
+        
+        record = {
+            "timestamp": time.time(),
+            "action": verdict,
+            "knob": experiment.knob,
+            "from": experiment.baseline,
+            "to": experiment.candidate,
+            "latency": result["latency"],
+            "throughput": result["throughput"],
+        }
+        self.experiment_history.append(record)
+        logger.info(f"Experiment {experiment.knob}={experiment.candidate}: {verdict}")
+        return [record]
+
+    def _optimize_profile(self) -> List[Dict[str, Any]]:
+        """
+        Fingerprint the workload; load the best known profile on a shift.
+        
+        While the fingerprint is unchanged and no tuning trial is running,
+        the current profile and settings are persisted for it.
+        
+        Returns:
+            Setting changes applied from a loaded profile
+        """
+        logger.debug("Selecting optimization profile")
+        fingerprint = self.workload.fingerprint()
+        if fingerprint is None:
+            return []
+        
+        if fingerprint != self.fingerprint:
+            previous, self.fingerprint = self.fingerprint, fingerprint
+            logger.info(f"Workload fingerprint changed to {fingerprint.key}")
+            changes = [{
+                "timestamp": time.time(),
+                "action": "shift",
+                "knob": "fingerprint",
+                "from": previous.key if previous else None,
+                "to": fingerprint.key,
+            }]
+            record = self.profiles.best_match(fingerprint) if self.profiles else None
+            if record is not None:
+                changes.extend(self._apply_record(record) or [])
+            return changes
+        
+        if self.profiles is not None and self.tuner.trial is None:
+            measured = self.tuner.baseline is not None
+            score = self.tuner.baseline["throughput"] if self.tuner.baseline else 0.0
+            # The first measurement of loaded settings replaces their stored score
+            replace = self._revalidate and measured
+            if self.profiles.save(
+                fingerprint, asdict(self.profile), self._settings(), score, replace=replace
+            ):
+                logger.debug(f"Saved profile for workload {fingerprint.key}")
+            if measured:
+                self._revalidate = False
+        return []
+
+    def restore_profile(self) -> List[Dict[str, Any]]:
+        """
+        Load the most recently saved profile before traffic is fingerprinted.
+        
+        Returns:
+            Setting changes applied
+        """
+        if self.profiles is None:
+            return []
+        record = self.profiles.latest()
+        if record is None:
+            return []
+        with self._lock:
+            changes = self._apply_record(record)
+            if changes is not None:
+                self.fingerprint = WorkloadFingerprint.from_dict(record["fingerprint"])
+            return changes or []
+
+    def _settings(self) -> Dict[str, Any]:
+        """Get the engine settings worth persisting with a profile."""
+        if self.engine is None:
+            return {}
+        processor = self.engine.processor
+        settings: Dict[str, Any] = {
+            "max_workers": processor.max_workers,
+            "steal_chunk_size": processor.steal_chunk_size,
+            "default_pool": processor.default_pool,
+        }
+        cache = getattr(self.engine, "cache", None)
+        if cache is not None:
+            settings["cache_capacity"] = {
+                task_type: stats["capacity"] for task_type, stats in cache.get_stats().items()
+            }
+        return settings
+
+    def _apply_record(self, record: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Apply a stored profile and its settings; the tuner restarts from them.
+        
+        Returns:
+            Setting changes applied, or None if the record's profile is invalid
+        """
+        try:
+            profile = OptimizationProfile(**record["profile"])
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Skipping invalid stored profile: {e}")
+            return None
+        self.update_profile(profile)
+        changes: List[Dict[str, Any]] = []
+        
+        def change(knob: str, previous: Any, value: Any, **details: Any) -> None:
+            changes.append({
+                "timestamp": time.time(),
+                "action": "load_profile",
+                "knob": knob,
+                "from": previous,
+                "to": value,
+                **details,
+            })
+        
+        settings = record.get("settings", {})
+        if self.engine is not None:
+            processor = self.engine.processor
+            workers = settings.get("max_workers")
+            if workers and workers != processor.max_workers:
+                previous = processor.max_workers
+                change("workers", previous, processor.resize(workers, reason="profile"))
+            chunk_size = settings.get("steal_chunk_size")
+            if chunk_size != processor.steal_chunk_size:
+                change("chunk_size", processor.steal_chunk_size, chunk_size)
+                processor.steal_chunk_size = chunk_size
+            pool = settings.get("default_pool")
+            if pool != processor.default_pool and (pool is None or processor.has_pool(pool)):
+                change("mode", processor.default_pool, pool)
+                processor.default_pool = pool
+            cache = getattr(self.engine, "cache", None)
+            if cache is not None:
+                for task_type, capacity in settings.get("cache_capacity", {}).items():
+                    previous = cache.resize(task_type, capacity)
+                    if previous != capacity:
+                        change("cache_size", previous, capacity, task_type=task_type)
+        
+        self.tuner.reset()
+        self._revalidate = True
+        logger.info(
+            f"Loaded optimization profile '{self.profile.name}' with {len(changes)} changes"
+        )
+        return changes
 
     def should_optimize(self) -> bool:
         """
@@ -168,6 +705,10 @@ class SelfOptimizer:
         time_since_last = time.time() - self.last_optimization
         return time_since_last >= self.profile.optimization_interval
 
+    def get_loop_stats(self) -> Dict[str, Any]:
+        """Get background cycle, event and optimization counts."""
+        return {**self.loop_stats, "running": self._thread is not None}
+
     def get_optimization_history(self) -> list:
         """Get the history of optimization runs."""
         return self.optimization_history.copy()
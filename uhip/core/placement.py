@@ -0,0 +1,139 @@
+"""
+CPU Placement for UHIP
+Pins process workers to cores or NUMA nodes on Linux
+"""
+
+import glob
+import logging
+import os
+import re
+from typing import Any, Dict, List, Set
+
+logger = logging.getLogger(__name__)
+
+PLACEMENT_NONE = "none"
+PLACEMENT_CORE = "core"
+PLACEMENT_NODE = "node"
+PLACEMENTS = (PLACEMENT_NONE, PLACEMENT_CORE, PLACEMENT_NODE)
+
+_NODE_ROOT = "/sys/devices/system/node"
+
+
+def affinity_supported() -> bool:
+    """Check whether the platform supports os.sched_setaffinity."""
+    return hasattr(os, "sched_setaffinity") and hasattr(os, "sched_getaffinity")
+
+
+def parse_cpulist(text: str) -> Set[int]:
+    """Parse a kernel CPU list such as "0-3,8,10-11"."""
+    cpus: Set[int] = set()
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        if "-" in part:
+            low, high = part.split("-", 1)
+            cpus.update(range(int(low), int(high) + 1))
+        else:
+            cpus.add(int(part))
+    return cpus
+
+
+def numa_topology(root: str = _NODE_ROOT) -> Dict[int, List[int]]:
+    """
+    Get the CPUs of each NUMA node that this process may run on.
+
+    Args:
+        root: sysfs directory listing the NUMA nodes
+
+    Returns:
+        NUMA node -> sorted CPU ids. Machines without NUMA information
+        (or without affinity support) are reported as a single node 0.
+    """
+    if not affinity_supported():
+        return {0: list(range(os.cpu_count() or 1))}
+
+    allowed = os.sched_getaffinity(0)
+    topology: Dict[int, List[int]] = {}
+    for path in glob.glob(os.path.join(root, "node[0-9]*", "cpulist")):
+        match = re.search(r"node(\d+)", path)
+        try:
+            with open(path) as f:
+                cpus = parse_cpulist(f.read()) & allowed
+        except (OSError, ValueError):
+            continue
+        if match and cpus:
+            topology[int(match.group(1))] = sorted(cpus)
+
+    if not topology:
+        topology = {0: sorted(allowed)}
+    return topology
+
+
+def plan_placement(policy: str, workers: int, topology: Dict[int, List[int]]) -> List[List[int]]:
+    """
+    Assign a CPU set to each worker slot.
+
+    Workers are kept on one NUMA node whenever that node has enough CPUs for
+    all of them, preferring the largest node; only larger pools spill over
+    to further nodes.
+
+    Args:
+        policy: "core" (one CPU per worker) or "node" (all CPUs of a node)
+        workers: Number of worker slots
+        topology: NUMA node -> CPU ids, as from numa_topology()
+
+    Returns:
+        One CPU list per worker slot; empty for the "none" policy
+    """
+    if policy not in PLACEMENTS:
+        raise ValueError(f"Unknown placement '{policy}', expected one of {PLACEMENTS}")
+    if policy == PLACEMENT_NONE or workers < 1 or not topology:
+        return []
+
+    nodes = sorted(topology, key=lambda node: (-len(topology[node]), node))
+    fitting = [node for node in nodes if len(topology[node]) >= workers]
+    if fitting:
+        # Smallest node that still fits everything, to leave big nodes free
+        nodes = [min(fitting, key=lambda node: (len(topology[node]), node))]
+
+    if policy == PLACEMENT_NODE:
+        plan: List[List[int]] = []
+        capacity = [(node, len(topology[node])) for node in nodes]
+        for node, size in capacity:
+            plan.extend([list(topology[node])] * min(size, workers - len(plan)))
+        # More workers than CPUs: wrap around the chosen nodes
+        while len(plan) < workers:
+            plan.append(list(topology[nodes[len(plan) % len(nodes)]]))
+        return plan
+
+    cpus = [cpu for node in nodes for cpu in topology[node]]
+    return [[cpus[slot % len(cpus)]] for slot in range(workers)]
+
+
+def pin_worker(counter: Any, plan: List[List[int]]) -> None:
+    """
+    Pool worker initializer that pins the worker to its planned CPU set.
+
+    Module-level so it can be used as a process-pool initializer.
+
+    Args:
+        counter: Shared multiprocessing.Value handing out worker slots
+        plan: CPU set per worker slot, from plan_placement()
+    """
+    if not plan or not affinity_supported():
+        return
+    with counter.get_lock():
+        slot = counter.value
+        counter.value += 1
+    cpus = plan[slot % len(plan)]
+    try:
+        os.sched_setaffinity(0, cpus)
+    except OSError as e:
+        logger.warning(f"Could not pin worker {os.getpid()} to CPUs {cpus}: {e}")
+
+
+def current_affinity() -> List[int]:
+    """Get the CPUs the calling process may run on."""
+    if not affinity_supported():
+        return []
+    return sorted(os.sched_getaffinity(0))
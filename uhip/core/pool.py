@@ -0,0 +1,468 @@
+"""
+Worker Pools for UHIP
+Thread and process pools that can grow and shrink while running, and
+CPU/wall-time profiling used to route tasks between them
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from concurrent.futures.thread import BrokenThreadPool
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+POOL_THREAD = "thread"
+POOL_PROCESS = "process"
+
+# Queue sentinels: a retire token stops one idle worker, shutdown stops all
+_RETIRE = object()
+_SHUTDOWN = object()
+
+
+def timed_call(func: Callable[..., Any], *args: Any) -> Tuple[Any, float, float]:
+    """
+    Run func(*args) and measure it from inside the worker.
+
+    Module-level so it can be submitted to process pools.
+
+    Returns:
+        Tuple of (result, cpu_seconds, wall_seconds)
+    """
+    cpu_start = time.thread_time()
+    wall_start = time.perf_counter()
+    result = func(*args)
+    return result, time.thread_time() - cpu_start, time.perf_counter() - wall_start
+
+
+def run_initializers(hooks: List[Tuple[Callable[..., None], Tuple[Any, ...]]]) -> None:
+    """
+    Pool worker initializer that runs several initializer hooks in order.
+
+    Args:
+        hooks: List of (initializer, initargs) pairs
+    """
+    for func, args in hooks:
+        func(*args)
+
+
+def warm_worker() -> Tuple[int, int, Tuple[int, ...]]:
+    """
+    No-op task used to pre-spawn pool workers.
+
+    Returns:
+        (process id, thread id, CPUs the worker may run on)
+    """
+    # Hold the worker briefly so concurrent warm-up tasks spread out
+    time.sleep(0.005)
+    cpus = tuple(sorted(os.sched_getaffinity(0))) if hasattr(os, "sched_getaffinity") else ()
+    return os.getpid(), threading.get_ident(), cpus
+
+
+class WorkloadProfiler:
+    """
+    Classifies task types as CPU-bound or I/O-bound from the ratio of CPU
+    time to wall time observed while they run, and picks a pool for them.
+
+    A task type is routed to the process pool once its smoothed CPU ratio
+    reaches cpu_threshold and back to threads when it drops below
+    io_threshold; the gap between the two prevents flapping.
+    """
+
+    def __init__(
+        self,
+        cpu_threshold: float = 0.5,
+        io_threshold: float = 0.3,
+        min_samples: int = 5,
+        alpha: float = 0.2,
+    ):
+        """
+        Initialize the profiler.
+
+        Args:
+            cpu_threshold: CPU/wall ratio at which a task type moves to processes
+            io_threshold: CPU/wall ratio below which it moves back to threads
+            min_samples: Samples required before leaving the default pool
+            alpha: EWMA smoothing factor for the CPU ratio
+        """
+        self.cpu_threshold = cpu_threshold
+        self.io_threshold = io_threshold
+        self.min_samples = min_samples
+        self.alpha = alpha
+        self._lock = threading.Lock()
+        self._profiles: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, task_type: str, cpu_time: float, wall_time: float) -> None:
+        """Record one measured execution of a task type."""
+        if wall_time <= 0:
+            return
+        ratio = min(1.0, cpu_time / wall_time)
+        with self._lock:
+            profile = self._profiles.get(task_type)
+            if profile is None:
+                profile = {"samples": 0, "cpu_ratio": ratio, "pool": POOL_THREAD}
+                self._profiles[task_type] = profile
+            profile["samples"] += 1
+            profile["cpu_ratio"] += self.alpha * (ratio - profile["cpu_ratio"])
+
+            if profile["samples"] >= self.min_samples:
+                if profile["cpu_ratio"] >= self.cpu_threshold:
+                    profile["pool"] = POOL_PROCESS
+                elif profile["cpu_ratio"] < self.io_threshold:
+                    profile["pool"] = POOL_THREAD
+
+    def choose(self, task_type: str) -> str:
+        """Get the pool a task type should run on."""
+        profile = self._profiles.get(task_type)
+        return profile["pool"] if profile is not None else POOL_THREAD
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get the profile of every observed task type."""
+        with self._lock:
+            return {task_type: dict(profile) for task_type, profile in self._profiles.items()}
+
+
+class ResizableThreadPool(Executor):
+    """
+    Thread pool whose worker count can be changed at runtime.
+
+    Growing starts new threads immediately. Shrinking queues retire tokens
+    that are picked up by idle workers only, so running tasks are never
+    interrupted and no queued work is dropped. As in ThreadPoolExecutor, a
+    failing initializer breaks the pool: pending work fails with
+    BrokenThreadPool, and so does every later submit() or resize().
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        initializer: Optional[Callable[..., None]] = None,
+        initargs: Tuple[Any, ...] = (),
+        thread_name_prefix: str = "uhip-worker",
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            max_workers: Initial number of worker threads
+            initializer: Optional callable run once in each worker thread
+            initargs: Arguments passed to the initializer
+            thread_name_prefix: Prefix for worker thread names
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        self.initializer = initializer
+        self.initargs = initargs
+        self.thread_name_prefix = thread_name_prefix
+
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._threads: Set[threading.Thread] = set()
+        self._target = 0
+        self._counter = 0
+        self._shutdown = False
+        self._broken: Optional[str] = None
+
+        self.resize(max_workers)
+
+    @property
+    def size(self) -> int:
+        """Target number of worker threads."""
+        return self._target
+
+    def resize(self, max_workers: int) -> None:
+        """
+        Change the number of worker threads.
+
+        Args:
+            max_workers: New number of workers (at least 1)
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        with self._lock:
+            if self._broken:
+                raise BrokenThreadPool(self._broken)
+            if self._shutdown:
+                raise RuntimeError("Cannot resize a pool after shutdown")
+
+            delta = max_workers - self._target
+            self._target = max_workers
+
+            for _ in range(delta):
+                self._counter += 1
+                thread = threading.Thread(
+                    target=self._worker,
+                    name=f"{self.thread_name_prefix}-{self._counter}",
+                    daemon=True,
+                )
+                self._threads.add(thread)
+                thread.start()
+
+            for _ in range(-delta):
+                self._queue.put(_RETIRE)
+
+        if delta:
+            logger.debug(f"Thread pool resized to {max_workers} workers")
+
+    def submit(self, __fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Schedule fn(*args, **kwargs) and return a Future."""
+        fn = __fn
+        future: Future = Future()
+        with self._lock:
+            if self._broken:
+                raise BrokenThreadPool(self._broken)
+            if self._shutdown:
+                raise RuntimeError("Cannot schedule new tasks after shutdown")
+            self._queue.put((future, fn, args, kwargs))
+        return future
+
+    def _worker(self) -> None:
+        """Worker loop: run tasks until retired or shut down."""
+        try:
+            if self.initializer is not None:
+                try:
+                    self.initializer(*self.initargs)
+                except BaseException:
+                    logger.exception("Worker initializer failed")
+                    self._initializer_failed()
+                    return
+
+            while True:
+                work = self._queue.get()
+                if work is _RETIRE:
+                    return
+                if work is _SHUTDOWN:
+                    # Leave the sentinel for the next worker
+                    self._queue.put(_SHUTDOWN)
+                    return
+
+                future, fn, args, kwargs = work
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+                del work, future, fn, args, kwargs
+        finally:
+            with self._lock:
+                self._threads.discard(threading.current_thread())
+
+    def _initializer_failed(self) -> None:
+        """Mark the pool broken, fail pending work and stop the other workers."""
+        with self._lock:
+            self._broken = "A worker initializer failed; the pool is not usable anymore"
+            while True:
+                try:
+                    work = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(work, tuple):
+                    future = work[0]
+                    if future.set_running_or_notify_cancel():
+                        future.set_exception(BrokenThreadPool(self._broken))
+            self._queue.put(_SHUTDOWN)
+
+    def live_threads(self) -> int:
+        """Number of worker threads currently alive, including retiring ones."""
+        with self._lock:
+            return len(self._threads)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """
+        Stop the pool once queued work has run.
+
+        Args:
+            wait: If True, block until every worker has exited
+            cancel_futures: If True, cancel work that has not started yet
+        """
+        with self._lock:
+            self._shutdown = True
+            threads = list(self._threads)
+
+        if cancel_futures:
+            while True:
+                try:
+                    work = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(work, tuple):
+                    work[0].cancel()
+
+        self._queue.put(_SHUTDOWN)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+
+class _ProcessWorker:
+    """One worker process: a single-process executor and its tasks in flight."""
+
+    __slots__ = ("executor", "in_flight")
+
+    def __init__(self, executor: ProcessPoolExecutor):
+        self.executor = executor
+        self.in_flight = 0
+
+    @property
+    def pid(self) -> Optional[int]:
+        """Process id, or None until the process has been started."""
+        processes: Dict[int, Any] = getattr(self.executor, "_processes", None) or {}
+        for pid, process in list(processes.items()):
+            if process.is_alive():
+                return pid
+        return None
+
+
+class ResizableProcessPool(Executor):
+    """
+    Process pool whose workers can be added, retired and replaced one at a time.
+
+    A ProcessPoolExecutor cannot change its size or retire a single worker,
+    so each worker is a single-process executor of its own. Growing starts
+    new workers and leaves the running ones (and their warm state) alone;
+    shrinking retires the least busy workers and replacing a worker starts
+    a fresh process in its place. Retired and replaced workers finish their
+    in-flight tasks before they exit. Tasks go to the worker with the fewest
+    tasks in flight; a worker whose process died is replaced on the next
+    submit instead of breaking the whole pool.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        initializer: Optional[Callable[..., None]] = None,
+        initargs: Tuple[Any, ...] = (),
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            max_workers: Initial number of worker processes
+            initializer: Optional callable run once in each worker process
+            initargs: Arguments passed to the initializer
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        self.initializer = initializer
+        self.initargs = initargs
+        self._lock = threading.Lock()
+        self._workers: List[_ProcessWorker] = []
+        self._shutdown = False
+
+        self.resize(max_workers)
+
+    @property
+    def size(self) -> int:
+        """Number of worker processes."""
+        return len(self._workers)
+
+    def _spawn(self) -> _ProcessWorker:
+        return _ProcessWorker(ProcessPoolExecutor(
+            max_workers=1, initializer=self.initializer, initargs=self.initargs
+        ))
+
+    def resize(self, max_workers: int) -> None:
+        """
+        Change the number of worker processes.
+
+        Args:
+            max_workers: New number of workers (at least 1)
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("Cannot resize a pool after shutdown")
+            while len(self._workers) < max_workers:
+                self._workers.append(self._spawn())
+            retired = []
+            while len(self._workers) > max_workers:
+                worker = min(self._workers, key=lambda w: w.in_flight)
+                self._workers.remove(worker)
+                retired.append(worker)
+
+        for worker in retired:
+            worker.executor.shutdown(wait=False)
+        logger.debug(f"Process pool resized to {max_workers} workers")
+
+    def replace(self, pid: int) -> bool:
+        """
+        Replace one worker process with a fresh one.
+
+        Args:
+            pid: Process id of the worker to replace
+
+        Returns:
+            True if a worker with that pid was replaced
+        """
+        with self._lock:
+            if self._shutdown:
+                return False
+            for index, worker in enumerate(self._workers):
+                if worker.pid == pid:
+                    self._workers[index] = self._spawn()
+                    break
+            else:
+                return False
+
+        worker.executor.shutdown(wait=False)
+        return True
+
+    def pids(self) -> List[int]:
+        """Process ids of the live workers."""
+        with self._lock:
+            workers = list(self._workers)
+        return [pid for pid in (worker.pid for worker in workers) if pid is not None]
+
+    def submit(self, __fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Schedule fn(*args, **kwargs) on the least busy worker and return a Future."""
+        fn = __fn
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("Cannot schedule new tasks after shutdown")
+            worker = min(self._workers, key=lambda w: w.in_flight)
+            try:
+                future = worker.executor.submit(fn, *args, **kwargs)
+            except BrokenProcessPool:
+                logger.warning("Replacing a worker process that died")
+                self._workers[self._workers.index(worker)] = replacement = self._spawn()
+                worker.executor.shutdown(wait=False)
+                worker = replacement
+                future = worker.executor.submit(fn, *args, **kwargs)
+            worker.in_flight += 1
+        future.add_done_callback(lambda _: self._task_done(worker))
+        return future
+
+    def _task_done(self, worker: _ProcessWorker) -> None:
+        with self._lock:
+            worker.in_flight -= 1
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """
+        Stop every worker once its queued work has run.
+
+        Args:
+            wait: If True, block until every worker has exited
+            cancel_futures: If True, cancel work that has not started yet
+        """
+        with self._lock:
+            self._shutdown = True
+            workers = list(self._workers)
+
+        # A second shutdown() call would not wait, so each worker gets one
+        for worker in workers:
+            if cancel_futures:
+                worker.executor.shutdown(wait=wait, cancel_futures=True)
+            else:
+                worker.executor.shutdown(wait=wait)
@@ -3,56 +3,732 @@ Parallel Processor for UHIP
 Handles parallel and concurrent task execution
 """
 
+import heapq
+import itertools
 import logging
-from typing import Any, Callable, List, Optional
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
-from multiprocessing import cpu_count
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from concurrent.futures import (
+    FIRST_EXCEPTION,
+    CancelledError,
+    Future,
+    as_completed,
+    wait,
+)
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from functools import partial
+from multiprocessing import Value, cpu_count
+from uhip.core.exceptions import DeadlineExceeded
+from uhip.core.hedging import HEDGE_FAILURE, HEDGE_LOSS, HEDGE_WIN, HedgePolicy
+from uhip.core.placement import (
+    PLACEMENT_NONE,
+    PLACEMENTS,
+    affinity_supported,
+    numa_topology,
+    pin_worker,
+    plan_placement,
+)
+from uhip.core.pool import (
+    POOL_PROCESS,
+    POOL_THREAD,
+    ResizableProcessPool,
+    ResizableThreadPool,
+    WorkloadProfiler,
+    run_initializers,
+    timed_call,
+    warm_worker,
+)
+from uhip.core.scheduling import PRIORITY_CLASSES, ScheduledTask, TaskScheduler
+from uhip.core.reduction import combine_partials, reduce_chunk
+from uhip.core.recovery import BatchCheckpoint, BatchResult, ItemError, RetryPolicy
+from uhip.core.stealing import WorkStealingRun, run_chunk
+from uhip.core.transport import SharedMemoryArena, run_shared
+from uhip.core.transport import available as shared_memory_available
 
 
 logger = logging.getLogger(__name__)
 
 
+class _HedgedCall:
+    """
+    Bookkeeping for a task that may run twice: the primary attempt and, once
+    it straggles, a duplicate. The first successful attempt settles the task.
+    """
+
+    __slots__ = ("call", "lock", "primary", "duplicate", "pending", "settled", "error")
+
+    def __init__(self, call: Tuple[Any, ...]):
+        self.call = call
+        self.lock = threading.Lock()
+        self.primary: Optional[Future] = None
+        self.duplicate: Optional[Future] = None
+        self.pending = 1
+        self.settled = False
+        self.error: Optional[BaseException] = None
+
+
+class _PoolLane:
+    """
+    One executor together with its scheduler queue, dispatcher thread and
+    worker slots. A processor owns one lane per pool kind.
+    """
+
+    def __init__(
+        self,
+        processor: "ParallelProcessor",
+        kind: str,
+        max_workers: int,
+        min_workers: int,
+        max_workers_limit: int,
+    ):
+        self.processor = processor
+        self.kind = kind
+        self.max_workers = max_workers
+        self.min_workers = min_workers
+        self.max_workers_limit = max(max_workers, max_workers_limit)
+        self.executor: Any = None
+        self.scheduler = processor._create_scheduler()
+        self.slot_condition = threading.Condition()
+        self.resize_lock = threading.Lock()
+        self.active = 0
+        self.running = 0
+        self.completed = 0
+        self.busy_time = 0.0
+        self.utilization = 0.0
+        self.recycled = 0
+        self.dispatcher: Optional[threading.Thread] = None
+        self.worker_cpus: Dict[int, List[int]] = {}
+
+    def start(self) -> None:
+        """Create the executor and start dispatching."""
+        self.executor = self._create_executor()
+        self.scheduler = self.processor._create_scheduler()
+        self.dispatcher = threading.Thread(
+            target=self._dispatch_loop, name=f"uhip-dispatcher-{self.kind}", daemon=True
+        )
+        self.dispatcher.start()
+
+    def _create_executor(self) -> Any:
+        initializer, initargs = self.processor._worker_initializer(self.kind, self.max_workers)
+        if self.kind == POOL_PROCESS:
+            return ResizableProcessPool(
+                max_workers=self.max_workers,
+                initializer=initializer,
+                initargs=initargs,
+            )
+        return ResizableThreadPool(
+            max_workers=self.max_workers,
+            initializer=initializer,
+            initargs=initargs,
+        )
+
+    def prestart(self, timeout: Optional[float] = None) -> int:
+        """Run one warm-up task per worker; returns the workers that answered."""
+        with self.resize_lock:
+            futures = [self.executor.submit(warm_worker) for _ in range(self.max_workers)]
+        done, _ = wait(futures, timeout=timeout)
+        workers = {future.result() for future in done if future.exception() is None}
+        if self.kind == POOL_PROCESS:
+            self.worker_cpus = {pid: list(cpus) for pid, _, cpus in workers}
+        return len(workers)
+
+    def _dispatch_loop(self) -> None:
+        """Move tasks from the scheduler to the executor as workers free up."""
+        while True:
+            with self.slot_condition:
+                while self.active >= self.max_workers:
+                    self.slot_condition.wait()
+                self.active += 1
+            
+            task = self.scheduler.pop()
+            if task is None:
+                self._release_slot()
+                return
+            
+            if not task.future.set_running_or_notify_cancel():
+                self._release_slot()
+                continue
+            
+            if task.expired():
+                self.processor.record_timeout(task.task_type, "expired")
+                task.future.set_exception(
+                    DeadlineExceeded(f"Deadline passed before '{task.task_type}' task started")
+                )
+                self._release_slot()
+                continue
+            
+            arena = self.processor.arena if self.kind == POOL_PROCESS else None
+            shared: List[Any] = []
+            try:
+                if arena is not None:
+                    # Large arrays travel as shared-memory descriptors
+                    args, shared = arena.export_args(task.args)
+                    call: Tuple[Any, ...] = (run_shared, arena.threshold, task.func) + args
+                else:
+                    call = (task.func,) + tuple(task.args)
+                # Guard against a concurrent resize swapping the executor
+                with self.resize_lock:
+                    inner = self.executor.submit(timed_call, *call)
+            except Exception as e:
+                if arena is not None:
+                    arena.release(shared)
+                task.future.set_exception(e)
+                self._release_slot()
+                continue
+            with self.processor._stats_lock:
+                self.running += 1
+            
+            # Shared-memory results are owned by one attempt, so only
+            # arena-free calls are hedged
+            hedged = None
+            if task.hedge and self.processor.hedger is not None and arena is None:
+                hedged = _HedgedCall(call)
+                hedged.primary = inner
+                self.processor.hedger.count_task(task.task_type)
+            inner.add_done_callback(partial(self._complete, task, arena, shared, hedged, False))
+            if hedged is not None:
+                self.processor._watch_hedge(self, task, hedged)
+
+    def launch_hedge(self, task: ScheduledTask, hedged: _HedgedCall) -> None:
+        """Start a duplicate of a straggling task on an idle worker, if any."""
+        hedger = self.processor.hedger
+        assert hedger is not None
+        with hedged.lock:
+            if hedged.settled or hedged.duplicate is not None:
+                return
+            # The dispatcher always holds a slot while it waits for work, so
+            # idleness is judged by running tasks and an empty queue
+            with self.slot_condition:
+                idle = self.running < self.max_workers and not len(self.scheduler)
+                if idle:
+                    self.active += 1
+            if not idle:
+                hedger.skip(task.task_type)
+                return
+            if not hedger.admit(task.task_type):
+                self._release_slot()
+                return
+            try:
+                with self.resize_lock:
+                    duplicate = self.executor.submit(timed_call, *hedged.call)
+            except Exception as e:
+                logger.debug(f"Could not hedge '{task.task_type}' task: {e}")
+                self._release_slot()
+                return
+            hedged.duplicate = duplicate
+            hedged.pending += 1
+        with self.processor._stats_lock:
+            self.running += 1
+        duplicate.add_done_callback(partial(self._complete, task, None, [], hedged, True))
+
+    def _complete(
+        self,
+        task: ScheduledTask,
+        arena: Optional[SharedMemoryArena],
+        shared: List[Any],
+        hedged: Optional[_HedgedCall],
+        duplicate: bool,
+        inner: Future,
+    ) -> None:
+        """Copy the executor result onto the task future and free the slot."""
+        with self.processor._stats_lock:
+            self.running -= 1
+            self.completed += 1
+        self._release_slot()
+        if arena is not None:
+            arena.release(shared)
+        error = CancelledError() if inner.cancelled() else inner.exception()
+        
+        if hedged is not None:
+            with hedged.lock:
+                hedged.pending -= 1
+                if hedged.settled:
+                    # Lost the race; the winner already delivered
+                    return
+                if error is not None and hedged.pending:
+                    # The other attempt may still succeed
+                    hedged.error = error
+                    return
+                hedged.settled = True
+                other = hedged.primary if duplicate else hedged.duplicate
+            if other is not None:
+                # Queued losers are cancelled; running ones finish unobserved.
+                # Settling with an error means both attempts failed
+                other.cancel()
+                if error is not None:
+                    outcome = HEDGE_FAILURE
+                else:
+                    outcome = HEDGE_WIN if duplicate else HEDGE_LOSS
+                assert self.processor.hedger is not None
+                self.processor.hedger.record_outcome(task.task_type, outcome)
+        
+        if error is not None:
+            task.future.set_exception(error)
+            return
+        
+        result, cpu_time, wall_time = inner.result()
+        if arena is not None:
+            try:
+                result = arena.import_result(result)
+            except Exception as e:
+                task.future.set_exception(e)
+                return
+        with self.processor._stats_lock:
+            self.busy_time += wall_time
+        self.processor.profiler.record(task.task_type, cpu_time, wall_time)
+        if hedged is not None and self.processor.hedger is not None:
+            self.processor.hedger.record(task.task_type, wall_time)
+        task.future.set_result(result)
+
+    def _release_slot(self) -> None:
+        with self.slot_condition:
+            self.active -= 1
+            self.slot_condition.notify()
+
+    def resize(self, max_workers: int) -> Tuple[int, int]:
+        """Change the worker count; returns (previous, applied)."""
+        size = max(self.min_workers, min(self.max_workers_limit, int(max_workers)))
+        
+        with self.resize_lock:
+            previous = self.max_workers
+            if size == previous:
+                return previous, size
+            
+            if self.executor is not None:
+                # Running workers keep their state; only the difference
+                # is started or retired
+                self.executor.resize(size)
+            
+            with self.slot_condition:
+                self.max_workers = size
+                self.slot_condition.notify_all()
+        
+        return previous, size
+
+    def recycle(self, pids: Optional[List[int]] = None) -> int:
+        """
+        Replace process workers with fresh processes, one at a time.
+
+        Each replaced worker finishes its in-flight tasks in the background
+        while the others keep serving. Returns the number replaced.
+        """
+        with self.resize_lock:
+            if self.kind != POOL_PROCESS or self.executor is None:
+                return 0
+            replaced = 0
+            for pid in self.executor.pids() if pids is None else pids:
+                if self.executor.replace(pid):
+                    self.worker_cpus.pop(pid, None)
+                    replaced += 1
+            self.recycled += replaced
+        return replaced
+
+    def worker_pids(self) -> List[int]:
+        """Process ids of the current pool's live workers."""
+        if self.kind != POOL_PROCESS:
+            return []
+        return self.executor.pids() if self.executor is not None else []
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "min_workers": self.min_workers,
+            "max_workers_limit": self.max_workers_limit,
+            "running": self.running,
+            "completed": self.completed,
+            "busy_time": self.busy_time,
+            "utilization": self.utilization,
+            "recycled": self.recycled,
+            "queued": len(self.scheduler),
+            "queues": self.scheduler.get_stats(),
+            "admission": self.scheduler.get_admission_stats(),
+        }
+
+    def shutdown(self, wait: bool) -> None:
+        if not wait:
+            for task in self.scheduler.drain():
+                task.future.cancel()
+        self.scheduler.close()
+        if wait and self.dispatcher is not None:
+            self.dispatcher.join()
+        self.dispatcher = None
+        if self.executor is not None:
+            self.executor.shutdown(wait=wait)
+            self.executor = None
+
+
 class ParallelProcessor:
     """
     Parallel processing manager for UHIP.
-    Supports both thread-based and process-based parallelism.
+    Supports both thread-based and process-based parallelism, or both side
+    by side in hybrid mode.
+
+    Tasks are held in a scheduler queue and dispatched to the executor only
+    when a worker is free, so queue order (priority class, then weighted fair
+    share per task type, then earliest deadline) decides what runs next and
+    expired tasks are dropped before they start.
+
+    In hybrid mode a thread pool and a process pool run side by side, each
+    with its own queue. A task goes to the pool it asks for, or else to
+    default_pool when one is set (the parallelism tuner uses this), or else
+    to the pool suggested by its task type's measured CPU-time/wall-time
+    ratio.
     """
 
-    def __init__(self, max_workers: Optional[int] = None, use_processes: bool = False):
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        use_processes: bool = False,
+        initializer: Optional[Callable[..., None]] = None,
+        initargs: Tuple[Any, ...] = (),
+        priorities: Optional[Dict[str, str]] = None,
+        weights: Optional[Dict[str, float]] = None,
+        high_watermark: int = 0,
+        low_watermark: Optional[int] = None,
+        overload_policy: str = "block",
+        min_workers: Optional[int] = None,
+        max_workers_limit: Optional[int] = None,
+        autoscale: bool = False,
+        autoscale_interval: float = 1.0,
+        hybrid: bool = False,
+        secondary_workers: Optional[int] = None,
+        work_stealing: bool = False,
+        steal_chunk_size: Optional[int] = None,
+        shared_memory_threshold: int = 0,
+        placement: str = PLACEMENT_NONE,
+        hedge_budget: float = 0.0,
+    ):
         """
         Initialize the Parallel Processor.
         
         Args:
-            max_workers: Maximum number of worker threads/processes. 
+            max_workers: Maximum number of worker threads/processes.
                         If None, defaults to CPU count.
             use_processes: If True, use ProcessPoolExecutor instead of ThreadPoolExecutor.
+            initializer: Optional callable run once in each worker on startup.
+                        Must be picklable when use_processes is True.
+            initargs: Arguments passed to the initializer.
+            priorities: Task type -> priority class ("interactive", "normal",
+                       "bulk") used by the scheduler.
+            weights: Task type -> weighted fair-share within a priority class.
+            high_watermark: Queued-task count at which admission control
+                           starts; 0 leaves the queue unbounded.
+            low_watermark: Queued-task count at which normal admission resumes.
+            overload_policy: What to do with new tasks while saturated:
+                            "block", "reject" (EngineOverloaded) or "shed"
+                            (displace queued lower-priority tasks).
+            min_workers: Lower bound for resize() and autoscaling (default 1).
+            max_workers_limit: Upper bound for resize() and autoscaling
+                              (default max_workers).
+            autoscale: If True, a background thread resizes the pool from
+                      queue depth and utilization.
+            autoscale_interval: Seconds between autoscaling decisions.
+            hybrid: If True, also run a pool of the other kind (processes
+                   alongside threads, or threads alongside processes).
+            secondary_workers: Worker count of the additional hybrid pool.
+                              If None, defaults to CPU count.
+            work_stealing: If True, process_batch runs batches in chunks over
+                          per-worker deques with work stealing by default.
+            steal_chunk_size: Items per work-stealing chunk. If None, each
+                             worker starts with about eight chunks.
+            shared_memory_threshold: NumPy arrays of at least this many bytes
+                                    are passed to process workers through
+                                    shared memory instead of pickling;
+                                    0 disables the transport.
+            placement: CPU placement of process workers on Linux: "none",
+                      "core" (one core per worker) or "node" (workers share
+                      the cores of one NUMA node).
+            hedge_budget: Maximum duplicate executions as a fraction of
+                         hedgeable tasks. Tasks submitted with hedge=True
+                         that run past their task type's p95 are started a
+                         second time on an idle worker; 0 disables hedging.
         """
         self.max_workers = max_workers or cpu_count()
         self.use_processes = use_processes
-        self.executor = None
+        self.initializer = initializer
+        self.initargs = initargs
+        self.priorities = priorities
+        self.weights = weights
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self.overload_policy = overload_policy
+        self.min_workers = max(1, min_workers or 1)
+        self.max_workers_limit = max(self.max_workers, max_workers_limit or self.max_workers)
+        self.autoscale = autoscale
+        self.autoscale_interval = autoscale_interval
+        self.hybrid = hybrid
+        self.secondary_workers = secondary_workers or cpu_count()
+        self.work_stealing = work_stealing
+        self.steal_chunk_size = steal_chunk_size
+        self.shared_memory_threshold = shared_memory_threshold
+        if placement not in PLACEMENTS:
+            raise ValueError(f"Unknown placement '{placement}', expected one of {PLACEMENTS}")
+        self.placement = placement
+        self.placement_plan: List[List[int]] = []
+        self.topology: Optional[Dict[int, List[int]]] = None
+        if placement != PLACEMENT_NONE:
+            if affinity_supported():
+                self.topology = numa_topology()
+            else:
+                logger.info("CPU affinity not supported on this platform; placement disabled")
+        self.arena: Optional[SharedMemoryArena] = None
+        if shared_memory_threshold > 0 and (use_processes or hybrid):
+            if shared_memory_available():
+                self.arena = SharedMemoryArena(shared_memory_threshold)
+            else:
+                logger.debug("NumPy not installed; shared-memory transport disabled")
         self.initialized = False
         
+        self.primary_pool = POOL_PROCESS if use_processes else POOL_THREAD
+        self.default_pool: Optional[str] = None
+        self.profiler = WorkloadProfiler()
+        self._stats_lock = threading.Lock()
+        self.timeout_stats: Dict[str, Dict[str, int]] = {}
+        self._lanes = self._create_lanes()
+        self._autoscaler: Optional[threading.Thread] = None
+        self._autoscale_stop = threading.Event()
+        self.resize_history: List[Dict[str, Any]] = []
+        self.stealing_stats = {"batches": 0, "chunks": 0, "steals": 0, "stolen_chunks": 0}
+        self._init_hooks: List[Tuple[Callable[..., None], Tuple[Any, ...]]] = []
+        self.warm_workers: Dict[str, int] = {}
+        self.hedger = HedgePolicy(budget=hedge_budget) if hedge_budget > 0 else None
+        self._hedge_queue: List[Tuple[float, int, _PoolLane, ScheduledTask, _HedgedCall]] = []
+        self._hedge_condition = threading.Condition()
+        self._hedge_sequence = itertools.count()
+        self._hedge_stop = False
+        self._hedge_monitor: Optional[threading.Thread] = None
+        
         logger.info(
             f"Parallel Processor configured with {self.max_workers} workers "
-            f"(mode: {'processes' if use_processes else 'threads'})"
+            f"(mode: {'processes' if use_processes else 'threads'}"
+            f"{', hybrid' if hybrid else ''})"
         )
 
+    def _create_lanes(self) -> Dict[str, _PoolLane]:
+        lanes = {
+            self.primary_pool: _PoolLane(
+                self, self.primary_pool, self.max_workers, self.min_workers, self.max_workers_limit
+            )
+        }
+        if self.hybrid:
+            secondary = POOL_THREAD if self.use_processes else POOL_PROCESS
+            lanes[secondary] = _PoolLane(
+                self,
+                secondary,
+                self.secondary_workers,
+                self.min_workers,
+                max(self.secondary_workers, self.max_workers_limit),
+            )
+        return lanes
+
+    @property
+    def has_process_pool(self) -> bool:
+        """Whether any pool of this processor runs worker processes."""
+        return POOL_PROCESS in self._lanes
+
+    def _create_scheduler(self) -> TaskScheduler:
+        return TaskScheduler(
+            priorities=self.priorities,
+            weights=self.weights,
+            high_watermark=self.high_watermark,
+            low_watermark=self.low_watermark,
+            overload_policy=self.overload_policy,
+        )
+
+    def add_initializer(self, func: Callable[..., None], *args: Any) -> None:
+        """
+        Add a hook run once in every worker after the main initializer.
+        
+        Hooks must be registered before initialize(); with process pools the
+        hook and its arguments must be picklable. Adding the same function
+        again replaces its arguments.
+        
+        Args:
+            func: Initializer callable
+            *args: Arguments passed to func
+        """
+        if self.initialized:
+            raise RuntimeError("Initializer hooks must be added before initialize()")
+        self._init_hooks = [hook for hook in self._init_hooks if hook[0] is not func]
+        self._init_hooks.append((func, args))
+
+    def _worker_initializer(
+        self, kind: Optional[str] = None, workers: int = 0
+    ) -> Tuple[Optional[Callable[..., None]], Tuple[Any, ...]]:
+        """Combine placement, the initializer and hooks into one executor initializer."""
+        hooks = list(self._init_hooks)
+        if self.initializer is not None:
+            hooks.insert(0, (self.initializer, self.initargs))
+        if kind == POOL_PROCESS and self.topology is not None:
+            plan = plan_placement(self.placement, workers, self.topology)
+            self.placement_plan = plan
+            # Pin first so worker state is allocated on the local NUMA node
+            hooks.insert(0, (pin_worker, (Value("i", 0), plan)))
+        if not hooks:
+            return None, ()
+        if len(hooks) == 1:
+            return hooks[0]
+        return run_initializers, (hooks,)
+
+    def prestart(self, timeout: Optional[float] = None) -> Dict[str, int]:
+        """
+        Spawn every worker and run its initializers ahead of real work.
+        
+        Process pools otherwise start workers (and import handler modules)
+        lazily on the first submissions.
+        
+        Args:
+            timeout: Optional time budget in seconds per pool
+        
+        Returns:
+            Number of distinct workers that ran a warm-up task, per pool
+        """
+        if not self.initialized:
+            raise RuntimeError("Parallel Processor not initialized")
+        
+        for kind, lane in self._lanes.items():
+            self.warm_workers[kind] = lane.prestart(timeout)
+        logger.info(f"Pre-started workers: {self.warm_workers}")
+        return dict(self.warm_workers)
+
+    @property
+    def executor(self) -> Any:
+        """Executor of the primary pool."""
+        return self._lanes[self.primary_pool].executor
+
+    @property
+    def pools(self) -> List[str]:
+        """Pool kinds owned by this processor."""
+        return list(self._lanes)
+
+    def has_pool(self, pool: str) -> bool:
+        """Check whether the processor runs a pool of the given kind."""
+        return pool in self._lanes
+
     def initialize(self) -> None:
         """Initialize the executor."""
         if self.initialized:
             logger.warning("Parallel Processor already initialized")
             return
         
-        executor_class = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
-        self.executor = executor_class(max_workers=self.max_workers)
+        for lane in self._lanes.values():
+            lane.start()
+        if self.autoscale:
+            self._autoscale_stop.clear()
+            self._autoscaler = threading.Thread(
+                target=self._autoscale_loop, name="uhip-autoscaler", daemon=True
+            )
+            self._autoscaler.start()
+        if self.hedger is not None:
+            self._hedge_stop = False
+            self._hedge_monitor = threading.Thread(
+                target=self._hedge_loop, name="uhip-hedger", daemon=True
+            )
+            self._hedge_monitor.start()
         self.initialized = True
         logger.info("Parallel Processor initialized")
 
+    def _lane_for(self, task_type: str, pool: Optional[str]) -> _PoolLane:
+        """Pick the requested pool, else the default pool, else the profiled pool."""
+        if len(self._lanes) == 1:
+            return self._lanes[self.primary_pool]
+        if pool is None:
+            pool = self.default_pool or self.profiler.choose(task_type)
+        return self._lanes.get(pool, self._lanes[self.primary_pool])
+
+    def _watch_hedge(self, lane: _PoolLane, task: ScheduledTask, hedged: _HedgedCall) -> None:
+        """Schedule a hedge check once the task outlives its type's p95."""
+        assert self.hedger is not None
+        threshold = self.hedger.threshold(task.task_type)
+        if threshold is None:
+            return
+        with self._hedge_condition:
+            heapq.heappush(self._hedge_queue, (
+                time.monotonic() + threshold, next(self._hedge_sequence), lane, task, hedged
+            ))
+            self._hedge_condition.notify()
+
+    def _hedge_loop(self) -> None:
+        """Launch duplicates for tasks whose hedge check time has come."""
+        while True:
+            with self._hedge_condition:
+                while not self._hedge_stop:
+                    if not self._hedge_queue:
+                        self._hedge_condition.wait()
+                        continue
+                    delay = self._hedge_queue[0][0] - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._hedge_condition.wait(delay)
+                if self._hedge_stop:
+                    self._hedge_queue.clear()
+                    return
+                _, _, lane, task, hedged = heapq.heappop(self._hedge_queue)
+            try:
+                lane.launch_hedge(task, hedged)
+            except Exception as e:
+                logger.error(f"Hedging failed: {e}")
+
+    def submit(
+        self,
+        func: Callable[..., Any],
+        args: Tuple[Any, ...] = (),
+        task_type: str = "general",
+        deadline: Optional[float] = None,
+        priority: Optional[str] = None,
+        pool: Optional[str] = None,
+        hedge: bool = False,
+    ) -> Future:
+        """
+        Schedule a single call.
+        
+        Args:
+            func: Function to execute
+            args: Positional arguments for func
+            task_type: Task type, used for scheduling and statistics
+            deadline: Absolute time.monotonic() deadline. Tasks still queued
+                     when it passes are dropped with DeadlineExceeded.
+            priority: Optional priority class overriding the task type's class
+            pool: "thread" or "process" to choose the pool in hybrid mode;
+                 None routes by the task type's measured CPU profile
+            hedge: True if func is idempotent and may be run a second time
+                  when the first attempt straggles (needs hedge_budget)
+        
+        Returns:
+            Future representing the computation
+        
+        Raises:
+            EngineOverloaded: If admission control rejects the task
+        """
+        if not self.initialized:
+            raise RuntimeError("Parallel Processor not initialized")
+        
+        task = ScheduledTask(
+            func=func,
+            args=args,
+            future=Future(),
+            task_type=task_type,
+            deadline=deadline if deadline is not None else math.inf,
+            priority=priority,
+            hedge=hedge,
+        )
+        self._lane_for(task_type, pool).scheduler.push(task)
+        return task.future
+
     def process_batch(
-        self, 
-        items: List[Any], 
+        self,
+        items: List[Any],
         worker_func: Callable[[Any], Any],
-        ordered: bool = True
+        ordered: bool = True,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+        task_type: str = "general",
+        priority: Optional[str] = None,
+        pool: Optional[str] = None,
+        work_stealing: Optional[bool] = None,
+        hedge: bool = False,
     ) -> List[Any]:
         """
         Process a batch of items in parallel.
@@ -60,10 +736,25 @@ class ParallelProcessor:
         Args:
             items: List of items to process
             worker_func: Function to apply to each item
-            ordered: If True, maintain order of results matching input order
-            
+            ordered: Kept for compatibility; has no effect; results always
+                    match input order
+            timeout: Optional time budget in seconds for the whole batch
+            deadline: Optional absolute time.monotonic() deadline; the earlier
+                     of timeout and deadline applies
+            task_type: Task type, used for scheduling and statistics
+            priority: Optional priority class overriding the task type's class
+            pool: Optional pool for every item in hybrid mode
+            work_stealing: Run the batch in chunks with work stealing instead
+                          of one task per item; None uses the processor default
+            hedge: True if worker_func is idempotent, allowing straggling
+                  items to be hedged (not applied to work-stealing chunks)
+        
         Returns:
             List of processed results
+        
+        Raises:
+            DeadlineExceeded: If the batch does not finish before its deadline.
+                             Items that have not started are cancelled.
         """
         if not self.initialized:
             raise RuntimeError("Parallel Processor not initialized")
@@ -73,29 +764,440 @@ class ParallelProcessor:
         
         logger.info(f"Processing batch of {len(items)} items")
         
+        if timeout is not None:
+            budget = time.monotonic() + timeout
+            deadline = budget if deadline is None else min(deadline, budget)
+        
+        if work_stealing is None:
+            work_stealing = self.work_stealing
+        if work_stealing:
+            return self._process_batch_stealing(
+                items, worker_func, deadline, task_type, priority, pool
+            )
+        
+        futures: List[Future] = []
+        
         try:
-            if ordered:
-                # Maintain order using map
-                results = list(self.executor.map(worker_func, items))
-            else:
-                # Process as completed for potentially faster results
-                futures = {
-                    self.executor.submit(worker_func, item): i 
-                    for i, item in enumerate(items)
-                }
-                results = [None] * len(items)
-                
-                for future in as_completed(futures):
-                    idx = futures[future]
-                    results[idx] = future.result()
+            for item in items:
+                futures.append(self.submit(
+                    worker_func,
+                    (item,),
+                    task_type=task_type,
+                    deadline=deadline,
+                    priority=priority,
+                    pool=pool,
+                    hedge=hedge,
+                ))
+            
+            # Futures are positional, so results always match input order
+            results = self._collect(futures, deadline, task_type)
             
             logger.info(f"Batch processing completed: {len(results)} results")
             return results
-            
+        
         except Exception as e:
+            for future in futures:
+                future.cancel()
             logger.error(f"Error in batch processing: {e}")
             raise
 
+    def process_batch_partial(
+        self,
+        items: List[Any],
+        worker_func: Callable[[Any], Any],
+        retry: Optional[RetryPolicy] = None,
+        checkpoint: Optional[Any] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+        task_type: str = "general",
+        priority: Optional[str] = None,
+        pool: Optional[str] = None,
+        hedge: bool = False,
+    ) -> BatchResult:
+        """
+        Process a batch, keeping completed results when some items fail.
+        
+        Unlike process_batch, a failing item does not abort the batch: its
+        error is recorded and, if the retry policy allows, only the failed
+        subset is submitted again in the next round. With a checkpoint every
+        finished result is persisted as it arrives, and running the same
+        batch again with the same checkpoint skips the recorded items.
+        
+        Args:
+            items: List of items to process
+            worker_func: Function to apply to each item
+            retry: Retry policy for failed items; None runs each item once
+            checkpoint: BatchCheckpoint or file path for resumable progress.
+                       The file is deleted once every item has succeeded.
+            timeout: Optional time budget in seconds for the whole batch
+                    including retries
+            deadline: Optional absolute time.monotonic() deadline; the earlier
+                     of timeout and deadline applies
+            task_type: Task type, used for scheduling and statistics
+            priority: Optional priority class overriding the task type's class
+            pool: Optional pool for every item in hybrid mode
+            hedge: True if worker_func is idempotent, allowing straggling
+                  items to be hedged
+        
+        Returns:
+            BatchResult with results in input order and one ItemError per
+            item that failed its last attempt or missed the deadline
+        """
+        if not self.initialized:
+            raise RuntimeError("Parallel Processor not initialized")
+        
+        if timeout is not None:
+            budget = time.monotonic() + timeout
+            deadline = budget if deadline is None else min(deadline, budget)
+        
+        retry = retry or RetryPolicy(max_attempts=1)
+        if isinstance(checkpoint, str):
+            checkpoint = BatchCheckpoint(checkpoint)
+        
+        results: List[Any] = [None] * len(items)
+        errors: Dict[int, ItemError] = {}
+        pending = list(range(len(items)))
+        resumed = 0
+        if checkpoint is not None:
+            done = checkpoint.load(len(items))
+            for index, result in done.items():
+                results[index] = result
+            pending = [index for index in pending if index not in done]
+            resumed = len(done)
+        
+        attempt = 0
+        try:
+            while pending:
+                attempt += 1
+                logger.info(f"Batch attempt {attempt}: {len(pending)} items")
+                failed = self._run_partial_round(
+                    items, pending, worker_func, attempt, retry, checkpoint,
+                    results, errors, deadline, task_type, priority, pool, hedge,
+                )
+                pending = failed
+                if pending and deadline is not None and time.monotonic() >= deadline:
+                    # Out of time; the failed items keep their last error
+                    break
+                if pending:
+                    pause = retry.delay(attempt)
+                    if deadline is not None:
+                        pause = min(pause, max(0.0, deadline - time.monotonic()))
+                    if pause > 0:
+                        time.sleep(pause)
+        finally:
+            if checkpoint is not None:
+                if errors or pending:
+                    checkpoint.close()
+                else:
+                    checkpoint.clear()
+        
+        if errors:
+            logger.warning(
+                f"Batch finished with {len(errors)} of {len(items)} items failed "
+                f"after {attempt} attempts"
+            )
+        return BatchResult(
+            results=results,
+            errors=[errors[index] for index in sorted(errors)],
+            attempts=attempt,
+            resumed=resumed,
+        )
+
+    def _run_partial_round(
+        self,
+        items: List[Any],
+        indices: List[int],
+        worker_func: Callable[[Any], Any],
+        attempt: int,
+        retry: RetryPolicy,
+        checkpoint: Optional[BatchCheckpoint],
+        results: List[Any],
+        errors: Dict[int, ItemError],
+        deadline: Optional[float],
+        task_type: str,
+        priority: Optional[str],
+        pool: Optional[str],
+        hedge: bool,
+    ) -> List[int]:
+        """Run one attempt over the given items; returns the indices to retry."""
+        futures: Dict[Future, int] = {}
+        retry_indices: List[int] = []
+        
+        def fail(index: int, error: BaseException) -> None:
+            errors[index] = ItemError(
+                index, type(error).__name__, str(error), attempt, error
+            )
+        
+        for index in indices:
+            try:
+                future = self.submit(
+                    worker_func,
+                    (items[index],),
+                    task_type=task_type,
+                    deadline=deadline,
+                    priority=priority,
+                    pool=pool,
+                    hedge=hedge,
+                )
+            except Exception as e:
+                fail(index, e)
+                continue
+            futures[future] = index
+        
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        finished = set()
+        try:
+            for future in as_completed(futures, timeout=remaining):
+                finished.add(future)
+                index = futures[future]
+                error = future.exception()
+                if error is None:
+                    results[index] = future.result()
+                    errors.pop(index, None)
+                    if checkpoint is not None:
+                        checkpoint.record(index, results[index])
+                    continue
+                fail(index, error)
+                if retry.should_retry(error, attempt):
+                    retry_indices.append(index)
+        except FuturesTimeoutError:
+            stragglers = [future for future in futures if future not in finished]
+            self._cancel_stragglers(stragglers, task_type)
+            for future in stragglers:
+                fail(futures[future], DeadlineExceeded("Batch deadline exceeded"))
+            return []
+        
+        return retry_indices
+
+    def _collect(
+        self, futures: List[Future], deadline: Optional[float], task_type: str
+    ) -> List[Any]:
+        """
+        Wait for all futures and return their results in order.
+        
+        Raises the first task error, or DeadlineExceeded after cancelling the
+        tasks that have not started when the deadline passes.
+        """
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        done, not_done = wait(futures, timeout=remaining, return_when=FIRST_EXCEPTION)
+        
+        for future in done:
+            exc = future.exception()
+            if exc is not None:
+                raise exc
+        
+        if not_done:
+            self._cancel_stragglers(not_done, task_type)
+            raise DeadlineExceeded(
+                f"Batch deadline exceeded with {len(not_done)} of {len(futures)} "
+                f"items unfinished"
+            )
+        
+        return [future.result() for future in futures]
+
+    def process_reduce(
+        self,
+        items: List[Any],
+        map_fn: Callable[[Any], Any],
+        combine_fn: Callable[[Any, Any], Any],
+        init: Any,
+        chunk_size: Optional[int] = None,
+        fan_in: int = 2,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+        task_type: str = "general",
+        priority: Optional[str] = None,
+        pool: Optional[str] = None,
+    ) -> Any:
+        """
+        Map items in parallel and reduce the results without collecting them.
+        
+        Each worker folds a chunk of items into one partial result, then the
+        partials are combined level by level in a tree of parallel tasks, so
+        only one value per chunk is ever held and the combine phase takes
+        log(chunks) rounds. Order is preserved, so combine_fn must be
+        associative but need not be commutative.
+        
+        Args:
+            items: Items to map
+            map_fn: Function applied to each item
+            combine_fn: Associative function merging two values
+            init: Identity value of combine_fn; it seeds every chunk and is
+                 returned for an empty input
+            chunk_size: Items per worker chunk. If None, each worker gets
+                       about four chunks.
+            fan_in: Number of partial results merged per combine task
+            timeout: Optional time budget in seconds for the whole reduction
+            deadline: Optional absolute time.monotonic() deadline; the earlier
+                     of timeout and deadline applies
+            task_type: Task type, used for scheduling and statistics
+            priority: Optional priority class overriding the task type's class
+            pool: Optional pool for all tasks in hybrid mode
+        
+        Returns:
+            The reduced value
+        
+        Raises:
+            DeadlineExceeded: If the reduction does not finish before its deadline
+        """
+        if not self.initialized:
+            raise RuntimeError("Parallel Processor not initialized")
+        
+        if fan_in < 2:
+            raise ValueError("fan_in must be at least 2")
+        
+        if not items:
+            return init
+        
+        if timeout is not None:
+            budget = time.monotonic() + timeout
+            deadline = budget if deadline is None else min(deadline, budget)
+        
+        lane = self._lane_for(task_type, pool)
+        size = chunk_size or max(1, math.ceil(len(items) / (lane.max_workers * 4)))
+        submit = partial(
+            self.submit,
+            task_type=task_type,
+            deadline=deadline,
+            priority=priority,
+            pool=lane.kind,
+        )
+        futures: List[Future] = []
+        
+        try:
+            for start in range(0, len(items), size):
+                futures.append(submit(
+                    reduce_chunk, (map_fn, combine_fn, init, items[start:start + size])
+                ))
+            partials = self._collect(futures, deadline, task_type)
+            rounds = 0
+            
+            while len(partials) > 1:
+                futures = [
+                    submit(combine_partials, (combine_fn, partials[i:i + fan_in]))
+                    for i in range(0, len(partials), fan_in)
+                ]
+                partials = self._collect(futures, deadline, task_type)
+                rounds += 1
+            
+            logger.info(
+                f"Reduced {len(items)} items in chunks of {size} "
+                f"with {rounds} combine rounds"
+            )
+            return partials[0]
+        
+        except Exception as e:
+            for future in futures:
+                future.cancel()
+            logger.error(f"Error in reduction: {e}")
+            raise
+
+    def _process_batch_stealing(
+        self,
+        items: List[Any],
+        worker_func: Callable[[Any], Any],
+        deadline: Optional[float],
+        task_type: str,
+        priority: Optional[str],
+        pool: Optional[str],
+    ) -> List[Any]:
+        """
+        Process a batch as chunks over per-worker deques with work stealing.
+        
+        One driver thread per pool worker keeps exactly one chunk in flight,
+        so every worker stays busy and a driver that runs out of work steals
+        the back half of the fullest deque instead of idling.
+        """
+        lane = self._lane_for(task_type, pool)
+        run = WorkStealingRun(items, lane.max_workers, self.steal_chunk_size)
+        results: List[Any] = [None] * len(items)
+        errors: List[BaseException] = []
+        stop = threading.Event()
+        
+        def drive(worker: int) -> None:
+            while not stop.is_set():
+                chunk = run.next_chunk(worker)
+                if chunk is None:
+                    return
+                start, chunk_items = chunk
+                try:
+                    future = self.submit(
+                        run_chunk,
+                        (worker_func, chunk_items),
+                        task_type=task_type,
+                        deadline=deadline,
+                        priority=priority,
+                        pool=lane.kind,
+                    )
+                except Exception as e:
+                    errors.append(e)
+                    stop.set()
+                    return
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                done, _ = wait([future], timeout=remaining)
+                if not done:
+                    self._cancel_stragglers([future], task_type)
+                    stop.set()
+                    return
+                exc = future.exception()
+                if exc is not None:
+                    errors.append(exc)
+                    stop.set()
+                    return
+                results[start:start + len(chunk_items)] = future.result()
+        
+        drivers = [
+            threading.Thread(target=drive, args=(i,), name=f"uhip-steal-{i}", daemon=True)
+            for i in range(run.workers)
+        ]
+        for driver in drivers:
+            driver.start()
+        for driver in drivers:
+            driver.join()
+        
+        with self._stats_lock:
+            self.stealing_stats["batches"] += 1
+            self.stealing_stats["chunks"] += run.chunks
+            self.stealing_stats["steals"] += run.steals
+            self.stealing_stats["stolen_chunks"] += run.stolen_chunks
+        
+        if errors:
+            logger.error(f"Error in batch processing: {errors[0]}")
+            raise errors[0]
+        if stop.is_set():
+            raise DeadlineExceeded(
+                f"Batch deadline exceeded with {run.pending()} of {run.chunks} "
+                f"chunks not started"
+            )
+        
+        logger.info(
+            f"Batch processing completed: {len(results)} results "
+            f"({run.chunks} chunks, {run.steals} steals)"
+        )
+        return results
+
+    def _cancel_stragglers(self, futures: Any, task_type: str) -> None:
+        """Cancel queued tasks and count running ones that are abandoned."""
+        for future in futures:
+            if future.cancel():
+                self.record_timeout(task_type, "cancelled")
+            elif not future.done():
+                self.record_timeout(task_type, "abandoned")
+
+    def record_timeout(self, task_type: str, kind: str) -> None:
+        """
+        Count a deadline miss.
+        
+        Args:
+            task_type: Task type that missed its deadline
+            kind: "expired" (dropped before start), "cancelled" (queued task
+                 cancelled), "abandoned" (still running when the caller gave
+                 up) or "timed_out" (caller-side wait expired)
+        """
+        with self._stats_lock:
+            stats = self.timeout_stats.setdefault(task_type, {})
+            stats[kind] = stats.get(kind, 0) + 1
+
     def process_parallel(
         self,
         func: Callable,
@@ -109,23 +1211,220 @@ class ParallelProcessor:
             func: Function to execute
             *args: Positional arguments for func
             **kwargs: Keyword arguments for func
-            
+        
         Returns:
             Future object representing the computation
         """
         if not self.initialized:
             raise RuntimeError("Parallel Processor not initialized")
         
-        return self.executor.submit(func, *args, **kwargs)
+        if kwargs:
+            func = partial(func, **kwargs)
+        return self.submit(func, args)
+
+    def resize(self, max_workers: int, reason: str = "manual", pool: Optional[str] = None) -> int:
+        """
+        Change the number of workers without dropping work.
+        
+        Both pool kinds are resized in place and running workers keep their
+        warm state. Thread pools grow immediately and retire idle threads
+        when shrinking. Process pools start only the missing worker
+        processes when growing and retire the least busy ones when
+        shrinking; a retired process finishes its in-flight tasks before it
+        exits.
+        
+        Args:
+            max_workers: Requested worker count, clamped to
+                        [min_workers, max_workers_limit]
+            reason: Short label recorded in resize_history
+            pool: Pool to resize in hybrid mode; defaults to the primary pool
+        
+        Returns:
+            The worker count actually applied
+        """
+        kind = pool or self.primary_pool
+        if kind not in self._lanes:
+            raise ValueError(f"Processor has no {kind} pool")
+        
+        previous, size = self._lanes[kind].resize(max_workers)
+        if size == previous:
+            return size
+        
+        if kind == self.primary_pool:
+            self.max_workers = size
+        with self._stats_lock:
+            self.resize_history.append({
+                "timestamp": time.time(),
+                "pool": kind,
+                "from": previous,
+                "to": size,
+                "reason": reason,
+            })
+        
+        logger.info(
+            f"Parallel Processor {kind} pool resized from {previous} to {size} "
+            f"workers ({reason})"
+        )
+        return size
+
+    def worker_pids(self) -> Dict[str, List[int]]:
+        """
+        Get the process ids of the live process-pool workers.
+        
+        Returns:
+            Pool kind -> worker pids (empty for thread pools)
+        """
+        return {kind: lane.worker_pids() for kind, lane in self._lanes.items()}
+
+    def recycle_workers(
+        self,
+        reason: str = "manual",
+        pool: str = POOL_PROCESS,
+        pids: Optional[List[int]] = None,
+    ) -> bool:
+        """
+        Replace process-pool workers with fresh processes.
+        
+        Releases memory held by bloated workers without changing the worker
+        count. Workers are replaced one at a time, so the others keep their
+        warm state and keep serving; a replaced worker finishes its
+        in-flight tasks before it exits.
+        
+        Args:
+            reason: Short label recorded in resize_history
+            pool: Pool to recycle
+            pids: Workers to replace (default: every worker)
+        
+        Returns:
+            True if any worker was replaced, False if none was (e.g. the pool
+            is not a running process pool)
+        """
+        lane = self._lanes.get(pool)
+        if lane is None:
+            return False
+        replaced = lane.recycle(pids)
+        if not replaced:
+            return False
+        
+        with self._stats_lock:
+            self.resize_history.append({
+                "timestamp": time.time(),
+                "pool": pool,
+                "from": lane.max_workers,
+                "to": lane.max_workers,
+                "reason": reason,
+                "recycled": replaced,
+            })
+        
+        logger.info(f"Parallel Processor recycled {replaced} {pool} workers ({reason})")
+        return True
+
+    def evaluate_scaling(self) -> int:
+        """
+        Make one autoscaling decision per pool from queue depth and utilization.
+        
+        Grows when work is queued and workers are busy, shrinks by one
+        worker at a time when the queue is empty and the pool is mostly idle.
+        
+        Returns:
+            The primary pool's worker count after the decision
+        """
+        for kind, lane in self._lanes.items():
+            size = lane.max_workers
+            utilization = lane.running / size if size else 0.0
+            # Smooth instantaneous samples so one idle tick does not shrink the pool
+            lane.utilization = 0.5 * lane.utilization + 0.5 * utilization
+            queued = len(lane.scheduler)
+            
+            if queued and lane.utilization >= 0.75 and size < lane.max_workers_limit:
+                step = min(queued, max(1, size // 2))
+                self.resize(size + step, reason="autoscale_up", pool=kind)
+            elif not queued and lane.utilization < 0.5 and size > lane.min_workers:
+                self.resize(size - 1, reason="autoscale_down", pool=kind)
+        
+        return self.max_workers
+
+    def _autoscale_loop(self) -> None:
+        while not self._autoscale_stop.wait(self.autoscale_interval):
+            try:
+                self.evaluate_scaling()
+            except Exception as e:
+                logger.error(f"Autoscaling failed: {e}")
 
     def get_stats(self) -> dict:
         """Get processor statistics."""
+        with self._stats_lock:
+            timeouts = {
+                task_type: dict(stats) for task_type, stats in self.timeout_stats.items()
+            }
+        pools = {kind: lane.get_stats() for kind, lane in self._lanes.items()}
         return {
             "max_workers": self.max_workers,
+            "min_workers": self.min_workers,
+            "max_workers_limit": self.max_workers_limit,
+            "utilization": pools[self.primary_pool]["utilization"],
             "use_processes": self.use_processes,
+            "hybrid": self.hybrid,
+            "default_pool": self.default_pool,
             "initialized": self.initialized,
+            "running": sum(stats["running"] for stats in pools.values()),
+            "queued": sum(stats["queued"] for stats in pools.values()),
+            "queues": self._merge_queue_stats(pools),
+            "admission": self._merge_admission_stats(pools),
+            "timeouts": timeouts,
+            "pools": pools,
+            "profiles": self.profiler.get_stats(),
+            "work_stealing": dict(self.stealing_stats),
+            "warm_workers": dict(self.warm_workers),
+            "shared_memory": self.arena.get_stats() if self.arena is not None else None,
+            "placement": self._placement_stats(),
+            "hedging": self.hedger.get_stats() if self.hedger is not None else None,
         }
 
+    def _placement_stats(self) -> Dict[str, Any]:
+        """Describe the CPU placement policy, plan and observed worker CPUs."""
+        lane = self._lanes.get(POOL_PROCESS)
+        return {
+            "policy": self.placement,
+            "applied": self.topology is not None and lane is not None,
+            "nodes": dict(self.topology or {}),
+            "plan": [list(cpus) for cpus in self.placement_plan],
+            "workers": dict(lane.worker_cpus) if lane is not None else {},
+        }
+
+    @staticmethod
+    def _merge_queue_stats(pools: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Combine per-pool queue statistics by priority class."""
+        merged = {}
+        for priority in PRIORITY_CLASSES:
+            classes = [stats["queues"][priority] for stats in pools.values()]
+            dispatched = sum(c["dispatched"] for c in classes)
+            merged[priority] = {
+                "depth": sum(c["depth"] for c in classes),
+                "dispatched": dispatched,
+                "avg_wait": (
+                    sum(c["avg_wait"] * c["dispatched"] for c in classes) / dispatched
+                    if dispatched else 0.0
+                ),
+                "max_wait": max(c["max_wait"] for c in classes),
+            }
+        return merged
+
+    @staticmethod
+    def _merge_admission_stats(pools: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine per-pool admission statistics."""
+        lanes = [stats["admission"] for stats in pools.values()]
+        merged: Dict[str, Any] = dict(lanes[0])
+        merged["saturated"] = any(a["saturated"] for a in lanes)
+        merged["blocked"] = sum(a["blocked"] for a in lanes)
+        for kind in ("rejected", "shed"):
+            counts: Dict[str, int] = {}
+            for admission in lanes:
+                for task_type, count in admission[kind].items():
+                    counts[task_type] = counts.get(task_type, 0) + count
+            merged[kind] = counts
+        return merged
+
     def shutdown(self, wait: bool = True) -> None:
         """
         Shutdown the processor.
@@ -133,9 +1432,21 @@ class ParallelProcessor:
         Args:
             wait: If True, wait for all tasks to complete before shutdown
         """
-        if self.executor:
+        if self.initialized:
             logger.info("Shutting down Parallel Processor")
-            self.executor.shutdown(wait=wait)
-            self.executor = None
+            self._autoscale_stop.set()
+            if self._autoscaler is not None:
+                self._autoscaler.join()
+                self._autoscaler = None
+            if self._hedge_monitor is not None:
+                with self._hedge_condition:
+                    self._hedge_stop = True
+                    self._hedge_condition.notify()
+                self._hedge_monitor.join()
+                self._hedge_monitor = None
+            for lane in self._lanes.values():
+                lane.shutdown(wait)
+            if self.arena is not None:
+                self.arena.close()
             self.initialized = False
             logger.info("Parallel Processor shutdown complete")
@@ -0,0 +1,315 @@
+"""
+Workload Profiles for UHIP
+Workload fingerprinting and on-disk persistence of tuned optimization profiles
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Requests a window needs before it is fingerprinted
+MIN_FINGERPRINT_REQUESTS = 50
+
+# Largest fingerprint distance at which a stored profile is still reused
+MAX_PROFILE_DISTANCE = 0.5
+
+# A stored score loses half its weight per day, so stale scores age out
+SCORE_HALF_LIFE = 24 * 3600.0
+
+# Relative margin a new score needs over the (aged) stored score
+SCORE_MARGIN = 0.05
+
+_SIZE_SAMPLE_EVERY = 16
+_MIX_RESOLUTION = 10  # Task-type shares are rounded to tenths
+_BUCKET_WEIGHT = 0.25
+_BUCKET_HYSTERESIS = 0.25  # Fraction of a bucket a value must move past its current one
+
+
+def _log2_bucket(value: float, previous: Optional[int]) -> int:
+    """
+    Log2 bucket of a value that sticks to the previous bucket near its edges.
+
+    A value hovering around a power of two would otherwise alternate
+    between two buckets from one window to the next.
+    """
+    level = math.log2(max(1.0, value))
+    if previous is None:
+        return int(level)
+    if previous - _BUCKET_HYSTERESIS <= level < previous + 1 + _BUCKET_HYSTERESIS:
+        return previous
+    return int(level)
+
+
+def payload_size(data: Any) -> int:
+    """Estimate the size of a request payload in bytes."""
+    nbytes = getattr(data, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    if isinstance(data, (bytes, bytearray, str)):
+        return len(data)
+    return sys.getsizeof(data)
+
+
+@dataclass(frozen=True)
+class WorkloadFingerprint:
+    """
+    Coarse description of a workload.
+
+    Task-type shares are rounded to tenths (types under 5% are dropped);
+    payload size and arrival rate are log2 buckets with hysteresis, so
+    workloads that differ only by noise map to the same fingerprint.
+    """
+
+    mix: Tuple[Tuple[str, float], ...]
+    size_bucket: int
+    rate_bucket: int
+
+    @property
+    def key(self) -> str:
+        """Stable identifier used as the profile file name."""
+        canonical = json.dumps(self.to_dict(), sort_keys=True)
+        return hashlib.sha1(canonical.encode()).hexdigest()[:16]
+
+    def distance(self, other: "WorkloadFingerprint") -> float:
+        """
+        Distance between two fingerprints.
+
+        L1 distance of the task-type mixes (0 to 2) plus a quarter per
+        log2 bucket of payload size and arrival rate.
+        """
+        mine, theirs = dict(self.mix), dict(other.mix)
+        mix = sum(abs(mine.get(t, 0.0) - theirs.get(t, 0.0)) for t in set(mine) | set(theirs))
+        buckets = abs(self.size_bucket - other.size_bucket)
+        buckets += abs(self.rate_bucket - other.rate_bucket)
+        return mix + _BUCKET_WEIGHT * buckets
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "mix": [list(pair) for pair in self.mix],
+            "size_bucket": self.size_bucket,
+            "rate_bucket": self.rate_bucket,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WorkloadFingerprint":
+        return cls(
+            mix=tuple((task_type, float(share)) for task_type, share in data["mix"]),
+            size_bucket=int(data["size_bucket"]),
+            rate_bucket=int(data["rate_bucket"]),
+        )
+
+
+class WorkloadTracker:
+    """
+    Counts requests per task type and samples payload sizes.
+
+    Recording is an unlocked dict increment plus, for every 16th request,
+    one size estimate, so concurrent requests may be undercounted slightly;
+    fingerprint() summarizes the window since the previous fingerprint and
+    starts a new one.
+    """
+
+    def __init__(self, min_requests: int = MIN_FINGERPRINT_REQUESTS):
+        """
+        Initialize the tracker.
+
+        Args:
+            min_requests: Requests a window needs before it is fingerprinted
+        """
+        self.min_requests = min_requests
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {}
+        self._sizes: List[int] = []
+        self._seen = 0
+        self._window_start = time.monotonic()
+        self._size_bucket: Optional[int] = None
+        self._rate_bucket: Optional[int] = None
+
+    def record(self, task_type: str, data: Any, count: int = 1) -> None:
+        """
+        Record requests of a task type.
+
+        Args:
+            task_type: Task type of the requests
+            data: A representative payload (the request, or one batch item)
+            count: Number of requests, e.g. a batch's item count
+        """
+        self._counts[task_type] = self._counts.get(task_type, 0) + count
+        self._seen += 1
+        if self._seen % _SIZE_SAMPLE_EVERY == 1:
+            self._sizes.append(payload_size(data))
+
+    def fingerprint(self) -> Optional[WorkloadFingerprint]:
+        """
+        Fingerprint the current window and start a new one.
+
+        Returns:
+            The window's fingerprint, or None while it has fewer than
+            min_requests requests (the window keeps accumulating)
+        """
+        with self._lock:
+            counts = dict(self._counts)
+            total = sum(counts.values())
+            elapsed = time.monotonic() - self._window_start
+            if total < self.min_requests or elapsed <= 0:
+                return None
+            sizes = sorted(self._sizes)
+            self._counts.clear()
+            self._sizes = []
+            self._window_start = time.monotonic()
+
+        mix = []
+        for task_type, count in sorted(counts.items()):
+            share = round(count / total * _MIX_RESOLUTION) / _MIX_RESOLUTION
+            if share > 0:
+                mix.append((task_type, share))
+        median = sizes[len(sizes) // 2] if sizes else 1
+        self._size_bucket = _log2_bucket(median, self._size_bucket)
+        self._rate_bucket = _log2_bucket(total / elapsed, self._rate_bucket)
+        return WorkloadFingerprint(
+            mix=tuple(mix),
+            size_bucket=self._size_bucket,
+            rate_bucket=self._rate_bucket,
+        )
+
+
+class ProfileStore:
+    """
+    Directory of tuned profiles, one JSON file per workload fingerprint.
+
+    Each file holds the fingerprint, the OptimizationProfile fields, the
+    engine settings the tuners converged to and the throughput they
+    achieved. Stored scores decay with age, so a score measured under
+    conditions that no longer hold is eventually replaced. Files are
+    replaced atomically, so a crash never leaves a half-written profile
+    behind; files that cannot be parsed are ignored.
+    """
+
+    def __init__(self, directory: str, score_half_life: float = SCORE_HALF_LIFE):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Directory holding the profile files; created on first save
+            score_half_life: Seconds after which a stored score counts half
+        """
+        self.directory = directory
+        self.score_half_life = score_half_life
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def save(
+        self,
+        fingerprint: WorkloadFingerprint,
+        profile: Dict[str, Any],
+        settings: Dict[str, Any],
+        score: float,
+        replace: bool = False,
+    ) -> bool:
+        """
+        Store the tuned state of a workload unless a better one is stored.
+
+        A stored record is replaced when the new score beats its aged score
+        by SCORE_MARGIN, or unconditionally with replace (a re-measurement
+        of the stored settings themselves).
+
+        Args:
+            fingerprint: Workload the state was tuned for
+            profile: OptimizationProfile fields
+            settings: Engine settings (worker count, chunk size, ...)
+            score: Throughput achieved with these settings
+            replace: Overwrite the stored record whatever its score
+
+        Returns:
+            True if the file was written
+        """
+        existing = self.get(fingerprint.key)
+        if (
+            existing is not None
+            and not replace
+            and score < self.aged_score(existing) * (1 + SCORE_MARGIN)
+        ):
+            return False
+        record = {
+            "fingerprint": fingerprint.to_dict(),
+            "profile": profile,
+            "settings": settings,
+            "score": score,
+            "updated": time.time(),
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(fingerprint.key)
+        temporary = f"{path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(record, f, sort_keys=True)
+        os.replace(temporary, path)
+        return True
+
+    def aged_score(self, record: Dict[str, Any], now: Optional[float] = None) -> float:
+        """Get a record's score decayed by its age."""
+        now = time.time() if now is None else now
+        age = max(0.0, now - record.get("updated", now))
+        return float(record.get("score", 0.0) * 0.5 ** (age / self.score_half_life))
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get the stored record of a fingerprint key, if any."""
+        try:
+            with open(self._path(key)) as f:
+                record: Dict[str, Any] = json.load(f)
+            WorkloadFingerprint.from_dict(record["fingerprint"])
+            if not isinstance(record.get("profile"), dict) or not isinstance(
+                record.get("settings", {}), dict
+            ):
+                raise ValueError("profile and settings must be objects")
+            return record
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable profile {key}: {e}")
+            return None
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Get all readable stored records."""
+        if not os.path.isdir(self.directory):
+            return []
+        records = []
+        for name in sorted(os.listdir(self.directory)):
+            if name.endswith(".json"):
+                record = self.get(name[:-len(".json")])
+                if record is not None:
+                    records.append(record)
+        return records
+
+    def best_match(
+        self, fingerprint: WorkloadFingerprint, max_distance: float = MAX_PROFILE_DISTANCE
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find the stored record closest to a fingerprint.
+
+        Returns:
+            The nearest record within max_distance (best aged score on ties), or None
+        """
+        best = None
+        for record in self.records():
+            distance = fingerprint.distance(WorkloadFingerprint.from_dict(record["fingerprint"]))
+            if distance > max_distance:
+                continue
+            rank = (distance, -self.aged_score(record))
+            if best is None or rank < best[0]:
+                best = (rank, record)
+        return best[1] if best is not None else None
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """Get the most recently updated record, used before traffic is fingerprinted."""
+        records = self.records()
+        return max(records, key=lambda record: record.get("updated", 0.0)) if records else None
@@ -0,0 +1,189 @@
+"""
+Batch Recovery for UHIP
+Per-item error records, retry policies and resumable batch checkpoints
+"""
+
+import logging
+import os
+import pickle
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Type
+
+from uhip.core.exceptions import DeadlineExceeded, EngineOverloaded
+
+logger = logging.getLogger(__name__)
+
+_CHECKPOINT_MAGIC = "uhip-batch-checkpoint"
+
+
+class ItemError(NamedTuple):
+    """Why one batch item has no result."""
+
+    index: int  # type: ignore[assignment]  # shadows tuple.index by design
+    error_type: str
+    message: str
+    attempts: int
+    exception: Optional[BaseException] = None
+
+
+@dataclass
+class BatchResult:
+    """
+    Outcome of a partial-result batch.
+
+    results holds one entry per input item, in input order; items listed in
+    errors have None in their slot.
+    """
+
+    results: List[Any]
+    errors: List[ItemError] = field(default_factory=list)
+    attempts: int = 0
+    resumed: int = 0
+
+    @property
+    def ok(self) -> bool:
+        """True if every item produced a result."""
+        return not self.errors
+
+    @property
+    def failed(self) -> List[int]:
+        """Indices of the items without a result."""
+        return [error.index for error in self.errors]
+
+    @property
+    def succeeded(self) -> int:
+        """Number of items with a result."""
+        return len(self.results) - len(self.errors)
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Which failed items are run again, how often and after which pause.
+
+    Deadline misses and admission rejections are never retried: the batch
+    is out of time or the processor is saturated, and a retry cannot help.
+    """
+
+    max_attempts: int = 3
+    backoff: float = 0.0
+    multiplier: float = 2.0
+    max_backoff: float = 30.0
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,)
+
+    def __post_init__(self):
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        """Check whether an item that failed on the given attempt runs again."""
+        if attempt >= self.max_attempts:
+            return False
+        if isinstance(error, (DeadlineExceeded, EngineOverloaded)):
+            return False
+        return isinstance(error, self.retry_on)
+
+    def delay(self, attempt: int) -> float:
+        """Pause in seconds before the retry round following the given attempt."""
+        return min(self.max_backoff, self.backoff * self.multiplier ** (attempt - 1))
+
+
+class BatchCheckpoint:
+    """
+    Append-only file recording finished batch items.
+
+    Every successful result is pickled to the file as soon as it arrives, so
+    an interrupted batch loses at most the items that were still running. A
+    new run of the same batch with the same checkpoint skips the recorded
+    items. A record torn by a crash is discarded and its item rerun.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the checkpoint.
+
+        Args:
+            path: File holding the checkpoint; created on first use
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._file: Any = None
+
+    def load(self, total: int) -> Dict[int, Any]:
+        """
+        Open the checkpoint and read the results recorded so far.
+
+        Args:
+            total: Number of items in the batch, checked against the file
+
+        Returns:
+            Item index -> recorded result
+
+        Raises:
+            ValueError: If the file belongs to a batch of a different size
+        """
+        done: Dict[int, Any] = {}
+        with self._lock:
+            self._close()
+            if not os.path.exists(self.path):
+                self._file = open(self.path, "wb")
+                pickle.dump((_CHECKPOINT_MAGIC, total), self._file)
+                self._file.flush()
+                return done
+
+            with open(self.path, "rb") as f:
+                header = pickle.load(f)
+                if header != (_CHECKPOINT_MAGIC, total):
+                    raise ValueError(
+                        f"Checkpoint {self.path} does not belong to a batch of {total} items"
+                    )
+                valid = f.tell()
+                while True:
+                    try:
+                        index, result = pickle.load(f)
+                    except EOFError:
+                        break
+                    except Exception as e:
+                        logger.warning(f"Discarding torn record in checkpoint {self.path}: {e}")
+                        break
+                    done[index] = result
+                    valid = f.tell()
+
+            self._file = open(self.path, "r+b")
+            self._file.truncate(valid)
+            self._file.seek(valid)
+        logger.info(f"Resuming batch from checkpoint {self.path}: {len(done)}/{total} done")
+        return done
+
+    def record(self, index: int, result: Any) -> None:
+        """Append a finished item; results that cannot be pickled are rerun on resume."""
+        try:
+            data = pickle.dumps((index, result))
+        except Exception as e:
+            logger.warning(f"Result of item {index} cannot be checkpointed: {e}")
+            return
+        with self._lock:
+            if self._file is None:
+                raise RuntimeError("Batch checkpoint not loaded")
+            self._file.write(data)
+            self._file.flush()
+
+    def close(self) -> None:
+        """Close the file, keeping it for a later resume."""
+        with self._lock:
+            self._close()
+
+    def clear(self) -> None:
+        """Close and delete the file once the batch no longer needs it."""
+        with self._lock:
+            self._close()
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,27 @@
+"""
+Reductions for UHIP
+Worker-side partial reduction and combining used by process_reduce
+"""
+
+from functools import reduce
+from typing import Any, Callable, List
+
+
+def reduce_chunk(
+    map_fn: Callable[[Any], Any],
+    combine_fn: Callable[[Any, Any], Any],
+    init: Any,
+    items: List[Any],
+) -> Any:
+    """
+    Map and fold one chunk of items into a single partial result.
+
+    Module-level so it can be submitted to process pools. Mapped values are
+    folded as they are produced, so a chunk's results never exist as a list.
+    """
+    return reduce(combine_fn, (map_fn(item) for item in items), init)
+
+
+def combine_partials(combine_fn: Callable[[Any, Any], Any], partials: List[Any]) -> Any:
+    """Fold a group of adjacent partial results, preserving their order."""
+    return reduce(combine_fn, partials)
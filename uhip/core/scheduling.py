@@ -0,0 +1,351 @@
+"""
+Task Scheduling for UHIP
+Queueing policies that decide which pending task is dispatched next
+"""
+
+import heapq
+import itertools
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from uhip.core.exceptions import DeadlineExceeded, EngineOverloaded
+
+
+@dataclass
+class ScheduledTask:
+    """A unit of work waiting in a scheduler queue."""
+    
+    func: Callable[..., Any]
+    args: Tuple[Any, ...]
+    future: Future
+    task_type: str = "general"
+    deadline: float = math.inf
+    priority: Optional[str] = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+    hedge: bool = False
+
+    def expired(self, now: Optional[float] = None) -> bool:
+        """Check whether the task's deadline has already passed."""
+        return (now if now is not None else time.monotonic()) >= self.deadline
+
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_NORMAL = "normal"
+PRIORITY_BULK = "bulk"
+PRIORITY_CLASSES = (PRIORITY_INTERACTIVE, PRIORITY_NORMAL, PRIORITY_BULK)
+
+OVERLOAD_BLOCK = "block"
+OVERLOAD_REJECT = "reject"
+OVERLOAD_SHED = "shed"
+OVERLOAD_POLICIES = (OVERLOAD_BLOCK, OVERLOAD_REJECT, OVERLOAD_SHED)
+
+DEFAULT_TASK_PRIORITIES: Dict[str, str] = {
+    "edge": PRIORITY_INTERACTIVE,
+    "ai_ml": PRIORITY_INTERACTIVE,
+    "quantum": PRIORITY_NORMAL,
+    "blockchain": PRIORITY_NORMAL,
+    "general": PRIORITY_NORMAL,
+}
+
+
+class _Flow:
+    """Per-task-type queue inside a priority class."""
+
+    def __init__(self, weight: float):
+        self.weight = weight
+        self.heap: List[Tuple[float, int, ScheduledTask]] = []
+        self.tags: Deque[Tuple[float, float]] = deque()
+        self.last_finish = 0.0
+
+
+class TaskScheduler:
+    """
+    Priority-class scheduler with weighted fair queuing per task type.
+
+    Classes are served in strict priority order (interactive, normal, bulk).
+    Within a class each task type is a flow; flows share dispatch slots in
+    proportion to their weights using start-time fair queuing virtual tags.
+    Within a flow tasks are served earliest-deadline-first, and tasks
+    without a deadline are served FIFO after all deadlined tasks.
+
+    The queue is bounded by a high watermark. Once it is reached the
+    scheduler is saturated until the queue drains to the low watermark, and
+    new submissions block, are rejected with EngineOverloaded, or displace
+    queued lower-priority work, depending on the overload policy.
+    """
+
+    def __init__(
+        self,
+        priorities: Optional[Dict[str, str]] = None,
+        weights: Optional[Dict[str, float]] = None,
+        high_watermark: int = 0,
+        low_watermark: Optional[int] = None,
+        overload_policy: str = OVERLOAD_BLOCK,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            priorities: Task type -> priority class. Unlisted types are "normal".
+            weights: Task type -> fair-share weight. Unlisted types weigh 1.0.
+            high_watermark: Queue depth at which admission control kicks in.
+                           0 disables the bound.
+            low_watermark: Queue depth at which normal admission resumes.
+                          Defaults to 80% of the high watermark.
+            overload_policy: "block", "reject" or "shed"
+        """
+        if overload_policy not in OVERLOAD_POLICIES:
+            raise ValueError(
+                f"Unknown overload policy '{overload_policy}', "
+                f"expected one of {OVERLOAD_POLICIES}"
+            )
+        if low_watermark is None:
+            low_watermark = int(high_watermark * 0.8)
+        if high_watermark > 0 and not 0 <= low_watermark < high_watermark:
+            raise ValueError("low_watermark must be below high_watermark")
+
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self.overload_policy = overload_policy
+
+        self.priorities = dict(DEFAULT_TASK_PRIORITIES)
+        self.priorities.update(priorities or {})
+        self.weights = dict(weights or {})
+        for task_type, priority in self.priorities.items():
+            if priority not in PRIORITY_CLASSES:
+                raise ValueError(
+                    f"Unknown priority '{priority}' for '{task_type}', "
+                    f"expected one of {PRIORITY_CLASSES}"
+                )
+        for task_type, weight in self.weights.items():
+            if weight <= 0:
+                raise ValueError(f"Weight for '{task_type}' must be positive")
+
+        self._flows: Dict[str, Dict[str, _Flow]] = {p: {} for p in PRIORITY_CLASSES}
+        self._virtual_time: Dict[str, float] = {p: 0.0 for p in PRIORITY_CLASSES}
+        self._depth: Dict[str, int] = {p: 0 for p in PRIORITY_CLASSES}
+        self._dispatched: Dict[str, int] = {p: 0 for p in PRIORITY_CLASSES}
+        self._total_wait: Dict[str, float] = {p: 0.0 for p in PRIORITY_CLASSES}
+        self._max_wait: Dict[str, float] = {p: 0.0 for p in PRIORITY_CLASSES}
+        self._size = 0
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._closed = False
+        self._saturated = False
+        self._rejected: Dict[str, int] = {}
+        self._shed: Dict[str, int] = {}
+        self._blocked = 0
+
+    def priority_of(self, task: ScheduledTask) -> str:
+        """Get the priority class for a task."""
+        if task.priority is not None:
+            return task.priority
+        return self.priorities.get(task.task_type, PRIORITY_NORMAL)
+
+    def push(self, task: ScheduledTask) -> None:
+        """
+        Queue a task, applying admission control when saturated.
+
+        Args:
+            task: Task to schedule
+
+        Raises:
+            EngineOverloaded: If the task is rejected under the overload policy
+            DeadlineExceeded: If the task's deadline passes while blocked
+        """
+        priority = self.priority_of(task)
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority '{priority}'")
+
+        victim = None
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Scheduler is closed")
+
+            if self._saturated:
+                victim = self._admit(task, priority)
+
+            self._enqueue(task, priority)
+            if self.high_watermark > 0 and self._size >= self.high_watermark:
+                self._saturated = True
+            self._not_empty.notify()
+
+        if victim is not None and victim.future.set_running_or_notify_cancel():
+            victim.future.set_exception(
+                EngineOverloaded(f"'{victim.task_type}' task shed under overload", self._size)
+            )
+
+    def _admit(self, task: ScheduledTask, priority: str) -> Optional[ScheduledTask]:
+        """
+        Apply the overload policy to an incoming task; the caller holds the lock.
+
+        Returns:
+            A queued task displaced to make room, if any
+        """
+        if self.overload_policy == OVERLOAD_BLOCK:
+            self._blocked += 1
+            while self._saturated and not self._closed:
+                remaining = task.deadline - time.monotonic()
+                if remaining <= 0:
+                    self._count(self._rejected, task.task_type)
+                    raise DeadlineExceeded(
+                        f"Deadline passed while '{task.task_type}' task waited for admission"
+                    )
+                self._not_full.wait(None if math.isinf(remaining) else remaining)
+            if self._closed:
+                raise RuntimeError("Scheduler is closed")
+            return None
+
+        if self.overload_policy == OVERLOAD_SHED:
+            victim = self._evict_below(priority)
+            if victim is not None:
+                self._count(self._shed, victim.task_type)
+                return victim
+
+        self._count(self._rejected, task.task_type)
+        raise EngineOverloaded(
+            f"Engine overloaded, rejecting '{task.task_type}' task", self._size
+        )
+
+    def _evict_below(self, priority: str) -> Optional[ScheduledTask]:
+        """Remove the latest-deadline task of the lowest class below priority."""
+        rank = PRIORITY_CLASSES.index(priority)
+        for candidate in reversed(PRIORITY_CLASSES[rank + 1:]):
+            if not self._depth[candidate]:
+                continue
+
+            flow = max(
+                (f for f in self._flows[candidate].values() if f.heap),
+                key=lambda f: len(f.heap),
+            )
+            index = max(range(len(flow.heap)), key=lambda i: flow.heap[i][:2])
+            task = flow.heap.pop(index)[2]
+            heapq.heapify(flow.heap)
+            flow.tags.pop()
+            flow.last_finish = flow.tags[-1][1] if flow.tags else self._virtual_time[candidate]
+
+            self._depth[candidate] -= 1
+            self._size -= 1
+            return task
+        return None
+
+    def _enqueue(self, task: ScheduledTask, priority: str) -> None:
+        """Add a task to its flow; the caller holds the lock."""
+        flows = self._flows[priority]
+        flow = flows.get(task.task_type)
+        if flow is None:
+            flow = _Flow(self.weights.get(task.task_type, 1.0))
+            flows[task.task_type] = flow
+
+        start = max(self._virtual_time[priority], flow.last_finish)
+        flow.last_finish = start + 1.0 / flow.weight
+        flow.tags.append((start, flow.last_finish))
+        heapq.heappush(flow.heap, (task.deadline, next(self._counter), task))
+
+        self._depth[priority] += 1
+        self._size += 1
+
+    @staticmethod
+    def _count(counter: Dict[str, int], task_type: str) -> None:
+        counter[task_type] = counter.get(task_type, 0) + 1
+
+    def _select(self) -> ScheduledTask:
+        """Remove the next task; the caller holds the lock and the queue is non-empty."""
+        for priority in PRIORITY_CLASSES:
+            if not self._depth[priority]:
+                continue
+
+            flows = self._flows[priority]
+            flow = min(
+                (f for f in flows.values() if f.heap),
+                key=lambda f: f.tags[0][1],
+            )
+            start, _ = flow.tags.popleft()
+            self._virtual_time[priority] = start
+            task = heapq.heappop(flow.heap)[2]
+
+            waited = time.monotonic() - task.enqueued_at
+            self._depth[priority] -= 1
+            self._dispatched[priority] += 1
+            self._total_wait[priority] += waited
+            self._max_wait[priority] = max(self._max_wait[priority], waited)
+            self._size -= 1
+            if self._saturated and self._size <= self.low_watermark:
+                self._saturated = False
+                self._not_full.notify_all()
+            return task
+
+        raise RuntimeError("Scheduler queue is empty")
+
+    def pop(self) -> Optional[ScheduledTask]:
+        """
+        Remove the next task, blocking until one is available.
+
+        Returns:
+            The next task, or None once the scheduler is closed and drained
+        """
+        with self._lock:
+            while not self._size:
+                if self._closed:
+                    return None
+                self._not_empty.wait()
+            return self._select()
+
+    def drain(self) -> List[ScheduledTask]:
+        """Remove and return every queued task."""
+        with self._lock:
+            tasks = []
+            while self._size:
+                tasks.append(self._select())
+            return tasks
+
+    def close(self) -> None:
+        """Stop accepting tasks; pop() returns None once the queue is empty."""
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get queue depth and wait time per priority class."""
+        with self._lock:
+            return {
+                priority: {
+                    "depth": self._depth[priority],
+                    "dispatched": self._dispatched[priority],
+                    "avg_wait": (
+                        self._total_wait[priority] / self._dispatched[priority]
+                        if self._dispatched[priority] else 0.0
+                    ),
+                    "max_wait": self._max_wait[priority],
+                }
+                for priority in PRIORITY_CLASSES
+            }
+
+    def get_admission_stats(self) -> Dict[str, Any]:
+        """Get admission-control state and rejection counts per task type."""
+        with self._lock:
+            return {
+                "policy": self.overload_policy,
+                "high_watermark": self.high_watermark,
+                "low_watermark": self.low_watermark,
+                "saturated": self._saturated,
+                "blocked": self._blocked,
+                "rejected": dict(self._rejected),
+                "shed": dict(self._shed),
+            }
+
+    @property
+    def saturated(self) -> bool:
+        """True while the queue is above its watermarks."""
+        return self._saturated
+
+    def __len__(self) -> int:
+        return self._size
@@ -0,0 +1,123 @@
+"""
+Work Stealing for UHIP
+Chunked batch execution where idle drivers steal work from busy ones
+"""
+
+import logging
+import math
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A chunk is (index of its first item in the batch, items)
+Chunk = Tuple[int, List[Any]]
+
+
+def run_chunk(func: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+    """
+    Apply func to every item of a chunk.
+
+    Module-level so chunks can be submitted to process pools.
+    """
+    return [func(item) for item in items]
+
+
+class WorkStealingRun:
+    """
+    Splits one batch into chunks spread over per-driver deques.
+
+    Each driver takes chunks from the front of its own deque. A driver whose
+    deque is empty steals the back half of the fullest remaining deque, so a
+    few expensive items at the end of one driver's share no longer hold up
+    the whole batch while other drivers sit idle.
+    """
+
+    def __init__(
+        self,
+        items: List[Any],
+        workers: int,
+        chunk_size: Optional[int] = None,
+        steal: bool = True,
+    ):
+        """
+        Initialize the run.
+
+        Args:
+            items: Batch items, in result order
+            workers: Number of drivers (one per pool worker)
+            chunk_size: Items per chunk. If None, aims for about eight chunks
+                       per driver so there is something left to steal.
+            steal: If False, drivers only process their own share
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+
+        self.chunk_size = chunk_size or max(1, len(items) // (workers * 8))
+        self.steal = steal
+        chunks = [
+            (start, items[start:start + self.chunk_size])
+            for start in range(0, len(items), self.chunk_size)
+        ]
+        self.workers = max(1, min(workers, len(chunks)))
+        share = math.ceil(len(chunks) / self.workers) if chunks else 0
+
+        # Contiguous shares keep neighbouring items on the same driver
+        self._deques: List[Deque[Chunk]] = [
+            deque(chunks[i * share:(i + 1) * share]) for i in range(self.workers)
+        ]
+        self._locks = [threading.Lock() for _ in range(self.workers)]
+        self._stats_lock = threading.Lock()
+        self.chunks = len(chunks)
+        self.steals = 0
+        self.stolen_chunks = 0
+
+    def next_chunk(self, worker: int) -> Optional[Chunk]:
+        """
+        Get the next chunk for a driver, stealing if its deque is empty.
+
+        Args:
+            worker: Driver index
+
+        Returns:
+            The next chunk, or None once no work is left anywhere
+        """
+        with self._locks[worker]:
+            if self._deques[worker]:
+                return self._deques[worker].popleft()
+        if not self.steal:
+            return None
+        return self._steal(worker)
+
+    def _steal(self, thief: int) -> Optional[Chunk]:
+        """Move the back half of the fullest deque to the thief's deque."""
+        while True:
+            victims = sorted(
+                (i for i in range(self.workers) if i != thief and self._deques[i]),
+                key=lambda i: len(self._deques[i]),
+                reverse=True,
+            )
+            if not victims:
+                return None
+
+            # Only one deque lock is held at a time, so drivers cannot deadlock
+            stolen: List[Chunk] = []
+            with self._locks[victims[0]]:
+                victim = self._deques[victims[0]]
+                for _ in range((len(victim) + 1) // 2):
+                    stolen.append(victim.pop())
+            if not stolen:
+                continue  # Raced with the owner; look again
+
+            stolen.reverse()
+            with self._locks[thief]:
+                self._deques[thief].extend(stolen[1:])
+            with self._stats_lock:
+                self.steals += 1
+                self.stolen_chunks += len(stolen)
+            return stolen[0]
+
+    def pending(self) -> int:
+        """Number of chunks not yet handed to a driver."""
+        return sum(len(d) for d in self._deques)
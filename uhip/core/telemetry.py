@@ -0,0 +1,191 @@
+"""
+Worker Telemetry for UHIP
+Per-process metric shards that pool workers ship to the engine in batches
+"""
+
+import logging
+import multiprocessing
+import multiprocessing.util
+import queue
+import threading
+import time
+from typing import Any, Optional
+
+from uhip.utils.metrics import MetricShard, ShardedMetrics
+
+logger = logging.getLogger(__name__)
+
+# Reporter of this worker process; None in the engine process and in
+# workers started without init_worker_metrics()
+_REPORTER: Optional["WorkerMetricsReporter"] = None
+
+
+class WorkerMetricsReporter:
+    """
+    Records handler time in a worker process and ships it as shard deltas.
+
+    Records go into a local MetricShard. After flush_items tasks, or on the
+    first task once flush_interval seconds have passed, the shard is put on
+    the engine's queue and replaced by an empty one, so the cost of
+    pickling and the pipe write is paid once per batch instead of once per
+    task. The queue is bounded: while it is full the shard keeps
+    accumulating and is retried at the next flush, so a slow reader costs
+    freshness rather than memory or lost counts. A delta still pending when
+    the worker exits is flushed by a multiprocessing finalizer.
+    """
+
+    def __init__(self, channel: Any, flush_items: int = 256, flush_interval: float = 1.0):
+        """
+        Initialize the reporter.
+
+        Args:
+            channel: multiprocessing queue the engine drains
+            flush_items: Tasks recorded before a delta is shipped
+            flush_interval: Seconds after which a delta is shipped regardless
+        """
+        self.channel = channel
+        self.flush_items = max(1, flush_items)
+        self.flush_interval = flush_interval
+        self.shard = MetricShard()
+        self.pending = 0
+        self.last_flush = time.monotonic()
+
+    def record(self, task_type: str, elapsed_ns: int, count: int = 1) -> None:
+        """Record completed work and ship the delta when a batch is full."""
+        self.shard.record(task_type, elapsed_ns, count)
+        self.pending += count
+        if (
+            self.pending >= self.flush_items
+            or time.monotonic() - self.last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Ship the pending delta, if any."""
+        self.last_flush = time.monotonic()
+        if not self.pending:
+            return
+        try:
+            self.channel.put_nowait(self.shard)
+        except queue.Full:
+            return
+        except Exception as e:
+            logger.debug(f"Dropped worker metrics delta: {e}")
+        # The queued shard is pickled later by the feeder thread; never touch it again
+        self.shard = MetricShard()
+        self.pending = 0
+
+
+def init_worker_metrics(channel: Any, flush_items: int = 256, flush_interval: float = 1.0) -> None:
+    """
+    Pool worker initializer that starts shipping handler metrics.
+
+    Thread-pool workers run in the engine process, which records its own
+    metrics, so the hook only takes effect in child processes.
+
+    Args:
+        channel: multiprocessing queue the engine drains
+        flush_items: Tasks recorded before a delta is shipped
+        flush_interval: Seconds after which a delta is shipped regardless
+    """
+    global _REPORTER
+    if multiprocessing.parent_process() is None:
+        return
+    _REPORTER = WorkerMetricsReporter(channel, flush_items, flush_interval)
+    # Runs before the queue's own finalizer (priority 10) flushes its buffer
+    multiprocessing.util.Finalize(None, _REPORTER.flush, exitpriority=20)
+
+
+def record_worker_metric(task_type: str, elapsed_ns: int, count: int = 1) -> None:
+    """Record handler time if this worker ships metrics; no-op otherwise."""
+    if _REPORTER is not None:
+        _REPORTER.record(task_type, elapsed_ns, count)
+
+
+def reporting() -> bool:
+    """Whether this process ships handler metrics."""
+    return _REPORTER is not None
+
+
+class WorkerMetricsChannel:
+    """
+    Engine side of worker telemetry: a bounded queue and a drain thread.
+
+    Workers block on exit until their queue feeder has written everything
+    to the pipe, so the queue must be read for as long as any worker may
+    exit, including pools being resized, recycled or shut down. A daemon
+    thread therefore merges deltas continuously from start() until close(),
+    which the engine calls only after its pools have been joined.
+    """
+
+    def __init__(self, metrics: ShardedMetrics, maxsize: int = 64, poll_interval: float = 0.2):
+        """
+        Initialize the channel.
+
+        Args:
+            metrics: Metrics the deltas are merged into
+            maxsize: Most deltas in flight; bounds memory when reads lag
+            poll_interval: Seconds the drain thread waits for a delta
+        """
+        self.metrics = metrics
+        self.poll_interval = poll_interval
+        self.queue: Any = multiprocessing.Queue(maxsize)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the drain thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="uhip-telemetry", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                shard = self.queue.get(timeout=self.poll_interval)
+            except queue.Empty:
+                continue
+            except (OSError, ValueError, EOFError):
+                break
+            self.metrics.merge_shard(shard)
+
+    def drain(self) -> int:
+        """Merge the deltas already shipped without waiting for more."""
+        return drain_worker_metrics(self.queue, self.metrics)
+
+    def close(self) -> None:
+        """Stop the drain thread, merge what is left and release the queue."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.drain()
+        self.queue.close()
+        self.queue.join_thread()
+
+
+def drain_worker_metrics(channel: Any, metrics: ShardedMetrics, limit: int = 10000) -> int:
+    """
+    Merge the deltas workers have shipped so far.
+
+    Args:
+        channel: multiprocessing queue passed to init_worker_metrics()
+        metrics: Metrics the deltas are merged into
+        limit: Most deltas merged per call
+
+    Returns:
+        Number of deltas merged
+    """
+    merged = 0
+    while merged < limit:
+        try:
+            shard = channel.get_nowait()
+        except (queue.Empty, OSError, ValueError):
+            break
+        metrics.merge_shard(shard)
+        merged += 1
+    return merged
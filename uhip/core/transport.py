@@ -0,0 +1,231 @@
+"""
+Shared-Memory Transport for UHIP
+Moves large NumPy payloads to process workers without pickling their data
+"""
+
+import logging
+import threading
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None  # type: ignore[assignment]
+
+
+logger = logging.getLogger(__name__)
+
+
+def available() -> bool:
+    """Check whether array payloads can be transported (numpy installed)."""
+    return np is not None
+
+
+class SharedArray(NamedTuple):
+    """Picklable descriptor of an array stored in a shared-memory block."""
+
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+class _Block:
+    """A shared-memory block holding one exported array."""
+
+    __slots__ = ("shm", "descriptor", "array", "refs")
+
+    def __init__(self, shm: shared_memory.SharedMemory, descriptor: SharedArray, array: Any):
+        self.shm = shm
+        self.descriptor = descriptor
+        self.array = array  # Keeps id(array) unique while the block lives
+        self.refs = 0
+
+
+def _walk(value: Any, convert: Callable[[Any], Any]) -> Any:
+    """Rebuild list/tuple/dict containers with convert applied to the leaves."""
+    if isinstance(value, dict):
+        return {k: _walk(v, convert) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_walk(v, convert) for v in value]
+    if isinstance(value, tuple) and not isinstance(value, SharedArray):
+        return tuple(_walk(v, convert) for v in value)
+    return convert(value)
+
+
+class SharedMemoryArena:
+    """
+    Parent-side arena of shared-memory blocks for array payloads.
+
+    Arrays at or above the size threshold are copied once into a shared
+    block and replaced by a SharedArray descriptor in the task arguments;
+    workers map the block and get a zero-copy view. Blocks are reference
+    counted, so an array passed to many tasks is exported once and the block
+    is unlinked when the last task using it completes.
+    """
+
+    def __init__(self, threshold: int):
+        """
+        Initialize the arena.
+
+        Args:
+            threshold: Minimum array size in bytes sent through shared memory
+        """
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._blocks: Dict[int, _Block] = {}
+        self._by_name: Dict[str, _Block] = {}
+        self.stats = {"exported": 0, "reused": 0, "released": 0, "bytes": 0, "results": 0}
+
+    def export_args(self, args: Tuple[Any, ...]) -> Tuple[Tuple[Any, ...], List[SharedArray]]:
+        """
+        Replace large arrays in task arguments with shared-memory descriptors.
+
+        Args:
+            args: Task arguments; arrays may be nested in lists, tuples and dicts
+
+        Returns:
+            Tuple of (converted args, descriptors to release after the task)
+        """
+        if np is None:
+            return args, []
+        exported: List[SharedArray] = []
+
+        def convert(value: Any) -> Any:
+            if (
+                isinstance(value, np.ndarray)
+                and value.nbytes >= self.threshold
+                and value.dtype != object
+            ):
+                descriptor = self._export(value)
+                exported.append(descriptor)
+                return descriptor
+            return value
+
+        converted = _walk(args, convert)
+        return converted, exported
+
+    def _export(self, array: Any) -> SharedArray:
+        with self._lock:
+            block = self._blocks.get(id(array))
+            if block is not None:
+                block.refs += 1
+                self.stats["reused"] += 1
+                return block.descriptor
+
+            shm = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+            view = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+            view[...] = array
+            del view
+            descriptor = SharedArray(shm.name, tuple(array.shape), array.dtype.str)
+            block = _Block(shm, descriptor, array)
+            block.refs = 1
+            self._blocks[id(array)] = block
+            self._by_name[shm.name] = block
+            self.stats["exported"] += 1
+            self.stats["bytes"] += array.nbytes
+            return descriptor
+
+    def release(self, descriptors: List[SharedArray]) -> None:
+        """Drop one reference per descriptor and unlink unused blocks."""
+        for descriptor in descriptors:
+            with self._lock:
+                block = self._by_name.get(descriptor.name)
+                if block is None:
+                    continue
+                block.refs -= 1
+                if block.refs > 0:
+                    continue
+                del self._by_name[descriptor.name]
+                del self._blocks[id(block.array)]
+                self.stats["released"] += 1
+                self.stats["bytes"] -= block.array.nbytes
+            _unlink(block.shm)
+
+    def import_result(self, result: Any) -> Any:
+        """Copy arrays returned through shared memory into local arrays."""
+        if np is None:
+            return result
+
+        def convert(value: Any) -> Any:
+            if isinstance(value, SharedArray):
+                shm = shared_memory.SharedMemory(name=value.name)
+                try:
+                    array = np.ndarray(value.shape, dtype=value.dtype, buffer=shm.buf).copy()
+                finally:
+                    _unlink(shm)
+                with self._lock:
+                    self.stats["results"] += 1
+                return array
+            return value
+
+        return _walk(result, convert)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get export counts and the number of live blocks and bytes."""
+        with self._lock:
+            return {**self.stats, "live_blocks": len(self._by_name)}
+
+    def close(self) -> None:
+        """Unlink every remaining block."""
+        with self._lock:
+            blocks = list(self._by_name.values())
+            self._blocks.clear()
+            self._by_name.clear()
+        for block in blocks:
+            _unlink(block.shm)
+
+
+def _unlink(shm: shared_memory.SharedMemory) -> None:
+    try:
+        shm.close()
+        shm.unlink()
+    except (BufferError, FileNotFoundError) as e:
+        logger.debug(f"Could not release shared block {shm.name}: {e}")
+
+
+def run_shared(threshold: int, func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Worker-side wrapper: map shared arrays, run func, share large results.
+
+    Module-level so it can be submitted to process pools.
+
+    Args:
+        threshold: Minimum result array size in bytes returned via shared memory
+        func: Task function
+        *args: Task arguments, possibly containing SharedArray descriptors
+
+    Returns:
+        The task result, with large arrays replaced by descriptors
+    """
+    attached: List[shared_memory.SharedMemory] = []
+
+    def attach(value: Any) -> Any:
+        if isinstance(value, SharedArray):
+            shm = shared_memory.SharedMemory(name=value.name)
+            attached.append(shm)
+            return np.ndarray(value.shape, dtype=value.dtype, buffer=shm.buf)
+        return value
+
+    def share(value: Any) -> Any:
+        if isinstance(value, np.ndarray) and value.nbytes >= threshold and value.dtype != object:
+            shm = shared_memory.SharedMemory(create=True, size=max(1, value.nbytes))
+            view = np.ndarray(value.shape, dtype=value.dtype, buffer=shm.buf)
+            view[...] = value
+            del view
+            descriptor = SharedArray(shm.name, tuple(value.shape), value.dtype.str)
+            # The parent unlinks the block once it has copied the result
+            shm.close()
+            return descriptor
+        return value
+
+    try:
+        result = func(*_walk(args, attach))
+        return _walk(result, share)
+    finally:
+        # Views returned unshared keep their mapping alive until pickled
+        for shm in attached:
+            try:
+                shm.close()
+            except BufferError:
+                pass
@@ -0,0 +1,268 @@
+"""
+Parallelism Tuning for UHIP
+Online hill-climbing over worker count, chunk size and pool mode
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from uhip.core.pool import POOL_PROCESS, POOL_THREAD
+
+logger = logging.getLogger(__name__)
+
+KNOB_WORKERS = "workers"
+KNOB_CHUNK_SIZE = "chunk_size"
+KNOB_MODE = "mode"
+KNOBS = (KNOB_WORKERS, KNOB_CHUNK_SIZE, KNOB_MODE)
+
+# Routing modes in hybrid mode; "profile" routes by measured CPU profile
+MODE_PROFILE = "profile"
+_MODES = (MODE_PROFILE, POOL_THREAD, POOL_PROCESS)
+_DEFAULT_CHUNK_SIZE = 8
+_MAX_CHUNK_SIZE = 4096
+
+
+class ParallelismTuner:
+    """
+    Hill-climber over the processor's live settings.
+
+    Each step measures throughput (completions per second) and latency
+    over the window since the previous step. The first window of a
+    setting is its baseline; the tuner then applies one neighbouring
+    setting (a trial) and judges it on the next window. A trial is kept if
+    it raises throughput or lowers latency by min_gain without the other
+    getting worse by more than tolerance; otherwise the previous setting is
+    restored. Kept trials continue in the same direction, rejected ones turn
+    to the opposite direction or the next knob.
+
+    Knobs: primary pool worker count (via resize), work-stealing chunk size
+    (only with work stealing on) and the default pool (only in hybrid mode;
+    the executor kind of a non-hybrid processor cannot change while it runs).
+    """
+
+    def __init__(self, min_samples: int = 50, min_gain: float = 0.05, tolerance: float = 0.10):
+        """
+        Initialize the tuner.
+
+        Args:
+            min_samples: Completed tasks needed before a window is judged
+            min_gain: Relative improvement required to keep a trial
+            tolerance: Relative regression of the other metric still accepted
+        """
+        self.min_samples = min_samples
+        self.min_gain = min_gain
+        self.tolerance = tolerance
+        self.baseline: Optional[Dict[str, float]] = None
+        self.trial: Optional[Dict[str, Any]] = None
+        self._knob = 0
+        self._direction = 1
+        self._last: Optional[Dict[str, float]] = None
+        self.stats = {"windows": 0, "trials": 0, "kept": 0, "rolled_back": 0}
+
+    def step(self, processor: Any, metrics: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Measure the last window and take the next tuning decision.
+
+        Args:
+            processor: Initialized ParallelProcessor to tune
+            metrics: Engine performance metrics (task type -> count/total_time)
+
+        Returns:
+            Records of the settings changed by this step
+        """
+        window = self.measure(processor, metrics)
+        if window is None:
+            return []
+        return self.decide(processor, window)
+
+    def measure(self, processor: Any, metrics: Dict[str, Any]) -> Optional[Dict[str, float]]:
+        """
+        Get throughput and latency since the last complete window.
+
+        Throughput is tasks completed per wall-clock second of the window,
+        so workers that sit idle add nothing to it. Utilization is the share
+        of the window's worker time the pools spent busy. Latency is the
+        mean engine request time when requests were recorded in the window,
+        else the mean task run time in the pools.
+
+        Returns:
+            Window measurements, or None while fewer than min_samples tasks
+            have completed
+        """
+        pools = list(processor.get_stats()["pools"].values())
+        workers = sum(pool["max_workers"] for pool in pools)
+        counters = {
+            "time": time.monotonic(),
+            "completed": sum(pool["completed"] for pool in pools),
+            "busy_time": sum(pool["busy_time"] for pool in pools),
+            "requests": sum(m.get("count", 0) for m in metrics.values()),
+            "request_time": sum(m.get("total_time", 0.0) for m in metrics.values()),
+        }
+        last, self._last = self._last, counters
+        if last is None:
+            return None
+
+        delta = {key: counters[key] - last[key] for key in counters}
+        if delta["completed"] < self.min_samples or delta["time"] <= 0:
+            # Keep accumulating into the same window
+            self._last = last
+            return None
+
+        self.stats["windows"] += 1
+        if delta["requests"] > 0:
+            latency = delta["request_time"] / delta["requests"]
+        else:
+            latency = delta["busy_time"] / delta["completed"]
+        utilization = min(1.0, delta["busy_time"] / (delta["time"] * max(1, workers)))
+        return {
+            "throughput": delta["completed"] / delta["time"],
+            "utilization": utilization,
+            "latency": latency,
+            "tasks": delta["completed"],
+        }
+
+    def decide(self, processor: Any, window: Dict[str, float]) -> List[Dict[str, Any]]:
+        """
+        Judge the running trial (if any) on a window and start the next one.
+
+        Args:
+            processor: ParallelProcessor to tune
+            window: Measurements as returned by measure()
+
+        Returns:
+            Records of the settings changed
+        """
+        if self.trial is None:
+            self.baseline = window
+            return self._propose(processor)
+
+        trial, self.trial = self.trial, None
+        baseline = self.baseline
+        # A trial is only proposed once a baseline has been measured
+        assert baseline is not None
+        knob, previous, value = trial["knob"], trial["from"], trial["to"]
+        scores = {"window": window, "baseline": baseline}
+        if self._improved(window, baseline):
+            self.stats["kept"] += 1
+            self.baseline = window
+            logger.info(f"Tuner kept {knob}={value}")
+            return [_change("keep", knob, previous, value, **scores)] + self._propose(processor)
+
+        self._apply(processor, knob, previous)
+        self.stats["rolled_back"] += 1
+        self._turn()
+        # The restored setting gets a fresh baseline before the next trial
+        self.baseline = None
+        logger.info(f"Tuner rolled back {knob} from {value} to {previous}")
+        return [_change("rollback", knob, value, previous, **scores)]
+
+    def _improved(self, window: Dict[str, float], baseline: Dict[str, float]) -> bool:
+        throughput = _ratio(window["throughput"], baseline["throughput"])
+        latency = _ratio(window["latency"], baseline["latency"])
+        faster = throughput >= 1.0 + self.min_gain and latency <= 1.0 + self.tolerance
+        quicker = latency <= 1.0 - self.min_gain and throughput >= 1.0 - self.tolerance
+        return faster or quicker
+
+    def _propose(self, processor: Any) -> List[Dict[str, Any]]:
+        """Apply the next neighbouring setting as a trial."""
+        for _ in range(2 * len(KNOBS)):
+            knob = KNOBS[self._knob]
+            current = self._current(processor, knob)
+            target = self._neighbor(processor, knob, current, self._direction)
+            if target is not None and target != current:
+                self._apply(processor, knob, target)
+                self.trial = {"knob": knob, "from": current, "to": target}
+                self.stats["trials"] += 1
+                logger.info(f"Tuner trying {knob}={target} (was {current})")
+                return [_change("trial", knob, current, target, baseline=self.baseline)]
+            self._turn()
+        return []
+
+    def _turn(self) -> None:
+        """Try the opposite direction, then move on to the next knob."""
+        if self._direction > 0:
+            self._direction = -1
+        else:
+            self._direction = 1
+            self._knob = (self._knob + 1) % len(KNOBS)
+
+    @staticmethod
+    def _current(processor: Any, knob: str) -> Any:
+        if knob == KNOB_WORKERS:
+            return processor.max_workers
+        if knob == KNOB_CHUNK_SIZE:
+            return processor.steal_chunk_size
+        return processor.default_pool or MODE_PROFILE
+
+    @staticmethod
+    def _neighbor(processor: Any, knob: str, current: Any, direction: int) -> Any:
+        if knob == KNOB_WORKERS:
+            size = current + direction * max(1, current // 4)
+            return max(processor.min_workers, min(processor.max_workers_limit, size))
+        if knob == KNOB_CHUNK_SIZE:
+            if not processor.work_stealing:
+                return None
+            size = current or _DEFAULT_CHUNK_SIZE
+            return max(1, min(_MAX_CHUNK_SIZE, size * 2 if direction > 0 else size // 2))
+        if not processor.hybrid:
+            return None
+        return _MODES[(_MODES.index(current) + direction) % len(_MODES)]
+
+    @staticmethod
+    def _apply(processor: Any, knob: str, value: Any) -> None:
+        if knob == KNOB_WORKERS:
+            processor.resize(value, reason="tuner")
+        elif knob == KNOB_CHUNK_SIZE:
+            processor.steal_chunk_size = value
+        else:
+            processor.default_pool = None if value == MODE_PROFILE else value
+
+    def revert(self, processor: Any, change: Dict[str, Any]) -> bool:
+        """
+        Undo a recorded setting change if the setting still has its new value.
+
+        Args:
+            processor: ParallelProcessor the change was applied to
+            change: Change record with "knob", "from" and "to"
+
+        Returns:
+            True if the previous value was restored
+        """
+        knob = change["knob"]
+        if knob not in KNOBS or self._current(processor, knob) != change["to"]:
+            return False
+        self._apply(processor, knob, change["from"])
+        self.reset()
+        logger.info(f"Tuner reverted {knob} from {change['to']} to {change['from']}")
+        return True
+
+    def reset(self) -> None:
+        """Forget the baseline and any running trial, e.g. after settings were loaded."""
+        self.baseline = None
+        self.trial = None
+        self._last = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get window and trial counts and the current trial."""
+        return {
+            **self.stats,
+            "baseline": dict(self.baseline) if self.baseline else None,
+            "trial": dict(self.trial) if self.trial else None,
+        }
+
+
+def _change(action: str, knob: str, previous: Any, value: Any, **scores: Any) -> Dict[str, Any]:
+    """Build an optimization_history record of one setting change."""
+    return {
+        "timestamp": time.time(),
+        "action": action,
+        "knob": knob,
+        "from": previous,
+        "to": value,
+        **scores,
+    }
+
+
+def _ratio(value: float, baseline: float) -> float:
+    return value / baseline if baseline else 1.0
@@ -0,0 +1,131 @@
+"""
+Worker State for UHIP
+Per-worker cache of heavy handler state built once and reused across tasks
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from uhip.core.handlers import _reference, _resolve
+
+logger = logging.getLogger(__name__)
+
+# Registry of state key -> factory. Like task handlers, factories are
+# module-level functions so workers can rebuild the registry by reference.
+STATE_FACTORIES: Dict[str, Callable[[], Any]] = {}
+
+# State built in this worker (process). Threads of one process share it.
+_STATE: Dict[str, Any] = {}
+_STATE_LOCK = threading.RLock()
+_STATS = {"hits": 0, "misses": 0, "build_time": 0.0}
+
+
+def register_state(key: str, factory: Callable[[], Any]) -> None:
+    """
+    Register a factory for a piece of per-worker state.
+
+    Args:
+        key: Name handlers use to fetch the state via get_state()
+        factory: Zero-argument module-level callable building the state
+    """
+    if "<" in getattr(factory, "__qualname__", "<"):
+        logger.warning(
+            f"State factory for '{key}' is not a module-level function and "
+            f"cannot be rebuilt in process workers"
+        )
+    with _STATE_LOCK:
+        STATE_FACTORIES[key] = factory
+        _STATE.pop(key, None)
+    logger.debug(f"Registered worker state: {key}")
+
+
+def get_state(key: str) -> Any:
+    """
+    Get per-worker state, building it on first use.
+
+    Args:
+        key: Registered state key
+
+    Returns:
+        The cached state object
+
+    Raises:
+        KeyError: If no factory is registered for the key
+    """
+    # Lock-free fast path; the counters are approximate under contention
+    try:
+        value = _STATE[key]
+    except KeyError:
+        pass
+    else:
+        _STATS["hits"] += 1
+        return value
+
+    with _STATE_LOCK:
+        if key in _STATE:
+            _STATS["hits"] += 1
+            return _STATE[key]
+        factory = STATE_FACTORIES[key]
+        start = time.perf_counter()
+        value = factory()
+        _STATS["build_time"] += time.perf_counter() - start
+        _STATS["misses"] += 1
+        _STATE[key] = value
+        return value
+
+
+def clear_state(key: Optional[str] = None) -> None:
+    """Drop cached state for one key, or for all keys if key is None."""
+    with _STATE_LOCK:
+        if key is None:
+            _STATE.clear()
+        else:
+            _STATE.pop(key, None)
+
+
+def state_stats() -> Dict[str, Any]:
+    """Get the cached keys and hit/miss counts of this worker."""
+    with _STATE_LOCK:
+        return {"keys": sorted(_STATE), **_STATS}
+
+
+def state_specs(preload: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Describe the registered state factories as importable references.
+
+    Args:
+        preload: Keys to build when a worker starts instead of on first use
+
+    Returns:
+        Picklable description for init_worker_state()
+    """
+    factories = {}
+    for key, factory in STATE_FACTORIES.items():
+        reference = _reference(factory)
+        if reference is not None:
+            factories[key] = reference
+    return {"factories": factories, "preload": list(preload or [])}
+
+
+def init_worker_state(specs: Dict[str, Any]) -> None:
+    """
+    Pool worker initializer that rebuilds the factories and preloads state.
+
+    Args:
+        specs: Description as produced by state_specs()
+    """
+    for key, reference in specs.get("factories", {}).items():
+        if key in STATE_FACTORIES:
+            continue
+        try:
+            STATE_FACTORIES[key] = _resolve(reference)
+        except (ImportError, AttributeError, ValueError) as e:
+            logger.warning(f"Could not rebuild state factory for '{key}': {e}")
+
+    for key in specs.get("preload", []):
+        try:
+            get_state(key)
+        except Exception as e:
+            logger.warning(f"Could not preload worker state '{key}': {e}")
@@ -3,6 +3,16 @@ Utility modules for UHIP
 """
 
 from uhip.utils.helpers import setup_logging, validate_data, format_metrics
-from uhip.utils.metrics import MetricsCollector
+from uhip.utils.metrics import (
+    LatencyHistogram,
+    MetricShard,
+    MetricsCollector,
+    ShardedMetrics,
+    WindowedHistogram,
+)
 
-__all__ = ["setup_logging", "validate_data", "format_metrics", "MetricsCollector"]
+__all__ = [
+    "setup_logging", "validate_data", "format_metrics",
+    "MetricsCollector", "LatencyHistogram", "WindowedHistogram",
+    "MetricShard", "ShardedMetrics",
+]
@@ -2,8 +2,10 @@
 Metrics collection and reporting for UHIP
 """
 
+import math
+import threading
 import time
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 
 
@@ -100,3 +102,460 @@ class MetricsCollector:
         self.metrics.clear()
         self.counters.clear()
         self.gauges.clear()
+
+
+class LatencyHistogram:
+    """
+    Fixed-memory log-linear histogram of nanosecond latencies.
+    
+    Values below 2**precision nanoseconds get one bucket each; every
+    higher power of two is split into 2**(precision - 1) linear
+    sub-buckets, so a recorded value is reported within a relative error
+    of 2**-(precision - 1) (about 3% at the default precision) at any
+    magnitude. Values above max_ns are clamped into the last bucket. Only
+    occupied buckets are stored, so memory is bounded by the bucket count
+    however many values are recorded. Histograms with the same precision
+    merge by adding counts, which makes them safe to combine across
+    threads and to ship between processes (they pickle as plain data).
+    A histogram is not synchronized; callers serialize or shard updates.
+    """
+
+    __slots__ = ("precision", "max_ns", "counts", "count", "total_ns", "min_ns", "max_seen_ns")
+
+    def __init__(self, precision: int = 6, max_ns: int = 2 ** 40):
+        """
+        Initialize the histogram.
+        
+        Args:
+            precision: Significant bits kept per value
+            max_ns: Largest distinguishable value (about 18 minutes by default)
+        """
+        self.precision = precision
+        self.max_ns = max_ns
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_seen_ns = 0
+
+    def _highest(self, index: int) -> int:
+        """Get the largest value that maps to a bucket index."""
+        if index < (1 << self.precision):
+            return index
+        shift = (index >> (self.precision - 1)) - 1
+        mantissa = index - (shift << (self.precision - 1))
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, value_ns: int, count: int = 1) -> None:
+        """
+        Record a latency.
+        
+        Args:
+            value_ns: Latency in nanoseconds (negative values count as 0)
+            count: Number of occurrences
+        """
+        value = int(value_ns)
+        if value > self.max_ns:
+            value = self.max_ns
+        elif value < 0:
+            value = 0
+        # Values with more than `precision` bits keep their top bits
+        shift = value.bit_length() - self.precision
+        index = value if shift <= 0 else (shift << (self.precision - 1)) + (value >> shift)
+        counts = self.counts
+        counts[index] = counts.get(index, 0) + count
+        if value < self.min_ns or not self.count:
+            self.min_ns = value
+        if value > self.max_seen_ns:
+            self.max_seen_ns = value
+        self.count += count
+        self.total_ns += value * count
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """
+        Add another histogram's counts to this one.
+        
+        Args:
+            other: Histogram with the same precision
+            
+        Returns:
+            This histogram
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge histograms of different precision")
+        if not other.count:
+            return self
+        # Copy first: the other histogram may be a shard its owner is updating
+        for index, count in list(other.counts.items()):
+            self.counts[index] = self.counts.get(index, 0) + count
+        if not self.count or other.min_ns < self.min_ns:
+            self.min_ns = other.min_ns
+        self.max_seen_ns = max(self.max_seen_ns, other.max_seen_ns)
+        self.count += other.count
+        self.total_ns += other.total_ns
+        return self
+
+    def copy(self) -> "LatencyHistogram":
+        """Get an independent copy of the histogram."""
+        return LatencyHistogram(self.precision, self.max_ns).merge(self)
+
+    def mean_ns(self) -> float:
+        """Mean of the recorded values."""
+        return self.total_ns / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> int:
+        """
+        Get the value at or below which q percent of the values fall.
+        
+        Args:
+            q: Percentile between 0 and 100
+            
+        Returns:
+            Highest value equivalent to the percentile's bucket, bounded by
+            the recorded minimum and maximum (percentile 0 is the minimum);
+            0 for an empty histogram
+        """
+        return self.percentiles([q])[0]
+
+    def percentiles(self, qs: List[float]) -> List[int]:
+        """Get several percentiles in one pass over the buckets."""
+        if not self.count:
+            return [0 for _ in qs]
+        ranks = sorted(
+            (max(1, math.ceil(min(max(q, 0.0), 100.0) * self.count / 100.0)), position)
+            for position, q in enumerate(qs)
+        )
+        values = [0] * len(qs)
+        pending = iter(ranks)
+        rank, position = next(pending)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            while rank <= seen:
+                if qs[position] <= 0:
+                    values[position] = self.min_ns
+                else:
+                    values[position] = max(min(self._highest(index), self.max_seen_ns), self.min_ns)
+                try:
+                    rank, position = next(pending)
+                except StopIteration:
+                    return values
+        return values
+
+    def summary(self) -> Dict[str, Any]:
+        """Get the count and common percentiles in seconds."""
+        p50, p90, p95, p99, p999 = self.percentiles([50, 90, 95, 99, 99.9])
+        return {
+            "count": self.count,
+            "mean": self.mean_ns() / 1e9,
+            "min": self.min_ns / 1e9,
+            "p50": p50 / 1e9,
+            "p90": p90 / 1e9,
+            "p95": p95 / 1e9,
+            "p99": p99 / 1e9,
+            "p999": p999 / 1e9,
+            "max": self.max_seen_ns / 1e9,
+        }
+
+
+class WindowedHistogram:
+    """
+    Latency histogram with sliding-window views.
+    
+    Values go into the histogram of the current time slot only; a ring of
+    slots covers the longest window, and a slot pushed out of the ring is
+    folded into a histogram of older values, so the lifetime view is that
+    histogram plus the ring. A window view merges the slots it spans, so a
+    1 minute view with 10 second slots reflects the last 50 to 60 seconds.
+    Slots are keyed by wall-clock time so histograms recorded in different
+    processes line up when merged.
+    """
+
+    WINDOWS = {"1m": 60.0, "5m": 300.0}
+
+    def __init__(self, slot_seconds: float = 10.0, horizon: float = 300.0, precision: int = 6):
+        """
+        Initialize the windowed histogram.
+        
+        Args:
+            slot_seconds: Width of one time slot
+            horizon: Longest window that can be viewed
+            precision: Significant bits of the underlying histograms
+        """
+        self.slot_seconds = slot_seconds
+        self.precision = precision
+        self.slots = max(1, int(math.ceil(horizon / slot_seconds)))
+        self.older = LatencyHistogram(precision)
+        self._ring: List[Optional[Tuple[int, LatencyHistogram]]] = [None] * self.slots
+        self._current_id = -1
+        self._current = self.older
+
+    def _slot(self, slot_id: int) -> LatencyHistogram:
+        position = slot_id % self.slots
+        entry = self._ring[position]
+        if entry is not None and entry[0] == slot_id:
+            return entry[1]
+        if entry is not None and entry[0] > slot_id:
+            # Older than the ring covers; only the lifetime view keeps it
+            return self.older
+        histogram = LatencyHistogram(self.precision)
+        self._ring[position] = (slot_id, histogram)
+        if entry is not None:
+            # Replace first: a concurrent reader may briefly miss the
+            # evicted values but never counts them twice
+            self.older.merge(entry[1])
+        return histogram
+
+    def record(self, value_ns: int, now: Optional[float] = None, count: int = 1) -> None:
+        """
+        Record a latency.
+        
+        Args:
+            value_ns: Latency in nanoseconds
+            now: Wall-clock time of the observation (defaults to now)
+            count: Number of occurrences
+        """
+        slot_id = int((time.time() if now is None else now) // self.slot_seconds)
+        if slot_id != self._current_id:
+            self._current = self._slot(slot_id)
+            self._current_id = slot_id
+        self._current.record(value_ns, count)
+
+    def merge(self, other: "WindowedHistogram") -> "WindowedHistogram":
+        """
+        Add another windowed histogram's counts to this one, slot by slot.
+        
+        Args:
+            other: Windowed histogram with the same slot width and precision
+            
+        Returns:
+            This histogram
+        """
+        if other.slot_seconds != self.slot_seconds:
+            raise ValueError("Cannot merge histograms with different slot widths")
+        self.older.merge(other.older)
+        for entry in list(other._ring):
+            if entry is not None:
+                self._slot(entry[0]).merge(entry[1])
+        # The current slot may have been evicted by the merge
+        self._current_id = -1
+        return self
+
+    def totals(self) -> Tuple[int, int]:
+        """Get the lifetime count and total nanoseconds without merging buckets."""
+        count, total_ns = self.older.count, self.older.total_ns
+        for entry in list(self._ring):
+            if entry is not None:
+                count += entry[1].count
+                total_ns += entry[1].total_ns
+        return count, total_ns
+
+    def lifetime(self) -> LatencyHistogram:
+        """Get a new histogram of every recorded value."""
+        merged = self.older.copy()
+        for entry in list(self._ring):
+            if entry is not None:
+                merged.merge(entry[1])
+        return merged
+
+    def window(self, seconds: float, now: Optional[float] = None) -> LatencyHistogram:
+        """
+        Get the values recorded within a trailing window.
+        
+        Args:
+            seconds: Window length (at most the horizon)
+            now: End of the window (defaults to now)
+            
+        Returns:
+            New histogram of the slots the window spans
+        """
+        now = time.time() if now is None else now
+        current = int(now // self.slot_seconds)
+        span = max(1, min(self.slots, int(math.ceil(seconds / self.slot_seconds))))
+        merged = LatencyHistogram(self.precision)
+        for entry in list(self._ring):
+            if entry is not None and current - span < entry[0] <= current:
+                merged.merge(entry[1])
+        return merged
+
+    def summary(self, now: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Get percentile summaries of the lifetime and each window."""
+        summaries = {"all": self.lifetime().summary()}
+        for name, seconds in self.WINDOWS.items():
+            summaries[name] = self.window(seconds, now).summary()
+        return summaries
+
+
+class MetricShard:
+    """
+    Per-task-type latency histograms written by a single owner.
+    
+    A shard is only updated by the thread (or worker process) that owns
+    it, so recording needs no lock; readers merge shards into a new one.
+    Counts and total times come from the histograms themselves, so a
+    record is a single histogram update. Shards pickle as plain data and
+    can be shipped between processes.
+    """
+
+    __slots__ = ("tasks",)
+
+    def __init__(self):
+        """Initialize an empty shard."""
+        self.tasks: Dict[str, WindowedHistogram] = {}
+
+    def record(self, task_type: str, elapsed_ns: int, count: int = 1) -> bool:
+        """
+        Record completed work.
+        
+        Args:
+            task_type: Type of the completed task
+            elapsed_ns: Processing time in nanoseconds
+            count: Tasks completed in that time (each is recorded at the mean)
+            
+        Returns:
+            True if this is the shard's first record of the task type
+        """
+        histogram = self.tasks.get(task_type)
+        created = histogram is None
+        if histogram is None:
+            histogram = self.tasks[task_type] = WindowedHistogram()
+        histogram.record(elapsed_ns if count == 1 else elapsed_ns // count, count=count)
+        return created
+
+    def merge(self, other: "MetricShard") -> "MetricShard":
+        """
+        Add another shard's histograms to this one.
+        
+        Args:
+            other: Shard to add; it may be concurrently updated by its owner
+            
+        Returns:
+            This shard
+        """
+        for task_type, histogram in list(other.tasks.items()):
+            target = self.tasks.get(task_type)
+            if target is None:
+                target = self.tasks[task_type] = WindowedHistogram()
+            target.merge(histogram)
+        return self
+
+    def summary(self, histograms: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-task-type count, total_time and avg_time in seconds.
+        
+        Args:
+            histograms: Whether to add latency percentiles under "latency"
+        """
+        summaries = {}
+        for task_type, histogram in list(self.tasks.items()):
+            count, total_ns = histogram.totals()
+            total_time = total_ns / 1e9
+            summary: Dict[str, Any] = {
+                "count": count,
+                "total_time": total_time,
+                "avg_time": total_time / count if count else 0.0,
+            }
+            if histograms:
+                summary["latency"] = histogram.summary()
+            summaries[task_type] = summary
+        return summaries
+
+
+class ShardedMetrics:
+    """
+    Per-task-type metrics recorded into per-thread shards.
+    
+    Each recording thread lazily gets its own MetricShard, so the hot path
+    is a thread-local lookup and one histogram update with no shared lock
+    and no lost increments. Reads merge all shards into a fresh one; a
+    read may miss updates still in flight, but never sees them twice.
+    Shards of threads that have exited are folded into a retired shard on
+    the next read, and shards arriving from worker processes are merged
+    into it directly.
+    """
+
+    def __init__(self):
+        """Initialize with no shards."""
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: List[Tuple[threading.Thread, MetricShard]] = []
+        self._retired = MetricShard()
+
+    def _shard(self) -> MetricShard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = MetricShard()
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def record(self, task_type: str, elapsed_ns: int, count: int = 1) -> bool:
+        """
+        Record completed work in the calling thread's shard.
+        
+        Args:
+            task_type: Type of the completed task
+            elapsed_ns: Processing time in nanoseconds
+            count: Tasks completed in that time
+            
+        Returns:
+            True if the calling thread had not recorded the task type before
+        """
+        try:
+            shard: MetricShard = self._local.shard
+        except AttributeError:
+            shard = self._shard()
+        return shard.record(task_type, elapsed_ns, count)
+
+    def merge_shard(self, shard: MetricShard) -> None:
+        """Add a shard recorded elsewhere, e.g. a worker process delta."""
+        with self._lock:
+            self._retired.merge(shard)
+
+    def _live_shards(self) -> List[MetricShard]:
+        """Fold exited threads into the retired shard; get it and the live ones."""
+        with self._lock:
+            alive = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    alive.append((thread, shard))
+                else:
+                    self._retired.merge(shard)
+            self._shards = alive
+            return [self._retired] + [shard for _, shard in alive]
+
+    def collect(self) -> MetricShard:
+        """Merge every shard into a new one."""
+        merged = MetricShard()
+        for shard in self._live_shards():
+            merged.merge(shard)
+        return merged
+
+    def summary(self, histograms: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-task-type count, total_time and avg_time merged across shards.
+        
+        Args:
+            histograms: Whether to add latency percentiles; without them
+                        only per-slot totals are summed, which is much cheaper
+        """
+        if histograms:
+            return self.collect().summary()
+        summaries: Dict[str, Dict[str, Any]] = {}
+        for shard in self._live_shards():
+            for task_type, histogram in list(shard.tasks.items()):
+                count, total_ns = histogram.totals()
+                summary = summaries.setdefault(task_type, {"count": 0, "total_time": 0.0})
+                summary["count"] += count
+                summary["total_time"] += total_ns / 1e9
+        for summary in summaries.values():
+            count = summary["count"]
+            summary["avg_time"] = summary["total_time"] / count if count else 0.0
+        return summaries
+
+    def reset(self) -> None:
+        """Drop all recorded statistics."""
+        with self._lock:
+            self._shards = []
+            self._retired = MetricShard()
+            self._local = threading.local()